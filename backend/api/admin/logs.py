@@ -28,6 +28,13 @@ def get_scrape_logs():
             'successful_scrapes': log.successful_scrapes,
             'failed_scrapes': log.failed_scrapes,
             'total_offers_scraped': log.total_offers_scraped,
+            'fetch_cache_hits': log.fetch_cache_hits or 0,
+            'fetch_cache_misses': log.fetch_cache_misses or 0,
+            'detail_cache_hits': log.detail_cache_hits or 0,
+            'detail_cache_misses': log.detail_cache_misses or 0,
+            'score_cache_hits': log.score_cache_hits or 0,
+            'score_cache_misses': log.score_cache_misses or 0,
+            'scoring_stats': log.scoring_stats or {},
             'errors': log.errors or [],
         })
     
@@ -113,6 +120,13 @@ def get_all_logs():
             'successful_scrapes': log.successful_scrapes,
             'failed_scrapes': log.failed_scrapes,
             'total_offers_scraped': log.total_offers_scraped,
+            'fetch_cache_hits': log.fetch_cache_hits or 0,
+            'fetch_cache_misses': log.fetch_cache_misses or 0,
+            'detail_cache_hits': log.detail_cache_hits or 0,
+            'detail_cache_misses': log.detail_cache_misses or 0,
+            'score_cache_hits': log.score_cache_hits or 0,
+            'score_cache_misses': log.score_cache_misses or 0,
+            'scoring_stats': log.scoring_stats or {},
             'errors': log.errors or [],
         })
     
@@ -4,20 +4,32 @@ from flask_jwt_extended import jwt_required
 import json
 from typing import Set
 from scrapers import get_scraper, SCRAPER_REGISTRY, PLATFORM_NAMES
-from services.scrape import scrape_all_platforms
-from services.openai_scoring import DEFAULT_SCORING_PROMPT
+from services.scrape import scrape_all_platforms, SCRAPE_ENGINES, DEFAULT_PLATFORM_DEADLINE_SECONDS, DEFAULT_USER_DEADLINE_SECONDS
+from services.openai_scoring import (
+    DEFAULT_SCORING_PROMPT, DEFAULT_SCORING_CHUNK_TOKENS, DEFAULT_SCORING_WORKERS, DEFAULT_SCORING_CHUNK_RETRIES, SCORING_MODES,
+)
+from services.openai_pool import get_openai_pool, DEFAULT_MAX_CONCURRENCY
+from services.scoring_cascade import parse_cascade_tiers, MODEL_PRICES
+from services.mmr_selection import SELECTION_ALGORITHMS, DEFAULT_SELECTION_ALGORITHM, DEFAULT_MMR_LAMBDA
 from core.models import AppSettings, Offer, OfferBundle, db
+from scrapers.utils.http_pool import DEFAULT_POOL_SETTINGS
+from scrapers.utils.rate_limiter import DEFAULT_RATE_LIMIT
+from scrapers.utils.async_http import DEFAULT_MAX_CONNECTIONS, DEFAULT_HOST_CONCURRENCY
+from scrapers.utils.detail_fetcher import DEFAULT_DETAIL_WORKERS
+from scrapers.utils.http_cache import DEFAULT_HTTP_CACHE_SETTINGS, get_http_cache
 from utils.encryption import decrypt_api_key, encrypt_api_key
+from utils.urls import url_fingerprint
+from services.offer_detail_cache import configure_offer_detail_cache
 from . import bp
 
 
-def get_existing_offer_urls() -> Set[str]:
+def get_existing_offer_fingerprints() -> Set[int]:
     """
-    Get all offer URLs that exist in the database (from sent bundles).
+    Get canonical URL fingerprints of all offers in the database (from sent bundles).
     This is used for the admin test scrape to show which offers were already sent.
     """
-    # Get URLs from all offers in bundles that have been sent
-    sent_offers = db.session.query(Offer.url).join(
+    # Get fingerprints from all offers in bundles that have been sent
+    sent_offers = db.session.query(Offer.url_fingerprint).join(
         OfferBundle,
         Offer.offer_bundle_id == OfferBundle.id
     ).filter(
@@ -25,7 +37,7 @@ def get_existing_offer_urls() -> Set[str]:
         Offer.deleted_at.is_(None)
     ).distinct().all()
     
-    return {offer.url for offer in sent_offers}
+    return {offer.url_fingerprint for offer in sent_offers}
 
 
 @bp.route('/scrape', methods=['POST'])
@@ -88,6 +100,8 @@ def scrape_offers():
                     'error': f'Brak klucza API dla platformy {platform}. Skonfiguruj klucz w ustawieniach przed rozpoczęciem scrapowania.'
                 }), HTTPStatus.BAD_REQUEST
             
+            configure_offer_detail_cache(settings)
+            
             result = scraper.scrape(
                 must_contain=must_contain,
                 may_contain=may_contain,
@@ -103,9 +117,9 @@ def scrape_offers():
         parsed_offers = [offer.to_dict() for offer in result.offers]
         
         # Mark offers that already exist in the database (were sent to someone)
-        existing_urls = get_existing_offer_urls()
+        existing_fingerprints = get_existing_offer_fingerprints()
         for offer in parsed_offers:
-            offer['exists_in_database'] = offer.get('url', '') in existing_urls
+            offer['exists_in_database'] = url_fingerprint(offer.get('url', '')) in existing_fingerprints
         
         return jsonify({
             'platform': result.platform,
@@ -160,11 +174,11 @@ def scrape_all_platforms_endpoint():
     )
     
     # Mark offers that already exist in the database (were sent to someone)
-    existing_urls = get_existing_offer_urls()
+    existing_fingerprints = get_existing_offer_fingerprints()
     for offer in result['all_offers']:
-        offer['exists_in_database'] = offer.get('url', '') in existing_urls
+        offer['exists_in_database'] = url_fingerprint(offer.get('url', '')) in existing_fingerprints
     for offer in result['selected_offers']:
-        offer['exists_in_database'] = offer.get('url', '') in existing_urls
+        offer['exists_in_database'] = url_fingerprint(offer.get('url', '')) in existing_fingerprints
     
     return jsonify({
         'mode': mode,
@@ -239,11 +253,27 @@ def get_openai_settings():
     return jsonify({
         'openai_api_key': openai_key,
         'openai_scoring_prompt': settings.openai_scoring_prompt if settings else None,
+        'openai_base_url': settings.openai_base_url if settings else None,
+        'openai_rpm_limit': settings.openai_rpm_limit if settings else None,
+        'openai_tpm_limit': settings.openai_tpm_limit if settings else None,
+        'openai_max_concurrency': settings.openai_max_concurrency if settings and settings.openai_max_concurrency else DEFAULT_MAX_CONCURRENCY,
+        'openai_pool': get_openai_pool().stats(),
         'default_prompt': DEFAULT_SCORING_PROMPT,
         'email_max_offers': settings.email_max_offers if settings else 10,
         'min_fit_score': settings.min_fit_score if settings else 5.0,
         'min_attractiveness_score': settings.min_attractiveness_score if settings else 5.0,
         'shuffle_keywords': settings.shuffle_keywords if settings else False,
+        'scoring_chunk_tokens': settings.scoring_chunk_tokens if settings and settings.scoring_chunk_tokens else DEFAULT_SCORING_CHUNK_TOKENS,
+        'scoring_workers': settings.scoring_workers if settings and settings.scoring_workers else DEFAULT_SCORING_WORKERS,
+        'scoring_chunk_retries': settings.scoring_chunk_retries if settings and settings.scoring_chunk_retries is not None else DEFAULT_SCORING_CHUNK_RETRIES,
+        'scoring_mode': settings.scoring_mode if settings and settings.scoring_mode else 'combined',
+        'scoring_modes': list(SCORING_MODES),
+        'scoring_top_k': settings.scoring_top_k if settings and settings.scoring_top_k else 0,
+        'scoring_cascade': settings.scoring_cascade if settings and settings.scoring_cascade else [],
+        'priced_models': list(MODEL_PRICES),
+        'selection_algorithm': settings.selection_algorithm if settings and settings.selection_algorithm else DEFAULT_SELECTION_ALGORITHM,
+        'selection_algorithms': list(SELECTION_ALGORITHMS),
+        'mmr_lambda': settings.mmr_lambda if settings and settings.mmr_lambda is not None else DEFAULT_MMR_LAMBDA,
     }), HTTPStatus.OK
 
 
@@ -271,6 +301,22 @@ def update_openai_settings():
     if 'openai_scoring_prompt' in data:
         settings.openai_scoring_prompt = data['openai_scoring_prompt']
     
+    if 'openai_base_url' in data:
+        settings.openai_base_url = (data['openai_base_url'] or '').strip() or None
+    
+    # Empty limits mean "learn from response headers"
+    if 'openai_rpm_limit' in data:
+        value = data['openai_rpm_limit']
+        settings.openai_rpm_limit = max(1, min(100000, int(value))) if value else None
+    
+    if 'openai_tpm_limit' in data:
+        value = data['openai_tpm_limit']
+        settings.openai_tpm_limit = max(1000, min(100000000, int(value))) if value else None
+    
+    if 'openai_max_concurrency' in data:
+        value = int(data['openai_max_concurrency'])
+        settings.openai_max_concurrency = max(1, min(64, value))
+    
     if 'email_max_offers' in data:
         settings.email_max_offers = int(data['email_max_offers'])
     
@@ -285,6 +331,49 @@ def update_openai_settings():
     if 'shuffle_keywords' in data:
         settings.shuffle_keywords = bool(data['shuffle_keywords'])
     
+    if 'scoring_chunk_tokens' in data:
+        value = int(data['scoring_chunk_tokens'])
+        settings.scoring_chunk_tokens = max(500, min(100000, value))
+    
+    if 'scoring_workers' in data:
+        value = int(data['scoring_workers'])
+        settings.scoring_workers = max(1, min(16, value))
+    
+    if 'scoring_chunk_retries' in data:
+        value = int(data['scoring_chunk_retries'])
+        settings.scoring_chunk_retries = max(0, min(5, value))
+    
+    if 'scoring_mode' in data:
+        if data['scoring_mode'] not in SCORING_MODES:
+            return jsonify({'error': f'scoring_mode must be one of: {", ".join(SCORING_MODES)}'}), HTTPStatus.BAD_REQUEST
+        settings.scoring_mode = data['scoring_mode']
+    
+    if 'scoring_top_k' in data:
+        value = int(data['scoring_top_k'] or 0)
+        settings.scoring_top_k = max(0, min(1000, value))
+    
+    if 'scoring_cascade' in data:
+        tiers, error = parse_cascade_tiers(data['scoring_cascade'] or [])
+        if error:
+            return jsonify({'error': error}), HTTPStatus.BAD_REQUEST
+        settings.scoring_cascade = tiers
+    
+    if 'selection_algorithm' in data:
+        if data['selection_algorithm'] not in SELECTION_ALGORITHMS:
+            return jsonify({'error': f'selection_algorithm must be one of: {", ".join(SELECTION_ALGORITHMS)}'}), HTTPStatus.BAD_REQUEST
+        settings.selection_algorithm = data['selection_algorithm']
+    
+    if 'mmr_lambda' in data:
+        value = float(data['mmr_lambda'])
+        settings.mmr_lambda = max(0.0, min(1.0, value))
+    
+    # Two-stage scoring uses its own prompts, a custom prompt would be silently ignored
+    if settings.scoring_mode == 'two_stage' and (settings.openai_scoring_prompt or '').strip():
+        db.session.rollback()
+        return jsonify({
+            'error': 'openai_scoring_prompt is not used in two_stage scoring_mode - clear the prompt or use combined mode'
+        }), HTTPStatus.BAD_REQUEST
+    
     db.session.commit()
     
     return jsonify({
@@ -292,6 +381,227 @@ def update_openai_settings():
     }), HTTPStatus.OK
 
 
+def _parse_platform_overrides(value, defaults: dict, field: str, maximum: int = 100):
+    """Validate per-platform numeric overrides of `defaults`. Returns (overrides, error)."""
+    if not isinstance(value, dict):
+        return None, f'{field} must be an object'
+    
+    parsed = {}
+    for platform_id, overrides in value.items():
+        if platform_id not in SCRAPER_REGISTRY:
+            return None, f'Unknown platform: {platform_id}'
+        if not isinstance(overrides, dict):
+            return None, f'{field}.{platform_id} must be an object'
+        
+        parsed[platform_id] = {}
+        for key, raw in overrides.items():
+            if key not in defaults:
+                return None, f'Unknown {field} key: {key}'
+            try:
+                number = int(raw) if isinstance(defaults[key], int) else float(raw)
+            except (ValueError, TypeError):
+                return None, f'{field}.{platform_id}.{key} must be a valid number'
+            # Pool sizes and bursts need at least one slot; retries/backoff may be 0
+            minimum = 1 if key in ('pool_connections', 'pool_maxsize', 'burst') else 0
+            if number < minimum or number > maximum:
+                return None, f'{field}.{platform_id}.{key} must be between {minimum} and {maximum}'
+            # A zero rate would never refill the bucket; throttling can't be turned off this way
+            if key == 'rate_per_second' and number <= 0:
+                return None, f'{field}.{platform_id}.{key} must be greater than 0'
+            parsed[platform_id][key] = number
+    
+    return parsed, None
+
+
+@bp.route('/scrape/performance-settings', methods=['GET'])
+@jwt_required()
+def get_performance_settings():
+    """Get scraping performance settings (concurrency etc.)."""
+    settings = AppSettings.query.first()
+
+    return jsonify({
+        'parallel_platform_scraping': settings.parallel_platform_scraping if settings and settings.parallel_platform_scraping is not None else True,
+        'platform_scrape_workers': settings.platform_scrape_workers if settings and settings.platform_scrape_workers else 4,
+        'parallel_user_scraping': settings.parallel_user_scraping if settings and settings.parallel_user_scraping is not None else False,
+        'user_scrape_workers': settings.user_scrape_workers if settings and settings.user_scrape_workers else 2,
+        'platform_http_settings': (settings.platform_http_settings or {}) if settings else {},
+        'default_http_settings': DEFAULT_POOL_SETTINGS,
+        'host_rate_limits': (settings.host_rate_limits or {}) if settings else {},
+        'default_rate_limit': DEFAULT_RATE_LIMIT,
+        'scrape_engine': settings.scrape_engine if settings and settings.scrape_engine else 'threads',
+        'async_max_connections': settings.async_max_connections if settings and settings.async_max_connections else DEFAULT_MAX_CONNECTIONS,
+        'async_host_concurrency': settings.async_host_concurrency if settings and settings.async_host_concurrency else DEFAULT_HOST_CONCURRENCY,
+        'platform_detail_workers': (settings.platform_detail_workers or {}) if settings else {},
+        'default_detail_workers': DEFAULT_DETAIL_WORKERS,
+        'http_cache_enabled': settings.http_cache_enabled if settings and settings.http_cache_enabled is not None else True,
+        'http_cache_settings': (settings.http_cache_settings or {}) if settings else {},
+        'default_http_cache_settings': DEFAULT_HTTP_CACHE_SETTINGS,
+        'http_cache_stats': get_http_cache().stats(),
+        'platform_deadlines': (settings.platform_deadlines or {}) if settings else {},
+        'default_platform_deadline_seconds': DEFAULT_PLATFORM_DEADLINE_SECONDS,
+        'user_deadline_seconds': settings.user_deadline_seconds if settings and settings.user_deadline_seconds is not None else DEFAULT_USER_DEADLINE_SECONDS,
+        'continue_timed_out_scrapes': settings.continue_timed_out_scrapes if settings and settings.continue_timed_out_scrapes is not None else True,
+    }), HTTPStatus.OK
+
+
+@bp.route('/scrape/performance-settings', methods=['PUT'])
+@jwt_required()
+def update_performance_settings():
+    """Update scraping performance settings."""
+    from sqlalchemy.orm.attributes import flag_modified
+    
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'No data provided'}), HTTPStatus.BAD_REQUEST
+
+    settings = AppSettings.query.first()
+    if not settings:
+        settings = AppSettings()
+        db.session.add(settings)
+
+    if 'parallel_platform_scraping' in data:
+        settings.parallel_platform_scraping = bool(data['parallel_platform_scraping'])
+
+    if 'platform_scrape_workers' in data:
+        try:
+            workers = int(data['platform_scrape_workers'])
+            if workers < 1 or workers > 16:
+                return jsonify({'error': 'platform_scrape_workers must be between 1 and 16'}), HTTPStatus.BAD_REQUEST
+            settings.platform_scrape_workers = workers
+        except (ValueError, TypeError):
+            return jsonify({'error': 'platform_scrape_workers must be a valid number'}), HTTPStatus.BAD_REQUEST
+
+    if 'parallel_user_scraping' in data:
+        settings.parallel_user_scraping = bool(data['parallel_user_scraping'])
+
+    if 'user_scrape_workers' in data:
+        try:
+            workers = int(data['user_scrape_workers'])
+            if workers < 1 or workers > 16:
+                return jsonify({'error': 'user_scrape_workers must be between 1 and 16'}), HTTPStatus.BAD_REQUEST
+            settings.user_scrape_workers = workers
+        except (ValueError, TypeError):
+            return jsonify({'error': 'user_scrape_workers must be a valid number'}), HTTPStatus.BAD_REQUEST
+
+    if 'platform_http_settings' in data:
+        http_settings, error = _parse_platform_overrides(data['platform_http_settings'], DEFAULT_POOL_SETTINGS, 'platform_http_settings')
+        if error:
+            return jsonify({'error': error}), HTTPStatus.BAD_REQUEST
+        settings.platform_http_settings = http_settings
+        flag_modified(settings, 'platform_http_settings')
+
+    if 'host_rate_limits' in data:
+        rate_limits, error = _parse_platform_overrides(data['host_rate_limits'], DEFAULT_RATE_LIMIT, 'host_rate_limits')
+        if error:
+            return jsonify({'error': error}), HTTPStatus.BAD_REQUEST
+        settings.host_rate_limits = rate_limits
+        flag_modified(settings, 'host_rate_limits')
+
+    if 'scrape_engine' in data:
+        if data['scrape_engine'] not in SCRAPE_ENGINES:
+            return jsonify({'error': f'scrape_engine must be one of: {", ".join(SCRAPE_ENGINES)}'}), HTTPStatus.BAD_REQUEST
+        settings.scrape_engine = data['scrape_engine']
+
+    if 'async_max_connections' in data:
+        try:
+            max_connections = int(data['async_max_connections'])
+            if max_connections < 1 or max_connections > 1000:
+                return jsonify({'error': 'async_max_connections must be between 1 and 1000'}), HTTPStatus.BAD_REQUEST
+            settings.async_max_connections = max_connections
+        except (ValueError, TypeError):
+            return jsonify({'error': 'async_max_connections must be a valid number'}), HTTPStatus.BAD_REQUEST
+
+    if 'async_host_concurrency' in data:
+        try:
+            host_concurrency = int(data['async_host_concurrency'])
+            if host_concurrency < 1 or host_concurrency > 100:
+                return jsonify({'error': 'async_host_concurrency must be between 1 and 100'}), HTTPStatus.BAD_REQUEST
+            settings.async_host_concurrency = host_concurrency
+        except (ValueError, TypeError):
+            return jsonify({'error': 'async_host_concurrency must be a valid number'}), HTTPStatus.BAD_REQUEST
+
+    if 'platform_detail_workers' in data:
+        detail_workers = data['platform_detail_workers'] or {}
+        if not isinstance(detail_workers, dict):
+            return jsonify({'error': 'platform_detail_workers must be an object'}), HTTPStatus.BAD_REQUEST
+        parsed_workers = {}
+        for platform_id, workers in detail_workers.items():
+            if platform_id not in SCRAPER_REGISTRY:
+                return jsonify({'error': f'Unknown platform: {platform_id}'}), HTTPStatus.BAD_REQUEST
+            try:
+                workers = int(workers)
+            except (ValueError, TypeError):
+                return jsonify({'error': f'platform_detail_workers.{platform_id} must be a valid number'}), HTTPStatus.BAD_REQUEST
+            if workers < 1 or workers > 16:
+                return jsonify({'error': f'platform_detail_workers.{platform_id} must be between 1 and 16'}), HTTPStatus.BAD_REQUEST
+            parsed_workers[platform_id] = workers
+        settings.platform_detail_workers = parsed_workers
+        flag_modified(settings, 'platform_detail_workers')
+
+    if 'http_cache_enabled' in data:
+        settings.http_cache_enabled = bool(data['http_cache_enabled'])
+
+    if 'http_cache_settings' in data:
+        # Freshness up to one day
+        cache_settings, error = _parse_platform_overrides(data['http_cache_settings'], DEFAULT_HTTP_CACHE_SETTINGS, 'http_cache_settings', maximum=86400)
+        if error:
+            return jsonify({'error': error}), HTTPStatus.BAD_REQUEST
+        settings.http_cache_settings = cache_settings
+        flag_modified(settings, 'http_cache_settings')
+
+    if 'platform_deadlines' in data:
+        platform_deadlines = data['platform_deadlines'] or {}
+        if not isinstance(platform_deadlines, dict):
+            return jsonify({'error': 'platform_deadlines must be an object'}), HTTPStatus.BAD_REQUEST
+        parsed_deadlines = {}
+        for platform_id, seconds in platform_deadlines.items():
+            if platform_id not in SCRAPER_REGISTRY:
+                return jsonify({'error': f'Unknown platform: {platform_id}'}), HTTPStatus.BAD_REQUEST
+            try:
+                seconds = int(seconds)
+            except (ValueError, TypeError):
+                return jsonify({'error': f'platform_deadlines.{platform_id} must be a valid number'}), HTTPStatus.BAD_REQUEST
+            if seconds < 0 or seconds > 3600:
+                return jsonify({'error': f'platform_deadlines.{platform_id} must be between 0 and 3600'}), HTTPStatus.BAD_REQUEST
+            parsed_deadlines[platform_id] = seconds
+        settings.platform_deadlines = parsed_deadlines
+        flag_modified(settings, 'platform_deadlines')
+
+    if 'user_deadline_seconds' in data:
+        try:
+            user_deadline = int(data['user_deadline_seconds'])
+            if user_deadline < 0 or user_deadline > 3600:
+                return jsonify({'error': 'user_deadline_seconds must be between 0 and 3600'}), HTTPStatus.BAD_REQUEST
+            settings.user_deadline_seconds = user_deadline
+        except (ValueError, TypeError):
+            return jsonify({'error': 'user_deadline_seconds must be a valid number'}), HTTPStatus.BAD_REQUEST
+
+    if 'continue_timed_out_scrapes' in data:
+        settings.continue_timed_out_scrapes = bool(data['continue_timed_out_scrapes'])
+
+    db.session.commit()
+
+    return jsonify({
+        'message': 'Ustawienia wydajności zostały zaktualizowane',
+        'parallel_platform_scraping': settings.parallel_platform_scraping,
+        'platform_scrape_workers': settings.platform_scrape_workers,
+        'parallel_user_scraping': settings.parallel_user_scraping,
+        'user_scrape_workers': settings.user_scrape_workers,
+        'platform_http_settings': settings.platform_http_settings or {},
+        'host_rate_limits': settings.host_rate_limits or {},
+        'scrape_engine': settings.scrape_engine,
+        'async_max_connections': settings.async_max_connections,
+        'async_host_concurrency': settings.async_host_concurrency,
+        'platform_detail_workers': settings.platform_detail_workers or {},
+        'http_cache_enabled': settings.http_cache_enabled,
+        'http_cache_settings': settings.http_cache_settings or {},
+        'platform_deadlines': settings.platform_deadlines or {},
+        'user_deadline_seconds': settings.user_deadline_seconds,
+        'continue_timed_out_scrapes': settings.continue_timed_out_scrapes,
+    }), HTTPStatus.OK
+
+
 @bp.route('/scrape/platforms', methods=['GET'])
 @jwt_required()
 def get_platforms():
@@ -515,3 +825,121 @@ def clear_workconnect_cache():
     return jsonify({
         'message': 'Cache WorkConnect został wyczyszczony',
     }), HTTPStatus.OK
+
+
+# ============================================================================
+# Offer detail cache endpoints
+# ============================================================================
+
+@bp.route('/scrape/detail-cache', methods=['GET'])
+@jwt_required()
+def get_detail_cache():
+    """Get offer detail cache settings, size and hit rate."""
+    from services.offer_detail_cache import get_detail_cache_stats
+    
+    return jsonify(get_detail_cache_stats()), HTTPStatus.OK
+
+
+@bp.route('/scrape/detail-cache', methods=['PUT'])
+@jwt_required()
+def update_detail_cache_settings():
+    """Update offer detail cache settings."""
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'error': 'No data provided'}), HTTPStatus.BAD_REQUEST
+    
+    settings = AppSettings.query.first()
+    if not settings:
+        settings = AppSettings()
+        db.session.add(settings)
+    
+    if 'ttl_hours' in data:
+        try:
+            ttl_hours = float(data['ttl_hours'])
+            if ttl_hours < 0 or ttl_hours > 720:  # Max 30 days, 0 disables reuse
+                return jsonify({'error': 'ttl_hours must be between 0 and 720'}), HTTPStatus.BAD_REQUEST
+            settings.detail_cache_ttl_hours = ttl_hours
+        except (ValueError, TypeError):
+            return jsonify({'error': 'ttl_hours must be a valid number'}), HTTPStatus.BAD_REQUEST
+    
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Ustawienia cache opisów ofert zostały zaktualizowane',
+        'ttl_hours': settings.detail_cache_ttl_hours,
+    }), HTTPStatus.OK
+
+
+@bp.route('/scrape/detail-cache/purge', methods=['POST'])
+@jwt_required()
+def purge_detail_cache():
+    """Purge the offer detail cache (all entries, or only expired ones with expired_only)."""
+    from services.offer_detail_cache import purge_detail_cache as do_purge
+    
+    data = request.get_json(silent=True) or {}
+    deleted = do_purge(expired_only=bool(data.get('expired_only', False)))
+    
+    return jsonify({
+        'message': f'Cache opisów ofert został wyczyszczony - usunięto {deleted} wpisów',
+        'deleted': deleted,
+    }), HTTPStatus.OK
+
+
+# ============================================================================
+# Score cache endpoints
+# ============================================================================
+
+@bp.route('/scrape/score-cache', methods=['GET'])
+@jwt_required()
+def get_score_cache():
+    """Get LLM score cache settings, size and hit rate."""
+    from services.score_cache import get_score_cache_stats
+    
+    return jsonify(get_score_cache_stats()), HTTPStatus.OK
+
+
+@bp.route('/scrape/score-cache', methods=['PUT'])
+@jwt_required()
+def update_score_cache_settings():
+    """Update LLM score cache settings."""
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'error': 'No data provided'}), HTTPStatus.BAD_REQUEST
+    
+    settings = AppSettings.query.first()
+    if not settings:
+        settings = AppSettings()
+        db.session.add(settings)
+    
+    if 'ttl_hours' in data:
+        try:
+            ttl_hours = float(data['ttl_hours'])
+            if ttl_hours < 0 or ttl_hours > 720:  # Max 30 days, 0 disables reuse
+                return jsonify({'error': 'ttl_hours must be between 0 and 720'}), HTTPStatus.BAD_REQUEST
+            settings.score_cache_ttl_hours = ttl_hours
+        except (ValueError, TypeError):
+            return jsonify({'error': 'ttl_hours must be a valid number'}), HTTPStatus.BAD_REQUEST
+    
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Ustawienia cache ocen zostały zaktualizowane',
+        'ttl_hours': settings.score_cache_ttl_hours,
+    }), HTTPStatus.OK
+
+
+@bp.route('/scrape/score-cache/purge', methods=['POST'])
+@jwt_required()
+def purge_score_cache():
+    """Purge the LLM score cache (all entries, or only expired ones with expired_only)."""
+    from services.score_cache import purge_score_cache as do_purge, evict_expired_scores
+    
+    data = request.get_json(silent=True) or {}
+    deleted = evict_expired_scores() if data.get('expired_only') else do_purge()
+    
+    return jsonify({
+        'message': f'Cache ocen został wyczyszczony - usunięto {deleted} wpisów',
+        'deleted': deleted,
+    }), HTTPStatus.OK
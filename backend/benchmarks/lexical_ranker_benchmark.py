@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the lexical pre-ranker (services/lexical_ranker.py).
+
+Generates synthetic offers - a share of them matching the keyword profile - and reports
+ranking time, how many matching offers make it into the top-K, and the estimated prompt
+tokens sent to OpenAI with and without pre-ranking.
+
+Usage:
+    python benchmarks/lexical_ranker_benchmark.py
+    python benchmarks/lexical_ranker_benchmark.py --offers 500 2000 10000 --top-k 40
+"""
+
+import argparse
+import json
+import random
+import sys
+import os
+import time
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.lexical_ranker import prerank_offers
+from services.openai_scoring import _offer_for_prompt, estimate_tokens
+
+
+MUST_CONTAIN = ['python']
+MAY_CONTAIN = ['django', 'fastapi', 'postgresql']
+MUST_NOT_CONTAIN = ['wordpress']
+
+FILLER_WORDS = (
+    'projekt zespół klient aplikacja system praca zdalna doświadczenie wymagania oferujemy '
+    'team remote project client application experience requirements budget deadline support '
+    'design marketing sales content seo analytics mobile ios android figma copywriting'
+).split()
+OTHER_SKILLS = ['javascript', 'react', 'php', 'wordpress', 'java', 'golang', 'excel', 'photoshop', 'shopify']
+MATCHING_SHARE = 0.15
+
+
+def make_offers(count: int, seed: int = 7) -> list:
+    """Synthetic offers; about MATCHING_SHARE of them mention the must and may keywords."""
+    rng = random.Random(seed)
+    offers = []
+    for i in range(count):
+        matching = rng.random() < MATCHING_SHARE
+        skills = MUST_CONTAIN + rng.sample(MAY_CONTAIN, 2) if matching else rng.sample(OTHER_SKILLS, 3)
+        words = rng.choices(FILLER_WORDS, k=rng.randint(40, 90)) + skills * rng.randint(1, 3)
+        rng.shuffle(words)
+        offers.append({
+            'title': f"{skills[0].capitalize()} developer - {' '.join(rng.sample(FILLER_WORDS, 3))}",
+            'description': ' '.join(words),
+            'url': f'https://example.com/offers/{i}',
+            'budget': f'{rng.randint(10, 200) * 100} PLN',
+            'platform': rng.choice(['useme', 'justjoinit', 'upwork']),
+            'client_location': 'PL',
+            'matching': matching,
+        })
+    return offers
+
+
+def prompt_tokens(offers: list) -> int:
+    return sum(
+        estimate_tokens(json.dumps(_offer_for_prompt(i, offer), ensure_ascii=False, indent=2))
+        for i, offer in enumerate(offers)
+    )
+
+
+def run(count: int, top_k: int, repeats: int) -> None:
+    offers = make_offers(count)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        candidates, local = prerank_offers(offers, MUST_CONTAIN, MAY_CONTAIN, MUST_NOT_CONTAIN, top_k)
+        timings.append(time.perf_counter() - start)
+
+    matching = sum(1 for offer in offers if offer['matching'])
+    kept = sum(1 for i in candidates if offers[i]['matching'])
+    all_tokens = prompt_tokens(offers)
+    candidate_tokens = prompt_tokens([offers[i] for i in candidates])
+
+    print(
+        f"{count:>6} offers | rank {min(timings) * 1000:7.1f} ms | "
+        f"top-{top_k}: {kept}/{min(matching, top_k)} matching kept | "
+        f"prompt tokens {all_tokens:>8} -> {candidate_tokens:>6} "
+        f"(-{100 * (1 - candidate_tokens / all_tokens):.1f}%) | {len(local)} scored locally"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the lexical pre-ranker')
+    parser.add_argument('--offers', type=int, nargs='+', default=[200, 1000, 5000, 10000])
+    parser.add_argument('--top-k', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.offers:
+        run(count, args.top_k, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
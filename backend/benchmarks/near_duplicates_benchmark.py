@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark of near-duplicate detection (services/near_duplicates.py).
+
+Generates synthetic offers and cross-posts a share of them to another platform with
+small edits (a changed word, a platform footer). Reports clustering time, how many
+cross-posts were found, and how many distinct offers were wrongly merged.
+
+Usage:
+    python benchmarks/near_duplicates_benchmark.py
+    python benchmarks/near_duplicates_benchmark.py --offers 1000 5000 --cross-posted 0.2
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.near_duplicates import find_near_duplicates
+
+
+FILLER_WORDS = (
+    'projekt zespół klient aplikacja system praca zdalna doświadczenie wymagania oferujemy '
+    'team remote project client application experience requirements budget deadline support '
+    'design marketing sales content seo analytics mobile ios android figma copywriting '
+    'python django react php wordpress java golang excel photoshop shopify sklep strona'
+).split()
+PLATFORMS = ['useme', 'justjoinit', 'workconnect']
+FOOTERS = ['', 'Płatność przez Useme - bezpieczna transakcja.', 'Aplikuj przez formularz.']
+
+
+def make_offers(count: int, cross_posted: float, seed: int = 7) -> tuple:
+    """Synthetic offers plus edited copies of a share of them. Returns (offers, originals)."""
+    rng = random.Random(seed)
+    offers = []
+    for i in range(count):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(40, 120))
+        offers.append({
+            'title': ' '.join(rng.sample(FILLER_WORDS, 4)).capitalize(),
+            'description': ' '.join(words),
+            'url': f'https://example.com/offers/{i}',
+            'platform': rng.choice(PLATFORMS),
+        })
+
+    originals = {}  # Index of a copy -> index of its original
+    for i in rng.sample(range(count), int(count * cross_posted)):
+        words = offers[i]['description'].split()
+        words[rng.randrange(len(words))] = rng.choice(FILLER_WORDS)
+        originals[len(offers)] = i
+        offers.append({
+            'title': offers[i]['title'],
+            'description': f"{' '.join(words)} {rng.choice(FOOTERS)}".strip(),
+            'url': f'https://example.org/job/{i}',
+            'platform': rng.choice([p for p in PLATFORMS if p != offers[i]['platform']]),
+        })
+    return offers, originals
+
+
+def run(count: int, cross_posted: float, repeats: int) -> None:
+    offers, originals = make_offers(count, cross_posted)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        clusters = find_near_duplicates(offers)
+        timings.append(time.perf_counter() - start)
+
+    found = sum(1 for copy, original in originals.items() if clusters[copy] == clusters[original])
+    merged = count - len(set(clusters[:count]))
+
+    print(
+        f"{len(offers):>6} offers | cluster {min(timings) * 1000:7.1f} ms | "
+        f"cross-posts found {found}/{len(originals)} | distinct offers merged {merged} | "
+        f"{len(set(clusters))} clusters"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark near-duplicate detection')
+    parser.add_argument('--offers', type=int, nargs='+', default=[200, 1000, 5000, 10000])
+    parser.add_argument('--cross-posted', type=float, default=0.1)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for count in args.offers:
+        run(count, args.cross_posted, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the scoring prompt layout (services/openai_scoring.py).
+
+Builds the chunk prompts of a batch run for several users who share most of their
+offers, once with the previous layout (keywords first, offers pretty-printed with
+indent=2 in each user's own order) and once with the current one (keywords last,
+compact offers in content-hash order). Reports estimated prompt tokens and the part
+the API would serve from its prompt cache (prefixes of at least 1024 tokens, in
+128-token steps), and the resulting billed input tokens.
+
+Prefix caching only pays off when users get exactly the same offer set (--shared 1.0).
+With partly shared offers the chunk boundaries shift and the savings come almost
+entirely from the compact offer format.
+
+Usage:
+    python benchmarks/scoring_prompt_benchmark.py
+    python benchmarks/scoring_prompt_benchmark.py --users 20 --shared 1.0
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.openai_scoring import (
+    DEFAULT_SCORING_PROMPT, SCORING_SYSTEM_PROMPT, DEFAULT_SCORING_CHUNK_TOKENS,
+    _offer_for_prompt, chunk_offers_for_prompt, serialize_offers, estimate_tokens,
+)
+from services.score_cache import hash_offer
+
+
+# Layout used before the keywords were moved to the end and the offers compacted
+LEGACY_SCORING_PROMPT = """Jesteś ekspertem w ocenie ofert pracy dla freelancerów. Oceń każdą ofertę na podstawie następujących kryteriów:
+
+**Słowa kluczowe użytkownika:**
+- Musi zawierać: {must_contain}
+- Może zawierać: {may_contain}
+- Nie może zawierać: {must_not_contain}
+
+**Dla każdej oferty zwróć 3 oceny w skali 0-10:**
+1. **fit_score** (Dopasowanie): Jak dobrze oferta pasuje do podanych słów kluczowych i preferencji
+2. **attractiveness_score** (Atrakcyjność): Jak atrakcyjna jest oferta (budżet, jakość klienta, klarowność opisu)
+3. **overall_score** (Ocena ogólna): Średnia ważona powyższych z naciskiem na dopasowanie
+
+**Format odpowiedzi:**
+Zwróć JSON array z obiektami dla każdej oferty w tej samej kolejności:
+[
+  {{"offer_index": 0, "fit_score": 8.5, "attractiveness_score": 7.0, "overall_score": 8.0}},
+  {{"offer_index": 1, "fit_score": 6.0, "attractiveness_score": 9.0, "overall_score": 7.0}},
+  ...
+]
+
+**Oferty do oceny:**
+{offers_json}
+
+Odpowiedz TYLKO poprawnym JSON array, bez żadnego dodatkowego tekstu."""
+
+MIN_CACHED_PREFIX_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+CACHED_INPUT_DISCOUNT = 0.75  # gpt-4.1-mini bills cached input at a quarter of the price
+
+WORDS = (
+    'projekt zespół klient aplikacja system praca zdalna doświadczenie wymagania oferujemy python django '
+    'react backend frontend api integracja baza danych testy wdrożenie utrzymanie dokumentacja sklep'
+).split()
+PLATFORMS = ['useme', 'justjoinit', 'rocketjobs', 'upwork']
+
+
+def make_offer(rng: random.Random, i: int) -> dict:
+    return {
+        'title': f"{' '.join(rng.sample(WORDS, 4)).capitalize()} #{i}",
+        'description': ' '.join(rng.choices(WORDS, k=rng.randint(50, 90))),
+        'budget': rng.choice([None, '1000 - 2500 PLN', '5000 - 10000 PLN', '15 000 - 20 000 PLN']),
+        'platform': rng.choice(PLATFORMS),
+        'client_location': rng.choice([None, 'Poland', 'Germany']),
+        'url': f'https://example.com/{i}',
+    }
+
+
+def make_users(count: int, offers_per_user: int, shared: float, seed: int = 3) -> list:
+    """Users sharing `shared` of their offers (in their own order), the rest is unique per user."""
+    rng = random.Random(seed)
+    common = [make_offer(rng, i) for i in range(offers_per_user)]
+    users = []
+    for user in range(count):
+        offers = rng.sample(common, int(offers_per_user * shared))
+        offers += [make_offer(rng, 10000 * (user + 1) + i) for i in range(offers_per_user - len(offers))]
+        rng.shuffle(offers)
+        keywords = {
+            'must_contain': ', '.join(rng.sample(WORDS, 2)),
+            'may_contain': ', '.join(rng.sample(WORDS, 3)),
+            'must_not_contain': 'brak',
+        }
+        users.append((offers, keywords))
+    return users
+
+
+def legacy_prompts(offers: list, keywords: dict) -> list:
+    prompt_offers = []
+    for i, offer in enumerate(offers):
+        prompt_offer = _offer_for_prompt(i, offer)
+        prompt_offer.setdefault('budget', 'N/A')
+        prompt_offer.setdefault('client_location', 'N/A')
+        prompt_offers.append(prompt_offer)
+    return [
+        SCORING_SYSTEM_PROMPT + LEGACY_SCORING_PROMPT.format(offers_json=json.dumps(chunk, ensure_ascii=False, indent=2), **keywords)
+        for chunk in chunk_offers_for_prompt(prompt_offers, DEFAULT_SCORING_CHUNK_TOKENS)
+    ]
+
+
+def current_prompts(offers: list, keywords: dict) -> list:
+    order = sorted(range(len(offers)), key=lambda i: hash_offer(offers[i]))
+    prompt_offers = [_offer_for_prompt(i, offers[i]) for i in order]
+    return [
+        SCORING_SYSTEM_PROMPT + DEFAULT_SCORING_PROMPT.format(offers_json=serialize_offers(chunk), **keywords)
+        for chunk in chunk_offers_for_prompt(prompt_offers, DEFAULT_SCORING_CHUNK_TOKENS)
+    ]
+
+
+def simulate(prompts: list) -> dict:
+    """Estimated prompt tokens, cached tokens and billed tokens of prompts sent in order."""
+    total = cached = 0
+    sent = []
+    for prompt in prompts:
+        prefix = max((len(os.path.commonprefix([prompt, earlier])) for earlier in sent), default=0)
+        prefix_tokens = estimate_tokens(prompt[:prefix]) if prefix else 0
+        if prefix_tokens >= MIN_CACHED_PREFIX_TOKENS:
+            cached += prefix_tokens // CACHE_STEP_TOKENS * CACHE_STEP_TOKENS
+        total += estimate_tokens(prompt)
+        sent.append(prompt)
+    return {'prompt': total, 'cached': cached, 'billed': total - cached * CACHED_INPUT_DISCOUNT}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scoring prompt layout')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--offers', type=int, default=100, help='Offers per user')
+    parser.add_argument('--shared', type=float, default=0.8, help='Share of offers every user gets')
+    args = parser.parse_args()
+
+    users = make_users(args.users, args.offers, args.shared)
+    results = {
+        'legacy': simulate([prompt for offers, keywords in users for prompt in legacy_prompts(offers, keywords)]),
+        'current': simulate([prompt for offers, keywords in users for prompt in current_prompts(offers, keywords)]),
+    }
+    for layout, result in results.items():
+        print(
+            f"{layout:>8}: prompt tokens {result['prompt']:>8} | cached {result['cached']:>8} | "
+            f"billed {result['billed']:>10.0f}"
+        )
+    legacy, current = results['legacy']['billed'], results['current']['billed']
+    print(f"Billed input tokens: -{100 * (1 - current / legacy):.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark of offer selection (select_offers_with_diversity in services/openai_scoring.py).
+
+Compares the previous implementation (sorting every platform list and the whole remainder,
+list.pop(0)) with the current heap-based one on synthetic scored offers, checks that both
+select the same offers in the same order, and reports the time per call. Also times the
+MMR selection mode (services/mmr_selection.py), with text vectors computed (cold) and
+reused from the previous call (warm).
+
+Usage:
+    python benchmarks/selection_benchmark.py
+    python benchmarks/selection_benchmark.py --offers 10000 100000 --max-offers 10 30
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.openai_scoring import select_offers_with_diversity
+from services.mmr_selection import select_offers_with_mmr, _text_features
+
+
+PLATFORMS = ['useme', 'justjoinit', 'workconnect', 'upwork', 'fiverr']
+WORDS = [f'word{i}' for i in range(2000)]
+
+
+def legacy_select_offers_with_diversity(scored_offers, max_offers, min_fit_score=5.0, min_attractiveness_score=5.0):
+    """Selection before the heap-based rework (thresholds passed in instead of read from AppSettings)."""
+    if not scored_offers:
+        return []
+    if len(scored_offers) <= max_offers:
+        return scored_offers
+
+    def _meets_minimum_quality(offer, min_fit_score, min_attractiveness_score):
+        return offer.get("fit_score", 0) >= min_fit_score and offer.get("attractiveness_score", 0) >= min_attractiveness_score
+
+    quality_offers = [o for o in scored_offers if _meets_minimum_quality(o, min_fit_score, min_attractiveness_score)]
+    low_quality_offers = [o for o in scored_offers if not _meets_minimum_quality(o, min_fit_score, min_attractiveness_score)]
+
+    by_platform = {}
+    for offer in quality_offers:
+        by_platform.setdefault(offer.get("platform", "unknown"), []).append(offer)
+    for platform in by_platform:
+        by_platform[platform].sort(key=lambda x: x.get("overall_score", 0), reverse=True)
+
+    selected = []
+    platforms = list(by_platform.keys())
+    for platform in platforms:
+        if by_platform[platform] and len(selected) < max_offers:
+            selected.append(by_platform[platform].pop(0))
+
+    remaining_quality = []
+    for platform in platforms:
+        remaining_quality.extend(by_platform[platform])
+    remaining_quality.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
+    for offer in remaining_quality:
+        if len(selected) >= max_offers:
+            break
+        selected.append(offer)
+
+    if len(selected) < max_offers and low_quality_offers:
+        low_quality_offers.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
+        for offer in low_quality_offers:
+            if len(selected) >= max_offers:
+                break
+            selected.append(offer)
+
+    selected.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
+    return selected
+
+
+def make_offers(count: int, seed: int = 7) -> list:
+    """Synthetic scored offers with scores on a 0.5 grid, so many of them tie."""
+    rng = random.Random(seed)
+    return [
+        {
+            'url': f'https://example.com/offers/{i}',
+            'title': ' '.join(rng.choices(WORDS, k=5)),
+            'description': ' '.join(rng.choices(WORDS, k=60)),
+            'platform': rng.choice(PLATFORMS),
+            'fit_score': rng.randint(0, 20) / 2,
+            'attractiveness_score': rng.randint(0, 20) / 2,
+            'overall_score': rng.randint(0, 20) / 2,
+        }
+        for i in range(count)
+    ]
+
+
+def best_time(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(count: int, max_offers: int, repeats: int) -> None:
+    offers = make_offers(count)
+
+    legacy = legacy_select_offers_with_diversity(offers, max_offers)
+    current = select_offers_with_diversity(offers, max_offers)
+    same = [o['url'] for o in legacy] == [o['url'] for o in current]
+
+    legacy_time = best_time(lambda: legacy_select_offers_with_diversity(offers, max_offers), repeats)
+    current_time = best_time(lambda: select_offers_with_diversity(offers, max_offers), repeats)
+
+    _text_features.cache_clear()
+    start = time.perf_counter()
+    select_offers_with_mmr(offers, max_offers)
+    mmr_cold = time.perf_counter() - start
+    mmr_warm = best_time(lambda: select_offers_with_mmr(offers, max_offers), repeats)
+
+    print(
+        f"{count:>7} offers, top {max_offers:>3} | legacy {legacy_time * 1000:7.2f} ms | "
+        f"heap {current_time * 1000:7.2f} ms | {legacy_time / current_time:4.1f}x | "
+        f"same selection: {'yes' if same else 'NO'} | "
+        f"mmr {mmr_cold * 1000:7.1f} ms cold, {mmr_warm * 1000:6.1f} ms warm"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offer selection')
+    parser.add_argument('--offers', type=int, nargs='+', default=[1000, 10000, 50000, 100000])
+    parser.add_argument('--max-offers', type=int, nargs='+', default=[10, 30])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.offers:
+        for max_offers in args.max_offers:
+            run(count, max_offers, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,13 @@
 from sqlalchemy import text, Index
 from sqlalchemy import func, UniqueConstraint, CheckConstraint
+from sqlalchemy.orm import validates
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from enum import Enum
 import uuid
 
 from core.config import CONFIG
+from utils.urls import url_fingerprint
 
 db = SQLAlchemy()
 
@@ -70,6 +72,11 @@ class AppSettings(db.Model):
     # OpenAI settings for offer scoring
     openai_api_key = db.Column(db.String, nullable=True)  # Stored encrypted
     openai_scoring_prompt = db.Column(db.Text, nullable=True)  # Custom prompt for scoring offers
+    openai_base_url = db.Column(db.String, nullable=True)  # OpenAI-compatible API URL (None = OpenAI)
+    # Per-key budgets of the shared client pool (None = learned from x-ratelimit-* headers)
+    openai_rpm_limit = db.Column(db.Integer, nullable=True)
+    openai_tpm_limit = db.Column(db.Integer, nullable=True)
+    openai_max_concurrency = db.Column(db.Integer, default=8)  # Requests in flight per key
     
     # Minimum quality thresholds for offer selection (1-10 scale)
     # Offers below these thresholds won't be included unless needed to fill max_offers
@@ -93,6 +100,54 @@ class AppSettings(db.Model):
     # Shuffle keywords before scraping to add variety to search results
     shuffle_keywords = db.Column(db.Boolean, default=False)
     
+    # Chunked OpenAI scoring: offers are scored in token-sized chunks, several at once
+    scoring_chunk_tokens = db.Column(db.Integer, default=6000)  # Estimated prompt tokens of offers per request
+    scoring_workers = db.Column(db.Integer, default=4)  # Chunks scored at once
+    scoring_chunk_retries = db.Column(db.Integer, default=2)  # Extra attempts for offers of failed chunks
+    # 'combined' (one prompt per user) or 'two_stage' (attractiveness rated once per offer and shared by users)
+    scoring_mode = db.Column(db.String(20), default='combined')
+    # Only the top-K offers by local BM25 ranking are sent to OpenAI, the rest are scored locally (0 = send all)
+    scoring_top_k = db.Column(db.Integer, default=0)
+    # Scoring cascade: offline scores first, then model tiers rescoring slices of the ranking, e.g.
+    # [{"model": "gpt-4.1-nano", "top_k": 60}, {"model": "gpt-4.1", "borderline": 5}] (empty = one model, no cascade)
+    scoring_cascade = db.Column(db.JSON, default=[])
+    # 'platform_diversity' (best offer of each platform first) or 'mmr' (scores traded against similarity to picked offers)
+    selection_algorithm = db.Column(db.String(20), default='platform_diversity')
+    mmr_lambda = db.Column(db.Float, default=0.7)  # MMR weight of overall_score against similarity (0-1)
+    # How long LLM scores are reused for the same offer, keywords and prompt (in hours)
+    score_cache_ttl_hours = db.Column(db.Float, default=168.0)
+    
+    # Scraping performance settings
+    # Scrape enabled platforms concurrently (per user) using a bounded worker pool
+    parallel_platform_scraping = db.Column(db.Boolean, default=True)
+    platform_scrape_workers = db.Column(db.Integer, default=4)  # Max platforms scraped at once
+    # Scrape, score and store several users concurrently during batch runs
+    parallel_user_scraping = db.Column(db.Boolean, default=False)
+    user_scrape_workers = db.Column(db.Integer, default=2)  # Max users processed at once
+    # Per-platform HTTP connection pool overrides
+    # (e.g. {"justjoinit": {"pool_maxsize": 10, "max_retries": 2, "backoff_factor": 0.5}})
+    platform_http_settings = db.Column(db.JSON, default={})
+    # Per-platform request rate limits, applied per host and shared across threads
+    # (e.g. {"justjoinit": {"rate_per_second": 1.0, "burst": 2}})
+    host_rate_limits = db.Column(db.JSON, default={})
+    # Scraping engine: 'threads' (worker pools) or 'async' (one event loop for all users and platforms)
+    scrape_engine = db.Column(db.String(20), default='threads')
+    async_max_connections = db.Column(db.Integer, default=200)  # Requests in flight for the whole async run
+    async_host_concurrency = db.Column(db.Integer, default=8)  # Requests in flight per host
+    # Per-platform number of offer detail pages fetched at once (e.g. {"justjoinit": 4})
+    platform_detail_workers = db.Column(db.JSON, default={})
+    # Scrape deadlines: per-platform overrides in seconds (e.g. {"upwork": 120}, 0 = no deadline)
+    platform_deadlines = db.Column(db.JSON, default={})
+    user_deadline_seconds = db.Column(db.Integer, default=300)  # Budget for all platforms of one user (0 = none)
+    # Let timed-out platform scrapes finish in the background for the next user with the same search
+    continue_timed_out_scrapes = db.Column(db.Boolean, default=True)
+    # HTTP response cache with ETag/Last-Modified revalidation
+    http_cache_enabled = db.Column(db.Boolean, default=True)
+    # Per-platform freshness overrides (e.g. {"useme": {"fresh_seconds": 300}})
+    http_cache_settings = db.Column(db.JSON, default={})
+    # How long parsed offer descriptions are reused from the detail cache (in hours)
+    detail_cache_ttl_hours = db.Column(db.Float, default=72.0)
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -182,7 +237,7 @@ class Offer(db.Model):
     # Offer scraped from the platform
     __tablename__ = 'offers'
     __table_args__ = (
-        Index('ix_offers_url', 'url'),  # Index for fast URL lookups when checking duplicates
+        Index('ix_offers_url_fingerprint', 'url_fingerprint'),  # Fast duplicate checks by canonical URL
     )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
 
@@ -197,6 +252,7 @@ class Offer(db.Model):
     client_location = db.Column(db.String, nullable=True)
 
     url = db.Column(db.String, nullable=False)
+    url_fingerprint = db.Column(db.BigInteger, nullable=True)  # utils.urls.url_fingerprint(url), set with url
     platform = db.Column(db.String, nullable=False)
     
     # AI scoring (0-10 scale)
@@ -208,6 +264,11 @@ class Offer(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     deleted_at = db.Column(db.DateTime, nullable=True)
 
+    @validates('url')
+    def _set_url_fingerprint(self, key, url):
+        self.url_fingerprint = url_fingerprint(url)
+        return url
+
 
 class ScrapeLog(db.Model):
     """Log for batch scraping operations"""
@@ -224,6 +285,19 @@ class ScrapeLog(db.Model):
     failed_scrapes = db.Column(db.Integer, nullable=False, default=0)
     total_offers_scraped = db.Column(db.Integer, nullable=False, default=0)
     
+    # Run-wide fetch cache stats (search requests shared between users with the same keywords)
+    fetch_cache_hits = db.Column(db.Integer, nullable=True, default=0)
+    fetch_cache_misses = db.Column(db.Integer, nullable=True, default=0)
+    # Persistent offer detail cache stats (descriptions reused instead of fetching detail pages)
+    detail_cache_hits = db.Column(db.Integer, nullable=True, default=0)
+    detail_cache_misses = db.Column(db.Integer, nullable=True, default=0)
+    # LLM score cache stats (offers not sent to OpenAI because their score was cached)
+    score_cache_hits = db.Column(db.Integer, nullable=True, default=0)
+    score_cache_misses = db.Column(db.Integer, nullable=True, default=0)
+    # Scoring usage summed over users (ScoringStats fields: requests, tokens, latency, failures)
+    # plus 'per_user': [{"user_id": 1, "duration_ms": ..., "prompt_tokens": ..., ...}]
+    scoring_stats = db.Column(db.JSON, nullable=True)
+    
     # Errors stored as JSON array: [{"user_id": 1, "email": "...", "error": "..."}]
     errors = db.Column(db.JSON, nullable=True, default=[])
     
@@ -268,7 +342,7 @@ class CachedOffer(db.Model):
     __tablename__ = 'cached_offers'
     __table_args__ = (
         Index('ix_cached_offers_platform', 'platform'),
-        Index('ix_cached_offers_url', 'url'),
+        Index('ix_cached_offers_url_fingerprint', 'url_fingerprint'),
     )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     
@@ -282,6 +356,7 @@ class CachedOffer(db.Model):
     client_name = db.Column(db.String, nullable=True)
     client_location = db.Column(db.String, nullable=True)
     url = db.Column(db.String, nullable=False)
+    url_fingerprint = db.Column(db.BigInteger, nullable=True)  # utils.urls.url_fingerprint(url), set with url
     
     # Category from WorkConnect
     category = db.Column(db.String, nullable=True)
@@ -289,3 +364,54 @@ class CachedOffer(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates('url')
+    def _set_url_fingerprint(self, key, url):
+        self.url_fingerprint = url_fingerprint(url)
+        return url
+
+
+
+class OfferDetailCache(db.Model):
+    """
+    Parsed offer descriptions keyed by offer URL (e.g., JustJoinIT and RocketJobs detail pages).
+    The same offer shows up for many users and on consecutive days, so its description
+    is reused for detail_cache_ttl_hours instead of being downloaded again.
+    """
+    __tablename__ = 'offer_detail_cache'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    
+    url = db.Column(db.String, nullable=False, unique=True, index=True)
+    platform = db.Column(db.String, nullable=False)
+    description = db.Column(db.Text, nullable=True)
+    
+    fetched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+    last_hit_at = db.Column(db.DateTime, nullable=True)
+    
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class OfferScoreCache(db.Model):
+    """
+    LLM scores keyed by hashes of the offer content, the keyword profile and the prompt.
+    Users sharing keywords and offers carried over from previous runs reuse the score
+    instead of sending the offer to OpenAI again.
+    """
+    __tablename__ = 'offer_score_cache'
+    __table_args__ = (
+        UniqueConstraint('offer_hash', 'keywords_hash', 'prompt_hash', name='uq_offer_score_cache_key'),
+        Index('ix_offer_score_cache_created_at', 'created_at'),
+    )
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    
+    offer_hash = db.Column(db.String(64), nullable=False)
+    keywords_hash = db.Column(db.String(64), nullable=False)
+    prompt_hash = db.Column(db.String(64), nullable=False)
+    
+    fit_score = db.Column(db.Float, nullable=False)
+    attractiveness_score = db.Column(db.Float, nullable=False)
+    overall_score = db.Column(db.Float, nullable=False)
+    
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+    last_hit_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
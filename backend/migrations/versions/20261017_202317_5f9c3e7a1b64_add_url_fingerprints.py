@@ -0,0 +1,132 @@
+"""Add canonical URL fingerprints to offers and cached offers
+
+Revision ID: 5f9c3e7a1b64
+Revises: e81b4d6f2a95
+Create Date: 2026-10-17 20:23:17.418265
+
+"""
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f9c3e7a1b64'
+down_revision = 'e81b4d6f2a95'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_ROWS = 5000
+
+
+# Frozen copy of utils.urls as of this revision. Migrations must not follow later changes of
+# the app code: a changed canonicalizer needs its own migration that backfills again.
+_TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', 'ref', 'referrer', 'source',
+    'src', 'trk', 'tracking', 'from', 'campaign', 'igshid', 'si',
+}
+_TRACKING_PREFIXES = ('utm_',)
+_UPWORK_JOB = re.compile(r'_?(~0[0-9a-z]+)/?$', re.IGNORECASE)
+_USEME_JOB = re.compile(r'^/(?:[a-z]{2}/)?jobs/[^/]*?,(\d+)/?$', re.IGNORECASE)
+_WORKCONNECT_OFFER = re.compile(r'^/(?:[a-z]{2}/)?zlecenie/([^/]+)/?$', re.IGNORECASE)
+
+
+def _stable_offer_path(host, path):
+    if host.endswith('upwork.com'):
+        match = _UPWORK_JOB.search(path)
+        if match:
+            return f'/jobs/{match.group(1).lower()}'
+    elif host.endswith('useme.com'):
+        match = _USEME_JOB.match(path)
+        if match:
+            return f'/jobs/{match.group(1)}'
+    elif host.endswith('workconnect.app'):
+        match = _WORKCONNECT_OFFER.match(path)
+        if match:
+            return f'/zlecenie/{match.group(1)}'
+    return None
+
+
+def _canonicalize_url(url):
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    stable_path = _stable_offer_path(host, parts.path)
+    if stable_path:
+        return urlunsplit(('https', host, stable_path, '', ''))
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit(('https', host, parts.path.rstrip('/') or '/', urlencode(query), ''))
+
+
+def url_fingerprint(url):
+    digest = hashlib.blake2b(_canonicalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def backfill_fingerprints(table_name):
+    """Fill url_fingerprint of existing rows from their URL."""
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column('url', sa.String), sa.column('url_fingerprint', sa.BigInteger))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.url).where(table.c.id > last_id).order_by(table.c.id).limit(BACKFILL_BATCH_ROWS)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('row_id')).values(url_fingerprint=sa.bindparam('fingerprint')),
+            [{'row_id': row.id, 'fingerprint': url_fingerprint(row.url)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('url_fingerprint', sa.BigInteger(), nullable=True))
+
+    with op.batch_alter_table('cached_offers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('url_fingerprint', sa.BigInteger(), nullable=True))
+
+    # ### end Alembic commands ###
+
+    backfill_fingerprints('offers')
+    backfill_fingerprints('cached_offers')
+
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.drop_index('ix_offers_url')
+        batch_op.create_index('ix_offers_url_fingerprint', ['url_fingerprint'], unique=False)
+
+    with op.batch_alter_table('cached_offers', schema=None) as batch_op:
+        batch_op.drop_index('ix_cached_offers_url')
+        batch_op.create_index('ix_cached_offers_url_fingerprint', ['url_fingerprint'], unique=False)
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('cached_offers', schema=None) as batch_op:
+        batch_op.drop_index('ix_cached_offers_url_fingerprint')
+        batch_op.create_index('ix_cached_offers_url', ['url'], unique=False)
+        batch_op.drop_column('url_fingerprint')
+
+    with op.batch_alter_table('offers', schema=None) as batch_op:
+        batch_op.drop_index('ix_offers_url_fingerprint')
+        batch_op.create_index('ix_offers_url', ['url'], unique=False)
+        batch_op.drop_column('url_fingerprint')
+
+    # ### end Alembic commands ###
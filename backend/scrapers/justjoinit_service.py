@@ -2,14 +2,16 @@
 JustJoinIt scraper service with real and mock implementations.
 All scraping logic is contained in this single file.
 """
+import asyncio
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import quote
 
 from bs4 import BeautifulSoup
 
-from .utils import BaseScraper, ScrapedOffer, ScrapeResult, make_request
-from .utils.keywords_helper import filter_offers, deduplicate_offers
+from .utils import BaseScraper, ScrapeResult, make_request, cached_fetch, amake_request, acached_fetch
+from .utils.detail_fetcher import fetch_details, afetch_details
+from .utils.keywords_helper import keyword_queries, combine_query_results
 from .mock.justjoinit_mock import generate_justjoinit_mock_offers
 
 
@@ -31,6 +33,8 @@ class JustJoinITScraper(BaseScraper):
     
     def _build_search_url(self, query: str) -> str:
         """Build JustJoinIt search URL. Uses keyword param with comma-separated values."""
+        if not query:
+            return SEARCH_URL_BASE
         encoded_query = quote(query).replace("%2C", ",").replace("%20", "+")
         return f"{SEARCH_URL_BASE}&keyword={encoded_query}"
     
@@ -102,7 +106,11 @@ class JustJoinITScraper(BaseScraper):
     # -------------------------------------------------------------------------
     
     def _scrape_raw(self, query: str) -> List[Dict[str, Any]]:
-        """Scrape offers for a query without any filtering."""
+        """Scrape offers for a query without any filtering (shared across users within a batch run)."""
+        return cached_fetch(PLATFORM, query, lambda: self._fetch_raw(query))
+    
+    def _fetch_raw(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Fetch and parse offers for a query. Returns None if the request failed."""
         url = self._build_search_url(query)
         print(f"Scraping URL: {url}")
         
@@ -110,27 +118,49 @@ class JustJoinITScraper(BaseScraper):
             url,
             sleep_interval_seconds=1.0,
             max_retries=3,
-            backoff_factor=2.0
+            backoff_factor=2.0,
+            platform=PLATFORM,
         )
         
         if response is None:
             print(f"Failed to fetch {url} after all retries")
-            return []
+            return None
         
         return self._parse_offers_from_html(response.content)
     
     def _fetch_descriptions_for_offers(self, offers: List[Dict[str, Any]]) -> None:
-        """Fetch descriptions from detail pages for a list of offers (in-place)."""
-        for offer in offers:
-            print(f"Fetching description for offer: {offer.get('url', 'unknown')}")
-            detail_response = make_request(
-                offer['url'],
-                sleep_interval_seconds=1.0,
-                max_retries=2,
-                backoff_factor=2.0
-            )
-            if detail_response:
-                offer['description'] = self._parse_offer_description(detail_response.content)
+        """
+        Fetch descriptions from detail pages for a list of offers (in-place, concurrently).
+        Descriptions found in the persistent detail cache are reused without a request.
+        """
+        fetch_details(offers, PLATFORM, self._parse_offer_description)
+    
+    async def _ascrape_raw(self, query: str) -> List[Dict[str, Any]]:
+        """Async variant of _scrape_raw."""
+        return await acached_fetch(PLATFORM, query, lambda: self._afetch_raw(query))
+    
+    async def _afetch_raw(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Async variant of _fetch_raw."""
+        url = self._build_search_url(query)
+        print(f"Scraping URL: {url}")
+        
+        response = await amake_request(
+            url,
+            sleep_interval_seconds=1.0,
+            max_retries=3,
+            backoff_factor=2.0,
+            platform=PLATFORM,
+        )
+        
+        if response is None:
+            print(f"Failed to fetch {url} after all retries")
+            return None
+        
+        return self._parse_offers_from_html(response.content)
+    
+    async def _afetch_descriptions_for_offers(self, offers: List[Dict[str, Any]]) -> None:
+        """Async variant of _fetch_descriptions_for_offers."""
+        await afetch_details(offers, PLATFORM, self._parse_offer_description)
     
     # -------------------------------------------------------------------------
     # Main Scrape Method
@@ -149,7 +179,7 @@ class JustJoinITScraper(BaseScraper):
         """
         Real JustJoinIt scraping.
         
-        Search Strategy:
+        Search Strategy (see keyword_queries):
         - must_contain: Single request (platform handles AND logic via comma-separated query)
         - may_contain: Multiple requests (one per keyword), client-side filtering for must_contain
         - must_not_contain: Always filtered client-side
@@ -166,76 +196,68 @@ class JustJoinITScraper(BaseScraper):
         start_time = time.time()
         
         try:
-            all_offers = []
-            
-            # Path 1: must_contain - single request, platform handles AND
-            if must_contain:
-                query = ", ".join(must_contain)
-                offers = self._scrape_raw(query)
-                # Only filter out must_not_contain
-                offers = filter_offers(offers, must_not_include=must_not_contain)
-                all_offers.extend(offers)
-            
-            # Path 2: may_contain - multiple requests, client-side filtering for must_contain
-            for keyword in may_contain:
-                offers = self._scrape_raw(keyword)
-                # Filter for must_contain AND must_not_contain
-                offers = filter_offers(offers, must_include=must_contain, must_not_include=must_not_contain)
-                all_offers.extend(offers)
-            
-            # If no keywords provided, just scrape base URL
-            if not must_contain and not may_contain:
-                response = make_request(
-                    SEARCH_URL_BASE,
-                    sleep_interval_seconds=1.0,
-                    max_retries=3,
-                    backoff_factor=2.0
-                )
-                if response:
-                    offers = self._parse_offers_from_html(response.content)
-                    offers = filter_offers(offers, must_not_include=must_not_contain)
-                    all_offers.extend(offers)
-            
-            # Deduplicate and limit FIRST
-            all_offers = deduplicate_offers(all_offers)
-            limited_offers = all_offers[:max_offers]
+            queries = keyword_queries(must_contain, may_contain)
+            if queries:
+                results = [self._scrape_raw(query) for query, _ in queries]
+            else:
+                # If no keywords provided, just scrape base URL
+                queries, results = [('', [])], [self._fetch_raw('') or []]
             
-            # THEN fetch descriptions only for limited offers
+            limited_offers = self._limit_offers(queries, results, must_not_contain, max_offers)
             if fetch_descriptions and limited_offers:
-                print(f"Fetching descriptions for {len(limited_offers)} offers (limited from {len(all_offers)} total)")
                 self._fetch_descriptions_for_offers(limited_offers)
             
-            duration_millis = int((time.time() - start_time) * 1000)
+            return self._build_result(limited_offers, search_url, start_time)
             
-            # Convert to ScrapedOffer objects
-            scraped_offers = []
-            for raw in limited_offers:
-                scraped_offers.append(ScrapedOffer(
-                    title=raw.get('title', ''),
-                    description=raw.get('description') or '',
-                    url=raw.get('url', ''),
-                    platform=PLATFORM,
-                    budget=raw.get('budget'),
-                    client_name=raw.get('client_name'),
-                    client_location=raw.get('client_location'),
-                ))
+        except Exception as e:
+            return self._build_result([], search_url, start_time, error=str(e))
+    
+    async def ascrape(
+        self,
+        must_contain: List[str],
+        may_contain: List[str],
+        must_not_contain: List[str],
+        max_offers: int = 10,
+        api_key: str = None,
+        fetch_descriptions: bool = True,
+        **kwargs
+    ) -> ScrapeResult:
+        """
+        Native async JustJoinIt scraping. Same search strategy as scrape(), but search
+        requests and detail pages are issued concurrently.
+        """
+        search_url = self.get_search_url(must_contain, may_contain, must_not_contain)
+        start_time = time.time()
+        
+        try:
+            queries = keyword_queries(must_contain, may_contain)
+            if queries:
+                results = await asyncio.gather(*(self._ascrape_raw(query) for query, _ in queries))
+            else:
+                # If no keywords provided, just scrape base URL
+                queries, results = [('', [])], [await self._afetch_raw('') or []]
             
-            return ScrapeResult(
-                offers=scraped_offers,
-                search_url=search_url,
-                duration_millis=duration_millis,
-                platform=PLATFORM,
-            )
+            limited_offers = self._limit_offers(queries, results, must_not_contain, max_offers)
+            if fetch_descriptions and limited_offers:
+                await self._afetch_descriptions_for_offers(limited_offers)
+            
+            return self._build_result(limited_offers, search_url, start_time)
             
         except Exception as e:
-            duration_millis = int((time.time() - start_time) * 1000)
-            return ScrapeResult(
-                offers=[],
-                search_url=search_url,
-                duration_millis=duration_millis,
-                platform=PLATFORM,
-                error=str(e)
-            )
+            return self._build_result([], search_url, start_time, error=str(e))
+    
+    def _limit_offers(
+        self,
+        queries: List[Tuple[str, List[str]]],
+        results: List[List[Dict[str, Any]]],
+        must_not_contain: List[str],
+        max_offers: int,
+    ) -> List[Dict[str, Any]]:
+        """Filter, deduplicate and limit the offers of all queries, so descriptions are fetched only for the kept ones."""
+        all_offers = combine_query_results(queries, results, must_not_contain)
+        limited_offers = all_offers[:max_offers]
+        print(f"Keeping {len(limited_offers)} of {len(all_offers)} offers")
+        return limited_offers
     
     # -------------------------------------------------------------------------
     # Mock Scrape (for testing)
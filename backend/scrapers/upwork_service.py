@@ -79,10 +79,13 @@ class UpworkScraper(BaseScraper):
         max_offers: int = 10,
         api_key: str = None,
         print_logs: bool = False,
+        deadline_seconds: float = None,
         **kwargs
     ) -> ScrapeResult:
         """
         Real Upwork scraping using Apify.
+        With deadline_seconds the wait for the actor is capped; an unfinished run is
+        aborted and whatever it already stored in its dataset is returned.
         """
         if not api_key:
             return ScrapeResult(
@@ -108,7 +111,16 @@ class UpworkScraper(BaseScraper):
                 },
             }
 
-            if print_logs:
+            timed_out = False
+            if deadline_seconds:
+                run = client.actor(APIFY_ACTOR_ID).start(run_input=run_input, timeout_secs=TIMEOUT_SECONDS)
+                run_client = client.run(run["id"])
+                run = run_client.wait_for_finish(wait_secs=max(1, int(min(deadline_seconds, TIMEOUT_SECONDS + 30)))) or run
+                if run.get("status") not in ("SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"):
+                    # Still running at the deadline - stop paying for it and keep the partial dataset
+                    timed_out = True
+                    run = run_client.abort() or run
+            elif print_logs:
                 run = client.actor(APIFY_ACTOR_ID).call(run_input=run_input, timeout_secs=TIMEOUT_SECONDS)
             else:
                 run = client.actor(APIFY_ACTOR_ID).start(run_input=run_input, timeout_secs=TIMEOUT_SECONDS)
@@ -136,6 +148,7 @@ class UpworkScraper(BaseScraper):
                 search_url=search_url,
                 duration_millis=duration_millis,
                 platform=PLATFORM,
+                error=f"Apify run aborted after {int(deadline_seconds)}s deadline (partial results)" if timed_out else None,
             )
             
         except Exception as e:
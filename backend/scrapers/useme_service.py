@@ -2,15 +2,16 @@
 Useme scraper service with real and mock implementations.
 All scraping logic is contained in this single file.
 """
+import asyncio
 import time
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, quote
 
 from bs4 import BeautifulSoup
 
-from .utils import BaseScraper, ScrapedOffer, ScrapeResult, make_request
-from .utils.keywords_helper import parse_keywords, filter_offers, deduplicate_offers
+from .utils import BaseScraper, ScrapeResult, make_request, cached_fetch, amake_request, acached_fetch
+from .utils.keywords_helper import parse_keywords, keyword_queries, combine_query_results
 from .mock.useme_mock import generate_useme_mock_offers
 
 
@@ -104,7 +105,11 @@ class UsemeScraper(BaseScraper):
     # -------------------------------------------------------------------------
     
     def _scrape_raw(self, query: str) -> List[Dict[str, Any]]:
-        """Scrape offers for a query without any filtering."""
+        """Scrape offers for a query without any filtering (shared across users within a batch run)."""
+        return cached_fetch(PLATFORM, query, lambda: self._fetch_raw(query))
+    
+    def _fetch_raw(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Fetch and parse offers for a query. Returns None if the request failed."""
         url = self._build_search_url(query)
         print(f"Scraping URL: {url}")
         
@@ -112,15 +117,39 @@ class UsemeScraper(BaseScraper):
             url, 
             sleep_interval_seconds=1.0,
             max_retries=3,
-            backoff_factor=2.0
+            backoff_factor=2.0,
+            platform=PLATFORM,
         )
         
         if response is None:
             print(f"Failed to fetch {url} after all retries")
-            return []
+            return None
             
         return self._parse_offers_from_html(response.content)
     
+    async def _ascrape_raw(self, query: str) -> List[Dict[str, Any]]:
+        """Async variant of _scrape_raw."""
+        return await acached_fetch(PLATFORM, query, lambda: self._afetch_raw(query))
+    
+    async def _afetch_raw(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Async variant of _fetch_raw."""
+        url = self._build_search_url(query)
+        print(f"Scraping URL: {url}")
+        
+        response = await amake_request(
+            url,
+            sleep_interval_seconds=1.0,
+            max_retries=3,
+            backoff_factor=2.0,
+            platform=PLATFORM,
+        )
+        
+        if response is None:
+            print(f"Failed to fetch {url} after all retries")
+            return None
+        
+        return self._parse_offers_from_html(response.content)
+    
     # -------------------------------------------------------------------------
     # Main Scrape Method
     # -------------------------------------------------------------------------
@@ -137,7 +166,7 @@ class UsemeScraper(BaseScraper):
         """
         Real Useme scraping.
         
-        Search Strategy:
+        Search Strategy (see keyword_queries):
         - must_contain: Single request (platform handles AND logic via comma-separated query)
         - may_contain: Multiple requests (one per keyword), client-side filtering for must_contain
         - must_not_contain: Always filtered client-side
@@ -146,57 +175,38 @@ class UsemeScraper(BaseScraper):
         start_time = time.time()
         
         try:
-            all_offers = []
-            
-            # Path 1: must_contain - single request, platform handles AND
-            if must_contain:
-                query = ", ".join(must_contain)
-                offers = self._scrape_raw(query)
-                # Only filter out must_not_contain
-                offers = filter_offers(offers, must_not_include=must_not_contain)
-                all_offers.extend(offers)
-            
-            # Path 2: may_contain - multiple requests, client-side filtering for must_contain
-            for keyword in may_contain:
-                offers = self._scrape_raw(keyword)
-                # Filter for must_contain AND must_not_contain
-                offers = filter_offers(offers, must_include=must_contain, must_not_include=must_not_contain)
-                all_offers.extend(offers)
-            
-            # Deduplicate and limit
-            all_offers = deduplicate_offers(all_offers)
-            
-            duration_millis = int((time.time() - start_time) * 1000)
+            queries = keyword_queries(must_contain, may_contain)
+            results = [self._scrape_raw(query) for query, _ in queries]
+            all_offers = combine_query_results(queries, results, must_not_contain)
+            return self._build_result(all_offers[:max_offers], search_url, start_time)
             
-            # Convert to ScrapedOffer objects
-            scraped_offers = []
-            for raw in all_offers[:max_offers]:
-                scraped_offers.append(ScrapedOffer(
-                    title=raw.get('title', ''),
-                    description=raw.get('description', ''),
-                    url=raw.get('url', ''),
-                    platform=PLATFORM,
-                    budget=raw.get('budget'),
-                    client_name=raw.get('client_name'),
-                    client_location=raw.get('client_location'),
-                ))
-            
-            return ScrapeResult(
-                offers=scraped_offers,
-                search_url=search_url,
-                duration_millis=duration_millis,
-                platform=PLATFORM,
-            )
+        except Exception as e:
+            return self._build_result([], search_url, start_time, error=str(e))
+    
+    async def ascrape(
+        self,
+        must_contain: List[str],
+        may_contain: List[str],
+        must_not_contain: List[str],
+        max_offers: int = 10,
+        api_key: str = None,
+        **kwargs
+    ) -> ScrapeResult:
+        """
+        Native async Useme scraping. Same search strategy as scrape(),
+        but all search requests are issued concurrently.
+        """
+        search_url = self.get_search_url(must_contain, may_contain, must_not_contain)
+        start_time = time.time()
+        
+        try:
+            queries = keyword_queries(must_contain, may_contain)
+            results = await asyncio.gather(*(self._ascrape_raw(query) for query, _ in queries))
+            all_offers = combine_query_results(queries, results, must_not_contain)
+            return self._build_result(all_offers[:max_offers], search_url, start_time)
             
         except Exception as e:
-            duration_millis = int((time.time() - start_time) * 1000)
-            return ScrapeResult(
-                offers=[],
-                search_url=search_url,
-                duration_millis=duration_millis,
-                platform=PLATFORM,
-                error=str(e)
-            )
+            return self._build_result([], search_url, start_time, error=str(e))
     
     # -------------------------------------------------------------------------
     # Mock Scrape (for testing)
@@ -1,7 +1,13 @@
 # Scraper utilities package
 
 from .base_scraper import BaseScraper, ScrapedOffer, ScrapeResult, make_request
-from .keywords_helper import parse_keywords, filter_offers, deduplicate_offers
+from .keywords_helper import parse_keywords, filter_offers, deduplicate_offers, keyword_queries, combine_query_results
+from .fetch_cache import FetchCache, fetch_cache_scope, cached_fetch, acached_fetch
+from .http_pool import configure_http_pool, close_http_sessions, http_session_scope, acquire_http_sessions, release_http_sessions
+from .rate_limiter import configure_rate_limits
+from .async_http import amake_request, async_client_scope
+from .detail_fetcher import configure_detail_workers
+from .http_cache import configure_http_cache
 
 __all__ = [
     'BaseScraper',
@@ -11,4 +17,20 @@ __all__ = [
     'parse_keywords',
     'filter_offers',
     'deduplicate_offers',
+    'keyword_queries',
+    'combine_query_results',
+    'FetchCache',
+    'fetch_cache_scope',
+    'cached_fetch',
+    'acached_fetch',
+    'configure_http_pool',
+    'close_http_sessions',
+    'http_session_scope',
+    'acquire_http_sessions',
+    'release_http_sessions',
+    'configure_rate_limits',
+    'amake_request',
+    'async_client_scope',
+    'configure_detail_workers',
+    'configure_http_cache',
 ]
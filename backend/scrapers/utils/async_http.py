@@ -0,0 +1,133 @@
+"""
+Async HTTP layer for scrapers (httpx.AsyncClient).
+Used by BaseScraper.ascrape implementations so one process can keep many requests
+in flight. Requests are capped per host (semaphore) and still go through the shared
+per-host token bucket, so the async engine is exactly as polite as the threaded one.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .base_scraper import HEADERS
+from .http_cache import get_http_cache
+from .rate_limiter import reserve_request_slot
+
+
+DEFAULT_MAX_CONNECTIONS = 200  # Total requests in flight for one async run
+DEFAULT_HOST_CONCURRENCY = 8  # Requests in flight per host
+
+# Client and per-host semaphores of the async run in progress
+_current_client: ContextVar[Optional[httpx.AsyncClient]] = ContextVar('scraper_async_client', default=None)
+_current_host_caps: ContextVar[Optional['AsyncHostCaps']] = ContextVar('scraper_async_host_caps', default=None)
+
+
+class AsyncHostCaps:
+    """Per-host concurrency caps (one semaphore per host, created lazily)."""
+
+    def __init__(self, per_host: int = DEFAULT_HOST_CONCURRENCY):
+        self.per_host = max(1, per_host)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def for_url(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._semaphores[host]
+
+
+@asynccontextmanager
+async def async_client_scope(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    host_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+    headers: Optional[dict] = HEADERS,
+):
+    """Open a shared AsyncClient for the duration of an async scrape run."""
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    async with httpx.AsyncClient(limits=limits, headers=headers, timeout=30, follow_redirects=True) as client:
+        client_token = _current_client.set(client)
+        caps_token = _current_host_caps.set(AsyncHostCaps(host_concurrency))
+        try:
+            yield client
+        finally:
+            _current_host_caps.reset(caps_token)
+            _current_client.reset(client_token)
+
+
+async def amake_request(
+    url: str,
+    headers: Optional[dict] = None,
+    sleep_interval_seconds: float = 1.0,
+    max_retries: int = 3,
+    backoff_factor: float = 2.0,
+    platform: Optional[str] = None,
+) -> Optional[httpx.Response]:
+    """
+    Async counterpart of make_request: same retry/backoff and HTTP cache semantics, returns None on failure.
+    Must be called inside async_client_scope().
+    """
+    client = _current_client.get()
+    caps = _current_host_caps.get()
+    if client is None or caps is None:
+        raise RuntimeError("amake_request must be called inside async_client_scope()")
+
+    http_cache = get_http_cache()
+    cached, fresh = http_cache.lookup(url, platform)
+    if fresh:
+        return cached.to_httpx_response()
+    if cached:
+        headers = {**(headers or {}), **cached.conditional_headers()}
+
+    wait_time = sleep_interval_seconds
+    last_error = None
+
+    for attempt in range(max_retries):
+        try:
+            if attempt > 0:
+                await asyncio.sleep(wait_time)
+            async with caps.for_url(url):
+                await asyncio.sleep(reserve_request_slot(url, platform))
+                response = await client.get(url, headers=headers)
+
+            if response.status_code == 304 and cached:
+                http_cache.mark_not_modified(cached)
+                return cached.to_httpx_response()
+
+            if response.status_code == 429:
+                retry_after = response.headers.get('Retry-After')
+                if retry_after:
+                    wait_time = float(retry_after)
+                else:
+                    wait_time *= backoff_factor
+                print(f"Rate limited (429) on {url}, waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
+                continue
+
+            if response.status_code >= 500:
+                wait_time *= backoff_factor
+                print(f"Server error ({response.status_code}) on {url}, retry {attempt + 1}/{max_retries}")
+                continue
+
+            response.raise_for_status()
+            http_cache.store(url, response.content, response.headers, response.encoding, platform)
+            return response
+
+        except httpx.TimeoutException as e:
+            last_error = e
+            wait_time *= backoff_factor
+            print(f"Timeout on {url}, retry {attempt + 1}/{max_retries}")
+
+        except httpx.TransportError as e:
+            last_error = e
+            wait_time *= backoff_factor
+            print(f"Connection error on {url}: {e}, retry {attempt + 1}/{max_retries}")
+
+        except httpx.HTTPError as e:
+            last_error = e
+            print(f"Request error on {url}: {e}")
+            break  # Don't retry on other errors (e.g., 4xx client errors)
+
+    print(f"All {max_retries} retries failed for {url}. Last error: {last_error}")
+    return None
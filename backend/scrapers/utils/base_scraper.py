@@ -2,12 +2,17 @@
 Base scraper interface that all platform scrapers must implement.
 Each platform scraper should provide both real and mock implementations.
 """
+import asyncio
 import time
 import requests
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+from .http_cache import get_http_cache
+from .http_pool import get_session
+from .rate_limiter import acquire_request_slot
+
 
 HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
 
@@ -57,6 +62,15 @@ class ScrapeResult:
             'count': len(self.offers),
             'error': self.error,
         }
+    
+    def summary(self) -> Dict[str, Any]:
+        """Per-platform summary used in platform_results (offers excluded)"""
+        return {
+            'count': len(self.offers),
+            'duration_ms': self.duration_millis,
+            'search_url': self.search_url,
+            'error': self.error,
+        }
 
 
 class BaseScraper(ABC):
@@ -94,6 +108,41 @@ class BaseScraper(ABC):
         """
         pass
     
+    @property
+    def supports_async(self) -> bool:
+        """True if the scraper overrides ascrape with a native (non-threaded) implementation."""
+        return type(self).ascrape is not BaseScraper.ascrape
+    
+    async def ascrape(
+        self,
+        must_contain: List[str],
+        may_contain: List[str],
+        must_not_contain: List[str],
+        max_offers: int = 10,
+        api_key: str = None,
+        **kwargs
+    ) -> ScrapeResult:
+        """
+        Async scraping implementation.
+        Default runs the blocking scrape() in a worker thread; HTML scrapers override
+        it with a native implementation built on amake_request (see async_http).
+        
+        Args:
+            Same as scrape()
+            
+        Returns:
+            ScrapeResult with the scraped offers
+        """
+        return await asyncio.to_thread(
+            self.scrape,
+            must_contain=must_contain,
+            may_contain=may_contain,
+            must_not_contain=must_not_contain,
+            max_offers=max_offers,
+            api_key=api_key,
+            **kwargs
+        )
+    
     @abstractmethod
     def scrape_mock(
         self,
@@ -130,6 +179,33 @@ class BaseScraper(ABC):
         Override in subclass if the platform supports direct URL access.
         """
         return ""
+    
+    def _build_result(
+        self,
+        raw_offers: List[Dict[str, Any]],
+        search_url: str,
+        start_time: float,
+        error: str = None,
+    ) -> ScrapeResult:
+        """Convert raw offer dicts to a ScrapeResult (shared by scrape and ascrape)."""
+        return ScrapeResult(
+            offers=[
+                ScrapedOffer(
+                    title=raw.get('title', ''),
+                    description=raw.get('description') or '',
+                    url=raw.get('url', ''),
+                    platform=self.platform_name,
+                    budget=raw.get('budget'),
+                    client_name=raw.get('client_name'),
+                    client_location=raw.get('client_location'),
+                )
+                for raw in raw_offers
+            ],
+            search_url=search_url,
+            duration_millis=int((time.time() - start_time) * 1000),
+            platform=self.platform_name,
+            error=error,
+        )
 
 
 def make_request(
@@ -137,17 +213,23 @@ def make_request(
     headers: dict = HEADERS,
     sleep_interval_seconds: float = 1.0, 
     max_retries: int = 3,
-    backoff_factor: float = 2.0
+    backoff_factor: float = 2.0,
+    platform: Optional[str] = None,
 ) -> requests.Response:
     """
     Make HTTP GET request with retry logic and exponential backoff.
+    Uses the pooled keep-alive session of the URL's host (see http_pool) and
+    waits only when the host's rate limit budget is exhausted (see rate_limiter).
+    Cached responses are served while fresh or revalidated with a conditional
+    request; a 304 is answered from the cache (see http_cache).
     
     Args:
         url: URL to request
         headers: Optional headers dict
-        sleep_interval_seconds: Initial sleep before first request
+        sleep_interval_seconds: Initial wait before the first retry
         max_retries: Number of retry attempts
         backoff_factor: Multiplier for wait time after each failure
+        platform: Platform identifier, selects per-platform pool and rate limit settings
         
     Returns:
         Response object or None if all retries failed
@@ -157,13 +239,27 @@ def make_request(
         - Connection errors with retries
         - Server errors (5xx) with retries
     """
+    http_cache = get_http_cache()
+    cached, fresh = http_cache.lookup(url, platform)
+    if fresh:
+        return cached.to_response()
+    if cached:
+        headers = {**(headers or {}), **cached.conditional_headers()}
+    
     wait_time = sleep_interval_seconds
     last_error = None
+    session = get_session(url, platform)
     
     for attempt in range(max_retries):
         try:
-            time.sleep(wait_time)
-            response = requests.get(url, headers=headers, timeout=30)
+            if attempt > 0:
+                time.sleep(wait_time)
+            acquire_request_slot(url, platform)
+            response = session.get(url, headers=headers, timeout=30)
+            
+            if response.status_code == 304 and cached:
+                http_cache.mark_not_modified(cached)
+                return cached.to_response()
             
             # Handle rate limiting specifically
             if response.status_code == 429:
@@ -182,6 +278,7 @@ def make_request(
                 continue
                 
             response.raise_for_status()
+            http_cache.store(url, response.content, response.headers, response.encoding, platform)
             return response
             
         except requests.exceptions.Timeout as e:
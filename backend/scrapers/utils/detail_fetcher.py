@@ -0,0 +1,157 @@
+"""
+Concurrent detail-page fetching for scrapers that need a second request per offer
+(e.g. JustJoinIT and RocketJobs descriptions).
+Detail pages are fetched by a bounded pool per platform; every request still goes
+through make_request, so the host rate limit and pooled sessions apply. Descriptions
+are filled in place as results arrive and a failed page never blocks the others.
+A persistent description cache can be plugged in with configure_detail_cache: offers
+it knows are not fetched again, and fetched descriptions are stored in it.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Callable
+
+from .base_scraper import make_request
+from .async_http import amake_request
+
+
+DEFAULT_DETAIL_WORKERS = 4  # Detail pages fetched at once per platform
+
+# Per-platform overrides (e.g. {"justjoinit": 6}), set from AppSettings.platform_detail_workers
+_platform_workers: Dict[str, int] = {}
+_lock = threading.Lock()
+
+# Persistent description cache with lookup(urls) -> {url: description} and
+# store(platform, {url: description}) (services.offer_detail_cache.OfferDetailStore)
+_detail_cache = None
+
+
+def configure_detail_workers(platform_workers: Optional[Dict[str, int]]) -> None:
+    """Apply per-platform detail fetch parallelism."""
+    global _platform_workers
+    with _lock:
+        _platform_workers = dict(platform_workers or {})
+
+
+def configure_detail_cache(cache) -> None:
+    """Set the persistent description cache used by fetch_details (None disables it)."""
+    global _detail_cache
+    _detail_cache = cache
+
+
+def _fill_from_cache(cache, offers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill in cached descriptions (in place). Returns the offers that still need their page fetched."""
+    if cache is None or not offers:
+        return offers
+    cached = cache.lookup([offer['url'] for offer in offers])
+    missing = []
+    for offer in offers:
+        if offer['url'] in cached:
+            offer['description'] = cached[offer['url']]
+        else:
+            missing.append(offer)
+    return missing
+
+
+def _store_in_cache(cache, platform: str, offers: List[Dict[str, Any]]) -> None:
+    if cache is not None and offers:
+        cache.store(platform, {offer['url']: offer.get('description') for offer in offers})
+
+
+def detail_workers_for(platform: str) -> int:
+    """Get effective detail fetch parallelism for a platform."""
+    return max(1, _platform_workers.get(platform, DEFAULT_DETAIL_WORKERS))
+
+
+def fetch_details(
+    offers: List[Dict[str, Any]],
+    platform: str,
+    parse_description: Callable[[bytes], str],
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Fetch detail pages of offers concurrently and set offer['description'] in place.
+    Descriptions found in the configured detail cache are reused without a request.
+
+    Args:
+        offers: Offer dicts with 'url'
+        platform: Platform identifier (selects parallelism, pool and rate limit settings)
+        parse_description: Extracts the description from a detail page body
+        max_workers: Override for the platform's parallelism
+
+    Returns:
+        Number of offers whose description was filled in
+    """
+    cache = _detail_cache
+    missing = _fill_from_cache(cache, offers)
+    filled = len(offers) - len(missing)
+    if not missing:
+        return filled
+
+    workers = min(max_workers or detail_workers_for(platform), len(missing))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'details-{platform}') as executor:
+        futures = {executor.submit(_fetch_detail, offer['url'], platform): offer for offer in missing}
+        for future in as_completed(futures):
+            offer = futures[future]
+            try:
+                response = future.result()
+                if response:
+                    offer['description'] = parse_description(response.content)
+                    filled += 1
+            except Exception as e:
+                print(f"Failed to fetch description for {offer.get('url', 'unknown')}: {e}")
+
+    _store_in_cache(cache, platform, missing)
+    return filled
+
+
+async def afetch_details(
+    offers: List[Dict[str, Any]],
+    platform: str,
+    parse_description: Callable[[bytes], str],
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Async variant of fetch_details (bounded by a semaphore instead of threads).
+    The blocking detail cache lookup and store run in worker threads, off the event loop.
+    """
+    cache = _detail_cache
+    missing = await asyncio.to_thread(_fill_from_cache, cache, offers)
+    if not missing:
+        return len(offers)
+
+    semaphore = asyncio.Semaphore(max_workers or detail_workers_for(platform))
+
+    async def fetch_one(offer: Dict[str, Any]) -> bool:
+        try:
+            async with semaphore:
+                response = await amake_request(
+                    offer['url'],
+                    sleep_interval_seconds=1.0,
+                    max_retries=2,
+                    backoff_factor=2.0,
+                    platform=platform,
+                )
+            if response:
+                offer['description'] = parse_description(response.content)
+                return True
+        except Exception as e:
+            print(f"Failed to fetch description for {offer.get('url', 'unknown')}: {e}")
+        return False
+
+    results = await asyncio.gather(*(fetch_one(offer) for offer in missing))
+    await asyncio.to_thread(_store_in_cache, cache, platform, missing)
+    return len(offers) - len(missing) + sum(results)
+
+
+def _fetch_detail(url: str, platform: str):
+    print(f"Fetching description for offer: {url}")
+    return make_request(
+        url,
+        sleep_interval_seconds=1.0,
+        max_retries=2,
+        backoff_factor=2.0,
+        platform=platform,
+    )
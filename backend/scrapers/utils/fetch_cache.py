@@ -0,0 +1,145 @@
+"""
+Run-wide fetch cache for scrapers.
+Memoizes parsed raw offer lists by (platform, normalized query) so that users
+sharing keywords trigger only one network request per query within a batch run.
+"""
+import asyncio
+import re
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+
+
+class FetchCache:
+    """Thread-safe cache of raw offer lists, scoped to a single batch run."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._pending: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_fetch(
+        self,
+        platform: str,
+        query: str,
+        fetch: Callable[[], Optional[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Return cached offers for (platform, query) or call fetch() once to load them.
+        Concurrent callers for the same key wait for the first fetch instead of repeating it.
+        Failed fetches (None) are not cached.
+        """
+        key = (platform, normalize_query(query))
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    return _copy_offers(self._entries[key])
+                self.misses += 1
+
+            offers = fetch()
+            if offers is None:
+                return []
+
+            with self._lock:
+                self._entries[key] = offers
+            return _copy_offers(offers)
+
+    async def aget_or_fetch(
+        self,
+        platform: str,
+        query: str,
+        afetch: Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of get_or_fetch for the async engine (single event loop per run).
+        Concurrent coroutines for the same key await one shared task.
+        """
+        key = (platform, normalize_query(query))
+
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return _copy_offers(self._entries[key])
+            task = self._pending.get(key)
+            if task is None:
+                self.misses += 1
+                task = asyncio.ensure_future(afetch())
+                self._pending[key] = task
+            else:
+                self.hits += 1
+
+        try:
+            offers = await asyncio.shield(task)
+        finally:
+            with self._lock:
+                if self._pending.get(key) is task and task.done():
+                    del self._pending[key]
+
+        if offers is None:
+            return []
+        with self._lock:
+            self._entries.setdefault(key, offers)
+        return _copy_offers(offers)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query: case-insensitive, single spaces, canonical comma separators."""
+    parts = [re.sub(r'\s+', ' ', part).strip() for part in (query or '').casefold().split(',')]
+    return ', '.join(part for part in parts if part)
+
+
+def _copy_offers(offers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Scrapers fill in fields (e.g. descriptions) in place, so never hand out shared dicts
+    return [dict(offer) for offer in offers]
+
+
+# Cache of the batch run in progress (None outside of a run)
+_active_cache: Optional[FetchCache] = None
+
+
+@contextmanager
+def fetch_cache_scope():
+    """Activate a fresh FetchCache for the duration of a batch run."""
+    global _active_cache
+    cache = FetchCache()
+    _active_cache = cache
+    try:
+        yield cache
+    finally:
+        _active_cache = None
+
+
+def cached_fetch(
+    platform: str,
+    query: str,
+    fetch: Callable[[], Optional[List[Dict[str, Any]]]]
+) -> List[Dict[str, Any]]:
+    """Fetch through the active run cache, or directly when no batch run is active."""
+    cache = _active_cache
+    if cache is None:
+        return fetch() or []
+    return cache.get_or_fetch(platform, query, fetch)
+
+
+async def acached_fetch(
+    platform: str,
+    query: str,
+    afetch: Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]]
+) -> List[Dict[str, Any]]:
+    """Async variant of cached_fetch."""
+    cache = _active_cache
+    if cache is None:
+        return await afetch() or []
+    return await cache.aget_or_fetch(platform, query, afetch)
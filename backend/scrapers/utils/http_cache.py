@@ -0,0 +1,166 @@
+"""
+In-memory HTTP response cache for scrapers with ETag/Last-Modified revalidation.
+Response bodies are stored zlib-compressed together with their validators. A cached
+URL is served directly while fresh (per-platform fresh_seconds), otherwise it is
+revalidated with a conditional request and a 304 is answered from the cache.
+"""
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_HTTP_CACHE_SETTINGS = {
+    'fresh_seconds': 0,  # Serve without revalidation for this long (0 = always revalidate)
+}
+DEFAULT_MAX_ENTRIES = 512
+
+# Response headers kept with a cached body
+_STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+
+@dataclass
+class CachedResponse:
+    """Compressed response body with its validators."""
+    url: str
+    body: bytes  # zlib-compressed
+    headers: Dict[str, str]
+    encoding: Optional[str]
+    stored_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers turning a GET into a conditional request."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a requests.Response (as returned by make_request)."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response._content = zlib.decompress(self.body)
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response.from_cache = True
+        return response
+
+    def to_httpx_response(self) -> httpx.Response:
+        """Rebuild an httpx.Response (as returned by amake_request)."""
+        return httpx.Response(
+            200,
+            headers=self.headers,
+            content=zlib.decompress(self.body),
+            request=httpx.Request('GET', self.url),
+        )
+
+
+class HttpResponseCache:
+    """Thread-safe LRU of cached responses keyed by URL."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.enabled = True
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._platform_settings: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0  # Served without a request (fresh)
+        self.revalidated = 0  # 304 Not Modified
+        self.misses = 0
+
+    def configure(self, platform_settings: Optional[Dict[str, Dict[str, Any]]], enabled: bool = True) -> None:
+        """Set per-platform freshness. Disabling the cache drops all entries."""
+        with self._lock:
+            self._platform_settings = dict(platform_settings or {})
+            self.enabled = enabled
+            if not enabled:
+                self._entries.clear()
+
+    def settings_for(self, platform: Optional[str]) -> Dict[str, Any]:
+        """Get effective cache settings for a platform (defaults + overrides)."""
+        overrides = self._platform_settings.get(platform, {}) if platform else {}
+        return {**DEFAULT_HTTP_CACHE_SETTINGS, **overrides}
+
+    def lookup(self, url: str, platform: Optional[str] = None) -> Tuple[Optional[CachedResponse], bool]:
+        """Return (entry, is_fresh) for a URL; (None, False) if not cached."""
+        if not self.enabled:
+            return None, False
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(url)
+            fresh = time.time() - entry.stored_at < self.settings_for(platform)['fresh_seconds']
+            if fresh:
+                self.hits += 1
+            return entry, fresh
+
+    def mark_not_modified(self, entry: CachedResponse) -> None:
+        """Record a 304 for an entry and restart its freshness window."""
+        with self._lock:
+            entry.stored_at = time.time()
+            self.revalidated += 1
+
+    def store(self, url: str, body: bytes, headers, encoding: Optional[str], platform: Optional[str] = None) -> None:
+        """Cache a 200 response if it can be revalidated or is allowed to be served fresh."""
+        if not self.enabled or 'no-store' in (headers.get('Cache-Control') or ''):
+            return
+        if not (headers.get('ETag') or headers.get('Last-Modified')) and not self.settings_for(platform)['fresh_seconds']:
+            return
+        entry = CachedResponse(
+            url=url,
+            body=zlib.compress(body),
+            headers={name: headers[name] for name in _STORED_HEADERS if headers.get(name)},
+            encoding=encoding,
+            stored_at=time.time(),
+        )
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'compressed_bytes': sum(len(entry.body) for entry in self._entries.values()),
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+            }
+
+
+# Process-wide cache shared by make_request and amake_request
+_cache = HttpResponseCache()
+
+
+def get_http_cache() -> HttpResponseCache:
+    return _cache
+
+
+def configure_http_cache(platform_settings: Optional[Dict[str, Dict[str, Any]]], enabled: bool = True) -> None:
+    """Apply per-platform cache settings (e.g. from AppSettings.http_cache_settings)."""
+    _cache.configure(platform_settings, enabled)
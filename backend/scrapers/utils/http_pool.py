@@ -0,0 +1,149 @@
+"""
+Pooled HTTP sessions for scrapers.
+Keeps one keep-alive requests.Session per host so listing and detail pages reuse
+TCP/TLS connections instead of paying a fresh handshake on every request.
+Pool sizes and connection-level retries are configurable per platform.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_POOL_SETTINGS = {
+    'pool_connections': 4,  # Number of per-host connection pools to cache
+    'pool_maxsize': 10,  # Max keep-alive connections per host (>= parallel requests to it)
+    'max_retries': 2,  # Connection-level retries (DNS, refused, reset) done by the adapter
+    'backoff_factor': 0.5,  # urllib3 backoff between connection retries
+}
+
+
+def _build_session(pool_settings: Dict[str, Any]) -> requests.Session:
+    """Create a keep-alive session with a pooled, retrying adapter."""
+    retry = Retry(
+        total=pool_settings['max_retries'],
+        connect=pool_settings['max_retries'],
+        read=0,  # HTTP status/read retries are handled by make_request
+        status=0,
+        backoff_factor=pool_settings['backoff_factor'],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_settings['pool_connections'],
+        pool_maxsize=pool_settings['pool_maxsize'],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.headers['Connection'] = 'keep-alive'
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class HttpSessionPool:
+    """Thread-safe registry of one pooled session per host."""
+
+    def __init__(self):
+        self._sessions: Dict[str, requests.Session] = {}
+        self._platform_settings: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._leases = 0  # Run scopes and background jobs currently using the sessions
+        self._close_when_idle = False
+
+    def configure(self, platform_settings: Optional[Dict[str, Dict[str, Any]]]) -> None:
+        """Set per-platform pool settings. Open sessions are closed if the settings changed."""
+        platform_settings = platform_settings or {}
+        with self._lock:
+            if platform_settings == self._platform_settings:
+                return
+            self._platform_settings = dict(platform_settings)
+            self._close_sessions()
+
+    def settings_for(self, platform: Optional[str]) -> Dict[str, Any]:
+        """Get effective pool settings for a platform (defaults + overrides)."""
+        overrides = self._platform_settings.get(platform, {}) if platform else {}
+        return {**DEFAULT_POOL_SETTINGS, **overrides}
+
+    def get_session(self, url: str, platform: Optional[str] = None) -> requests.Session:
+        """Get (or lazily create) the session for the URL's host."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = _build_session(self.settings_for(platform))
+                self._sessions[host] = session
+            return session
+
+    def close(self) -> None:
+        """Close all sessions and their pooled connections."""
+        with self._lock:
+            self._close_sessions()
+
+    def acquire(self) -> None:
+        """Keep the sessions open until the matching release()."""
+        with self._lock:
+            self._leases += 1
+
+    def release(self, close_when_idle: bool = False) -> None:
+        """
+        Drop a lease taken with acquire(). With close_when_idle the sessions are closed once
+        no lease is left, so jobs still running after their run ended keep their connections.
+        """
+        with self._lock:
+            self._leases -= 1
+            self._close_when_idle = self._close_when_idle or close_when_idle
+            if self._leases <= 0 and self._close_when_idle:
+                self._leases = 0
+                self._close_when_idle = False
+                self._close_sessions()
+
+    def _close_sessions(self) -> None:
+        for session in self._sessions.values():
+            session.close()
+        self._sessions = {}
+
+
+# Process-wide pool used by make_request
+_pool = HttpSessionPool()
+
+
+def get_session(url: str, platform: Optional[str] = None) -> requests.Session:
+    """Get the pooled session for a URL."""
+    return _pool.get_session(url, platform)
+
+
+def configure_http_pool(platform_settings: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    """Apply per-platform pool settings (e.g. from AppSettings.platform_http_settings)."""
+    _pool.configure(platform_settings)
+
+
+def close_http_sessions() -> None:
+    """Close all pooled sessions (they are recreated lazily on next use)."""
+    _pool.close()
+
+
+def acquire_http_sessions() -> None:
+    """Keep pooled sessions open for a job that may outlive its run (see HttpSessionPool.release)."""
+    _pool.acquire()
+
+
+def release_http_sessions() -> None:
+    _pool.release()
+
+
+@contextmanager
+def http_session_scope(platform_settings: Optional[Dict[str, Dict[str, Any]]] = None):
+    """
+    Configure the pool for a batch run and release its connections when the run ends,
+    or once the last job acquired during the run finishes.
+    """
+    configure_http_pool(platform_settings)
+    _pool.acquire()
+    try:
+        yield _pool
+    finally:
+        _pool.release(close_when_idle=True)
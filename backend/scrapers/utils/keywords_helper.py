@@ -3,7 +3,9 @@ Keywords filtering helper for scrapers.
 Provides functions to filter offers based on keyword criteria.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+from utils.urls import url_fingerprint
 
 
 def parse_keywords(keywords_string: str) -> List[str]:
@@ -60,7 +62,32 @@ def filter_offers(
 
 
 def deduplicate_offers(offers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate offers by URL."""
-    unique = {offer['url']: offer for offer in offers}
+    """Remove duplicate offers by canonical URL (see utils.urls)."""
+    unique = {url_fingerprint(offer['url']): offer for offer in offers}
     return list(unique.values())
 
+
+def keyword_queries(must_contain: List[str], may_contain: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Search queries of the keyword strategy, each with the keywords its results must still include.
+    
+    Search Strategy:
+    - must_contain: Single request (platform handles AND logic via comma-separated query)
+    - may_contain: Multiple requests (one per keyword), client-side filtering for must_contain
+    - must_not_contain: Always filtered client-side (see combine_query_results)
+    """
+    queries = [(", ".join(must_contain), [])] if must_contain else []
+    return queries + [(keyword, list(must_contain)) for keyword in may_contain]
+
+
+def combine_query_results(
+    queries: List[Tuple[str, List[str]]],
+    results: List[List[Dict[str, Any]]],
+    must_not_contain: List[str],
+) -> List[Dict[str, Any]]:
+    """Filter the offers of each query (results in queries order) and deduplicate them."""
+    offers = []
+    for (_, must_include), query_offers in zip(queries, results):
+        offers.extend(filter_offers(query_offers, must_include=must_include, must_not_include=must_not_contain))
+    return deduplicate_offers(offers)
+
@@ -0,0 +1,109 @@
+"""
+Per-host token-bucket rate limiter for scrapers.
+Callers only wait when they would exceed the host's budget, so idle hosts are hit
+immediately while parallel scraping (threads) stays polite.
+"""
+import threading
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+
+DEFAULT_RATE_LIMIT = {
+    'rate_per_second': 1.0,  # Sustained requests per second per host
+    'burst': 2,  # Requests allowed back-to-back after the host has been idle
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Tokens refill at `rate` (> 0) per second up to `burst`."""
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before using it.
+        Tokens may go negative, which queues callers fairly without holding the lock while sleeping.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the time waited in seconds."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Registry of token buckets keyed by host, configured per platform."""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._platform_limits: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, platform_limits: Optional[Dict[str, Dict[str, Any]]]) -> None:
+        """Set per-platform limits. Buckets are rebuilt if the limits changed."""
+        platform_limits = platform_limits or {}
+        with self._lock:
+            if platform_limits == self._platform_limits:
+                return
+            self._platform_limits = dict(platform_limits)
+            self._buckets = {}
+
+    def limits_for(self, platform: Optional[str]) -> Dict[str, Any]:
+        """Get effective limits for a platform (defaults + overrides)."""
+        overrides = self._platform_limits.get(platform, {}) if platform else {}
+        limits = {**DEFAULT_RATE_LIMIT, **overrides}
+        # Settings saved before rates had to be positive: 0 never meant "unlimited"
+        if not limits['rate_per_second'] or limits['rate_per_second'] <= 0:
+            limits['rate_per_second'] = DEFAULT_RATE_LIMIT['rate_per_second']
+        return limits
+
+    def bucket_for(self, url: str, platform: Optional[str] = None) -> TokenBucket:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limits = self.limits_for(platform)
+                bucket = TokenBucket(rate=limits['rate_per_second'], burst=limits['burst'])
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str, platform: Optional[str] = None) -> float:
+        """Wait (if needed) until a request to the URL's host fits the budget."""
+        return self.bucket_for(url, platform).acquire()
+
+
+# Process-wide limiter shared by all scrapers and threads
+_limiter = HostRateLimiter()
+
+
+def acquire_request_slot(url: str, platform: Optional[str] = None) -> float:
+    """Wait for the host's rate limit before sending a request."""
+    return _limiter.acquire(url, platform)
+
+
+def reserve_request_slot(url: str, platform: Optional[str] = None) -> float:
+    """Reserve a slot without blocking; returns how long to wait (for async callers)."""
+    return _limiter.bucket_for(url, platform).reserve()
+
+
+def configure_rate_limits(platform_limits: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    """Apply per-platform limits (e.g. from AppSettings.host_rate_limits)."""
+    _limiter.configure(platform_limits)
@@ -0,0 +1,148 @@
+"""
+Async scraping engine.
+Runs the platform scrapes of one user - or of every user in a batch run - in a single
+event loop, so one process can keep hundreds of requests in flight. Native async
+scrapers (BaseScraper.supports_async) share one httpx client capped per host; the
+remaining scrapers (Apify, DB-backed) run in worker threads with their own app context.
+"""
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from scrapers import get_scraper
+from scrapers.utils import async_client_scope
+from scrapers.utils.async_http import DEFAULT_MAX_CONNECTIONS, DEFAULT_HOST_CONCURRENCY
+
+
+# (platform, platform_limit, api_key) as resolved by scrape_all_platforms
+PlatformJob = Tuple[str, int, Optional[str]]
+
+SCRAPER_DEADLINE_MARGIN_SECONDS = 5
+
+
+def get_async_limits(settings) -> Tuple[int, int]:
+    """Get (max_connections, host_concurrency) for the async engine from settings."""
+    max_connections = settings.async_max_connections if settings and settings.async_max_connections else DEFAULT_MAX_CONNECTIONS
+    host_concurrency = settings.async_host_concurrency if settings and settings.async_host_concurrency else DEFAULT_HOST_CONCURRENCY
+    return max(1, max_connections), max(1, host_concurrency)
+
+
+def _scrape_in_app_context(app, scraper, **kwargs):
+    with app.app_context():
+        return scraper.scrape(**kwargs)
+
+
+async def ascrape_platform(
+    app,
+    platform: str,
+    platform_limit: int,
+    api_key: Optional[str],
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+    print_logs: bool = False,
+    deadline_seconds: Optional[float] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Scrape a single platform on the event loop.
+    Past deadline_seconds the scrape is cancelled and recorded with timed_out=True
+    (the event loop ends with the run, so there is no background continuation here).
+
+    Returns:
+        Tuple of (platform_result entry, list of offer dicts)
+    """
+    scrape_kwargs = dict(
+        must_contain=must_contain,
+        may_contain=may_contain,
+        must_not_contain=must_not_contain,
+        max_offers=platform_limit,
+        api_key=api_key,
+        print_logs=print_logs,
+    )
+    try:
+        scraper = get_scraper(platform)
+        if scraper.supports_async:
+            scrape = scraper.ascrape(**scrape_kwargs)
+        else:
+            # Blocking scrapers may touch the DB, so give their thread its own app context.
+            # They can't be cancelled, so let them stop on their own shortly before the deadline.
+            if deadline_seconds:
+                scrape_kwargs['deadline_seconds'] = max(1, deadline_seconds - SCRAPER_DEADLINE_MARGIN_SECONDS)
+            scrape = asyncio.to_thread(_scrape_in_app_context, app, scraper, **scrape_kwargs)
+        result = await asyncio.wait_for(scrape, timeout=deadline_seconds)
+        return result.summary(), [offer.to_dict() for offer in result.offers]
+    except asyncio.TimeoutError:
+        if print_logs:
+            print(f"{platform} timed out after {int(deadline_seconds)}s")
+        return {'count': 0, 'error': f'Timed out after {int(deadline_seconds)}s', 'timed_out': True}, []
+    except Exception as e:
+        if print_logs:
+            print(f"Error scraping {platform}: {e}")
+        return {'count': 0, 'error': str(e)}, []
+
+
+async def ascrape_platforms(
+    app,
+    jobs: List[PlatformJob],
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+    print_logs: bool = False,
+    deadlines: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Scrape all platform jobs of one user concurrently.
+    deadlines maps platform -> seconds (already capped by the user's budget).
+
+    Returns:
+        Dict with 'outcomes' ({platform: (platform_result, offers)}) and 'duration_ms' (wall time)
+    """
+    start_time = time.time()
+    outcomes = await asyncio.gather(*(
+        ascrape_platform(
+            app, platform, platform_limit, api_key,
+            must_contain=must_contain,
+            may_contain=may_contain,
+            must_not_contain=must_not_contain,
+            print_logs=print_logs,
+            deadline_seconds=(deadlines or {}).get(platform),
+        )
+        for platform, platform_limit, api_key in jobs
+    ))
+    return {
+        'outcomes': {job[0]: outcome for job, outcome in zip(jobs, outcomes)},
+        'duration_ms': int((time.time() - start_time) * 1000),
+    }
+
+
+async def ascrape_users(
+    app,
+    user_jobs: List[Dict[str, Any]],
+    print_logs: bool = False,
+    deadlines: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape all users of a batch run concurrently.
+    Each user job holds 'jobs', 'must_contain', 'may_contain' and 'must_not_contain'.
+    Returns one ascrape_platforms result per user job, in order.
+    """
+    return await asyncio.gather(*(
+        ascrape_platforms(
+            app,
+            user_job['jobs'],
+            must_contain=user_job['must_contain'],
+            may_contain=user_job['may_contain'],
+            must_not_contain=user_job['must_not_contain'],
+            print_logs=print_logs,
+            deadlines=deadlines,
+        )
+        for user_job in user_jobs
+    ))
+
+
+def run_async_scrape(coro_factory, max_connections: int = DEFAULT_MAX_CONNECTIONS, host_concurrency: int = DEFAULT_HOST_CONCURRENCY):
+    """Run coro_factory() in a fresh event loop with a shared async HTTP client."""
+    async def runner():
+        async with async_client_scope(max_connections=max_connections, host_concurrency=host_concurrency):
+            return await coro_factory()
+
+    return asyncio.run(runner())
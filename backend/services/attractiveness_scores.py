@@ -0,0 +1,104 @@
+"""
+Run-wide attractiveness scores for two-stage scoring.
+Attractiveness (budget, client quality, clarity) doesn't depend on the user's keywords,
+so within a batch run every unique offer is rated once and the score is shared by all
+users who got that offer. Keyed by services.score_cache.hash_offer, separately per model
+(scoring cascade tiers may use different models).
+"""
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import List, Dict, Callable, Optional
+
+
+class AttractivenessScores:
+    """Thread-safe attractiveness scores by offer hash, scoped to a single batch run."""
+
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.shared = 0  # Offers rated earlier in the run (or by a concurrent user)
+        self.scored = 0  # Offers rated by the model
+
+    def get_or_score(
+        self,
+        offer_hashes: List[str],
+        score: Callable[[List[str]], Dict[str, float]],
+    ) -> Dict[str, float]:
+        """
+        Return attractiveness by offer hash, calling score(missing_hashes) once for
+        offers nobody rated yet. Concurrent callers wait for the offers another user
+        is already rating instead of sending them again. Offers the model failed to
+        rate are left out (and may be retried by a later user).
+        """
+        results: Dict[str, float] = {}
+        owned: Dict[str, Future] = {}
+        waiting: Dict[str, Future] = {}
+
+        with self._lock:
+            for offer_hash in dict.fromkeys(offer_hashes):
+                if offer_hash in self._entries:
+                    results[offer_hash] = self._entries[offer_hash]
+                elif offer_hash in self._pending:
+                    waiting[offer_hash] = self._pending[offer_hash]
+                else:
+                    owned[offer_hash] = self._pending[offer_hash] = Future()
+            self.shared += len(results) + len(waiting)
+
+        scored: Dict[str, float] = {}
+        try:
+            if owned:
+                scored = score(list(owned))
+        finally:
+            # Always resolve owned futures, so waiting users never hang on a failed call
+            with self._lock:
+                for offer_hash, future in owned.items():
+                    value = scored.get(offer_hash)
+                    if value is not None:
+                        self._entries[offer_hash] = value
+                    del self._pending[offer_hash]
+                    future.set_result(value)
+                self.scored += len(scored)
+
+        results.update({offer_hash: value for offer_hash, value in scored.items() if offer_hash in owned})
+        for offer_hash, future in waiting.items():
+            value = future.result()
+            if value is not None:
+                results[offer_hash] = value
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'shared': self.shared, 'scored': self.scored, 'entries': len(self._entries)}
+
+
+# Scores of the batch run in progress by model (None outside of a run)
+_active_scores: Optional[Dict[str, AttractivenessScores]] = None
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def attractiveness_scope():
+    """Share attractiveness scores between the users of a batch run."""
+    global _active_scores
+    scores: Dict[str, AttractivenessScores] = {}
+    _active_scores = scores
+    try:
+        yield scores
+    finally:
+        _active_scores = None
+
+
+def get_or_score_attractiveness(
+    offer_hashes: List[str],
+    score: Callable[[List[str]], Dict[str, float]],
+    model: str,
+) -> Dict[str, float]:
+    """Rate through the active run scores of the model, or directly when no batch run is active."""
+    scores = _active_scores
+    if scores is None:
+        return score(list(dict.fromkeys(offer_hashes)))
+    with _active_lock:
+        model_scores = scores.setdefault(model, AttractivenessScores())
+    return model_scores.get_or_score(offer_hashes, score)
@@ -0,0 +1,62 @@
+"""
+Registry of platform scrapes that missed their deadline but were left running.
+A later user (or run) asking for the exact same search picks up the running or
+already finished job instead of starting it again.
+"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Dict, Optional, Tuple
+
+
+INFLIGHT_REUSE_SECONDS = 900  # Finished background results older than this are dropped
+
+# Job key: (platform, must_contain, may_contain, must_not_contain, platform_limit)
+JobKey = Tuple[str, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], int]
+
+_jobs: Dict[JobKey, Tuple[Future, float]] = {}
+_lock = threading.Lock()
+
+
+def make_job_key(
+    platform: str,
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+    platform_limit: int,
+) -> JobKey:
+    """Key of a platform search (keyword order doesn't matter)."""
+    def normalize(keywords: List[str]) -> Tuple[str, ...]:
+        return tuple(sorted(keyword.strip().casefold() for keyword in keywords or []))
+
+    return (platform, normalize(must_contain), normalize(may_contain), normalize(must_not_contain), platform_limit)
+
+
+def register(key: JobKey, future: Future) -> None:
+    """Keep a timed-out job so a later identical search can reuse it."""
+    with _lock:
+        _jobs[key] = (future, time.monotonic())
+
+
+def take(key: JobKey) -> Optional[Future]:
+    """Remove and return a registered job for the key (running or finished), if any."""
+    with _lock:
+        _drop_expired()
+        entry = _jobs.pop(key, None)
+    if entry is None:
+        return None
+    future, _ = entry
+    return None if future.cancelled() else future
+
+
+def pending_count() -> int:
+    with _lock:
+        _drop_expired()
+        return len(_jobs)
+
+
+def _drop_expired() -> None:
+    now = time.monotonic()
+    for key in [key for key, (future, registered_at) in _jobs.items()
+                if future.done() and now - registered_at > INFLIGHT_REUSE_SECONDS]:
+        del _jobs[key]
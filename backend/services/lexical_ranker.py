@@ -0,0 +1,122 @@
+"""
+Local lexical pre-ranker for offer scoring.
+Ranks offers with BM25 over title and description against the user's keywords, so
+only the best top-K candidates are sent to OpenAI. Offers outside the top-K get a
+locally computed score that keeps them below the minimum quality thresholds - they
+only fill the selection when there aren't enough candidates.
+"""
+import re
+from collections import Counter
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+from services.openai_scoring import OfferScore, combine_scores
+
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+TITLE_WEIGHT = 2  # Title tokens count this many times
+MUST_WEIGHT = 2.0
+MAY_WEIGHT = 1.0
+MUST_NOT_WEIGHT = -2.0
+
+LOCAL_MAX_FIT_SCORE = 4.0  # Offers outside the top-K never look like quality matches
+LOCAL_ATTRACTIVENESS_SCORE = 5.0  # Unknown without the model, so neutral
+
+# Words with inner dots, dashes, '#' and '+' stay whole (node.js, c#, c++, e-commerce)
+_TOKEN_PATTERN = re.compile(r"[\w#+]+(?:[.\-][\w#+]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall((text or '').casefold())
+
+
+def bm25_scores(
+    offers: List[Dict[str, Any]],
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+) -> np.ndarray:
+    """
+    Lexical relevance of each offer to a keyword profile.
+    A keyword's score is the mean BM25 of its tokens; keywords are weighted by group
+    (must > may, must-not is negative).
+
+    Returns:
+        Array of scores in the same order as offers (higher is better)
+    """
+    keywords = [(keyword, MUST_WEIGHT) for keyword in must_contain or []]
+    keywords += [(keyword, MAY_WEIGHT) for keyword in may_contain or []]
+    keywords += [(keyword, MUST_NOT_WEIGHT) for keyword in must_not_contain or []]
+    keywords = [(tokenize(keyword), weight) for keyword, weight in keywords]
+    keywords = [(tokens, weight) for tokens, weight in keywords if tokens]
+    if not offers or not keywords:
+        return np.zeros(len(offers))
+
+    vocabulary = {token: column for column, token in enumerate(dict.fromkeys(
+        token for tokens, _ in keywords for token in tokens
+    ))}
+
+    # Term frequencies of query tokens only (N offers x Q tokens)
+    term_counts = np.zeros((len(offers), len(vocabulary)))
+    doc_lengths = np.zeros(len(offers))
+    for row, offer in enumerate(offers):
+        tokens = tokenize(offer.get('title')) * TITLE_WEIGHT + tokenize(offer.get('description'))
+        counts = Counter(tokens)
+        doc_lengths[row] = len(tokens)
+        for token, column in vocabulary.items():
+            term_counts[row, column] = counts.get(token, 0)
+
+    doc_freq = np.count_nonzero(term_counts, axis=0)
+    idf = np.log1p((len(offers) - doc_freq + 0.5) / (doc_freq + 0.5))
+    average_length = doc_lengths.mean() or 1.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / average_length)
+    term_scores = idf * term_counts * (BM25_K1 + 1) / (term_counts + norm[:, None])
+
+    # Keyword matrix (Q tokens x K keywords) averages token scores per keyword
+    keyword_matrix = np.zeros((len(vocabulary), len(keywords)))
+    for column, (tokens, _) in enumerate(keywords):
+        for token in tokens:
+            keyword_matrix[vocabulary[token], column] += 1 / len(tokens)
+    weights = np.array([weight for _, weight in keywords])
+    return term_scores @ keyword_matrix @ weights
+
+
+def local_scores(relevance: np.ndarray, top: float) -> List[OfferScore]:
+    """Scores for offers that are not sent to the model, scaled by relevance (relative to top) up to LOCAL_MAX_FIT_SCORE."""
+    scaled = np.clip(relevance / top, 0.0, 1.0) * LOCAL_MAX_FIT_SCORE if top > 0 else np.zeros(len(relevance))
+    return [
+        OfferScore(
+            fit_score=round(float(fit_score), 1),
+            attractiveness_score=LOCAL_ATTRACTIVENESS_SCORE,
+            overall_score=combine_scores(float(fit_score), LOCAL_ATTRACTIVENESS_SCORE),
+        )
+        for fit_score in scaled
+    ]
+
+
+def prerank_offers(
+    offers: List[Dict[str, Any]],
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+    top_k: int,
+) -> Tuple[List[int], Dict[int, OfferScore]]:
+    """
+    Pick the top_k offers for the model.
+    Without positive keywords there is nothing to rank by, so every offer is a candidate.
+
+    Returns:
+        Tuple of (candidate indexes in input order, offer index -> local score for the rest)
+    """
+    if top_k <= 0 or len(offers) <= top_k or not (must_contain or may_contain):
+        return list(range(len(offers))), {}
+
+    relevance = bm25_scores(offers, must_contain, may_contain, must_not_contain)
+    order = np.argsort(-relevance, kind='stable')
+    candidates = sorted(order[:top_k].tolist())
+    rest = order[top_k:].tolist()
+
+    scores = local_scores(relevance[rest], float(relevance.max()))
+    return candidates, dict(zip(rest, scores))
@@ -0,0 +1,134 @@
+"""
+Maximal marginal relevance (MMR) selection of offers.
+Offers are picked one at a time by overall_score minus their similarity to the offers
+already picked, so ten near-identical "React developer" offers from one board don't
+fill the email. Similarity is the cosine of hashed term-frequency vectors of the title
+and description, computed once per offer text; each pick updates the similarities of
+all candidates with one NumPy matrix-vector product.
+"""
+import heapq
+import zlib
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+from services.lexical_ranker import tokenize, TITLE_WEIGHT
+from services.openai_scoring import DEFAULT_MIN_FIT_SCORE, DEFAULT_MIN_ATTRACTIVENESS_SCORE
+
+
+# 'platform_diversity': best offer of each platform first, then the best scores (select_offers_with_diversity)
+# 'mmr': best scores traded against similarity to already selected offers (select_offers_with_mmr)
+SELECTION_ALGORITHMS = ('platform_diversity', 'mmr')
+DEFAULT_SELECTION_ALGORITHM = 'platform_diversity'
+DEFAULT_MMR_LAMBDA = 0.7  # 1.0 = scores only, 0.0 = diversity only
+
+VECTOR_DIMENSIONS = 1024  # Hashed token buckets
+MAX_MMR_CANDIDATES = 2000  # Best-scored quality offers considered by MMR
+MAX_SCORE = 10.0
+_FEATURE_CACHE_SIZE = 20000  # Offer texts whose features are kept between calls
+
+
+@lru_cache(maxsize=_FEATURE_CACHE_SIZE)
+def _text_features(title: str, description: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Non-zero buckets and L2-normalized sublinear term frequencies of an offer text."""
+    tokens = tokenize(title) * TITLE_WEIGHT + tokenize(description)
+    buckets = np.fromiter(
+        (zlib.crc32(token.encode('utf-8')) % VECTOR_DIMENSIONS for token in tokens), dtype=np.int64, count=len(tokens)
+    )
+    indices, counts = np.unique(buckets, return_counts=True)
+    weights = (1.0 + np.log(counts)).astype(np.float32)
+    if weights.size:
+        weights /= np.linalg.norm(weights)
+    # Cached arrays are shared between calls
+    indices.setflags(write=False)
+    weights.setflags(write=False)
+    return indices, weights
+
+
+def offer_vectors(offers: List[Dict[str, Any]]) -> np.ndarray:
+    """Unit-length hashed text vectors of offers, one row per offer (all zero for empty texts)."""
+    vectors = np.zeros((len(offers), VECTOR_DIMENSIONS), dtype=np.float32)
+    for row, offer in enumerate(offers):
+        indices, weights = _text_features(offer.get('title') or '', offer.get('description') or '')
+        vectors[row, indices] = weights
+    return vectors
+
+
+def mmr_order(vectors: np.ndarray, relevance: np.ndarray, count: int, mmr_lambda: float) -> List[int]:
+    """
+    Rows picked by maximal marginal relevance, in pick order.
+
+    Args:
+        vectors: Unit-length row vectors
+        relevance: Relevance of each row in [0, 1]
+        count: Rows to pick
+        mmr_lambda: Weight of relevance against similarity to picked rows
+
+    Returns:
+        Indexes of picked rows (equal gains pick the first row)
+    """
+    picked = []
+    max_similarity = np.zeros(len(relevance), dtype=np.float32)
+    gains = mmr_lambda * relevance
+    available = np.ones(len(relevance), dtype=bool)
+    for _ in range(min(count, len(relevance))):
+        best = int(np.argmax(np.where(available, gains - (1.0 - mmr_lambda) * max_similarity, -np.inf)))
+        picked.append(best)
+        available[best] = False
+        np.maximum(max_similarity, vectors @ vectors[best], out=max_similarity)
+    return picked
+
+
+def select_offers_with_mmr(
+    scored_offers: List[Dict[str, Any]],
+    max_offers: int,
+    min_fit_score: float = DEFAULT_MIN_FIT_SCORE,
+    min_attractiveness_score: float = DEFAULT_MIN_ATTRACTIVENESS_SCORE,
+    mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+) -> List[Dict[str, Any]]:
+    """
+    Select top offers while avoiding offers similar to the ones already selected.
+
+    Quality rules are the same as in select_offers_with_diversity: low-quality offers
+    only fill the slots MMR can't fill with quality offers (best overall score first).
+
+    Args:
+        scored_offers: List of offers with scores, each having 'title', 'description',
+                       'overall_score', 'fit_score', and 'attractiveness_score'
+        max_offers: Maximum number of offers to select
+        min_fit_score: Minimum fit_score of a quality offer (AppSettings.min_fit_score)
+        min_attractiveness_score: Minimum attractiveness_score of a quality offer (AppSettings.min_attractiveness_score)
+        mmr_lambda: Weight of overall_score against similarity (AppSettings.mmr_lambda)
+
+    Returns:
+        List of selected offers sorted by overall score
+    """
+    if not scored_offers:
+        return []
+
+    if len(scored_offers) <= max_offers:
+        return scored_offers
+
+    quality_offers = []
+    low_quality_offers = []
+    for offer in scored_offers:
+        if offer.get("fit_score", 0) >= min_fit_score and offer.get("attractiveness_score", 0) >= min_attractiveness_score:
+            quality_offers.append(offer)
+        else:
+            low_quality_offers.append(offer)
+
+    # Large pools are cut to the best-scored candidates (stable on ties)
+    candidates = heapq.nlargest(MAX_MMR_CANDIDATES, quality_offers, key=lambda x: x.get("overall_score", 0))
+    relevance = np.array([offer.get("overall_score", 0) for offer in candidates], dtype=np.float32) / MAX_SCORE
+    selected = [candidates[i] for i in mmr_order(offer_vectors(candidates), relevance, max_offers, mmr_lambda)]
+
+    # If still not enough, use low-quality offers
+    slots = max_offers - len(selected)
+    if slots > 0:
+        selected.extend(heapq.nlargest(slots, low_quality_offers, key=lambda x: x.get("overall_score", 0)))
+
+    # Sort final selection by overall score
+    selected.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
+
+    return selected
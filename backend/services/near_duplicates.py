@@ -0,0 +1,96 @@
+"""
+Near-duplicate detection of offers cross-posted on several platforms.
+The same gig shows up on Useme, WorkConnect, JustJoinIT... under different URLs and
+with slightly different wording. Offers are compared by MinHash signatures of word
+shingles of their normalized title and description; locality-sensitive hashing
+(signature bands) only compares offers that share a band, so a run stays near-linear
+in the number of offers. Similar offers are clustered with union-find.
+"""
+import zlib
+from collections import defaultdict
+from typing import List, Dict, Any
+
+import numpy as np
+
+from services.lexical_ranker import tokenize
+
+
+SHINGLE_SIZE = 3  # Words per shingle
+NUM_PERMUTATIONS = 64
+BANDS = 16  # NUM_PERMUTATIONS / BANDS rows per band, offers sharing any band become candidates
+NEAR_DUPLICATE_THRESHOLD = 0.7  # Estimated Jaccard similarity of shingles
+MIN_TOKENS = 8  # Shorter texts (title only etc.) are too ambiguous to cluster
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.default_rng(20261017)  # Fixed, so signatures are stable between runs
+_PERM_A = _rng.integers(1, 1 << 29, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 29, NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def _shingles(offer: Dict[str, Any]) -> np.ndarray:
+    """32-bit hashes of the word shingles of the offer's title and description."""
+    tokens = tokenize(f"{offer.get('title') or ''} {offer.get('description') or ''}")
+    if len(tokens) < MIN_TOKENS:
+        return np.empty(0, dtype=np.uint64)
+    shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(shingles: np.ndarray) -> np.ndarray:
+    """MinHash signature (NUM_PERMUTATIONS values) of a set of shingle hashes."""
+    # a < 2^29 and hashes < 2^32, so a * x + b stays below 2^64; keeping the low 32 bits
+    # stops small hashes from being the minimum of every permutation
+    return (((_PERM_A[:, None] * shingles[None, :] + _PERM_B[:, None]) % _PRIME) & _MAX_HASH).min(axis=1)
+
+
+def find_near_duplicates(offers: List[Dict[str, Any]]) -> List[int]:
+    """
+    Cluster near-duplicate offers.
+
+    Returns:
+        Cluster id per offer (the index of the cluster's first offer); offers
+        without duplicates are their own cluster
+    """
+    parent = list(range(len(offers)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures: Dict[int, np.ndarray] = {}
+    for i, offer in enumerate(offers):
+        shingles = _shingles(offer)
+        if shingles.size:
+            signatures[i] = minhash_signature(shingles)
+
+    rows = NUM_PERMUTATIONS // BANDS
+    buckets = defaultdict(list)
+    for i, signature in signatures.items():
+        for band in range(BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows].tobytes())].append(i)
+
+    for members in buckets.values():
+        for position, j in enumerate(members[1:], start=1):
+            for i in members[:position]:
+                # Offers already clustered together aren't compared again
+                if find(i) == find(j):
+                    continue
+                if float(np.mean(signatures[i] == signatures[j])) >= NEAR_DUPLICATE_THRESHOLD:
+                    # The lower index stays the root, so cluster ids follow input order
+                    root, child = sorted((find(i), find(j)))
+                    parent[child] = root
+
+    return [find(i) for i in range(len(offers))]
+
+
+def pick_representatives(offers: List[Dict[str, Any]], clusters: List[int]) -> Dict[int, int]:
+    """Representative offer of each cluster: the one with the longest description (most to score on)."""
+    representatives: Dict[int, int] = {}
+    for i, cluster in enumerate(clusters):
+        current = representatives.get(cluster)
+        if current is None or len(offers[i].get('description') or '') > len(offers[current].get('description') or ''):
+            representatives[cluster] = i
+    return representatives
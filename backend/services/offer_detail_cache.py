@@ -0,0 +1,157 @@
+"""
+Persistent offer detail cache.
+Stores parsed offer descriptions by URL so detail pages (JustJoinIT, RocketJobs) seen
+for other users or on previous days are not downloaded and parsed again.
+The store is handed to the scraper utilities (configure_detail_cache in detail_fetcher),
+so scrapers never import this module. It uses its own short sessions: lookups and stores
+from scraper threads never commit or roll back the session of the scrape that runs them.
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from core.models import db, AppSettings, OfferDetailCache, ScrapeLog
+from scrapers.utils.detail_fetcher import configure_detail_cache
+
+
+DEFAULT_DETAIL_CACHE_TTL_HOURS = 72.0
+HIT_RATE_WINDOW_DAYS = 7  # Batch runs the admin panel's hit rate is computed from
+
+# Process-wide lookup counters (batch runs log the difference between two snapshots)
+_counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+
+def get_detail_cache_ttl_hours(settings: Optional[AppSettings] = None) -> float:
+    """Get the detail cache TTL from AppSettings."""
+    settings = settings or AppSettings.query.first()
+    return settings.detail_cache_ttl_hours if settings and settings.detail_cache_ttl_hours is not None else DEFAULT_DETAIL_CACHE_TTL_HOURS
+
+
+def get_detail_cache_counters() -> Dict[str, int]:
+    """Snapshot of the process-wide hit/miss counters."""
+    with _counters_lock:
+        return dict(_counters)
+
+
+def _count(hits: int, misses: int) -> None:
+    with _counters_lock:
+        _counters['hits'] += hits
+        _counters['misses'] += misses
+
+
+class OfferDetailStore:
+    """Detail cache backed by the offer_detail_cache table (see configure_offer_detail_cache)."""
+
+    def __init__(self, engine, ttl_hours: float):
+        self.engine = engine
+        self.ttl_hours = ttl_hours
+
+    def lookup(self, urls: List[str]) -> Dict[str, str]:
+        """Fresh cached descriptions of the URLs (a failed lookup is a miss for all of them)."""
+        urls = set(urls)
+        if not urls:
+            return {}
+        now = datetime.utcnow()
+        try:
+            with Session(self.engine) as session, session.begin():
+                entries = session.query(OfferDetailCache.id, OfferDetailCache.url, OfferDetailCache.description).filter(
+                    OfferDetailCache.url.in_(urls),
+                    OfferDetailCache.fetched_at > now - timedelta(hours=self.ttl_hours),
+                ).all()
+                if entries:
+                    session.execute(
+                        update(OfferDetailCache)
+                        .where(OfferDetailCache.id.in_([entry.id for entry in entries]))
+                        .values(hit_count=func.coalesce(OfferDetailCache.hit_count, 0) + 1, last_hit_at=now)
+                    )
+        except SQLAlchemyError as e:
+            print(f"Offer detail cache lookup failed: {e}")
+            entries = []
+
+        cached = {entry.url: entry.description for entry in entries}
+        _count(hits=len(cached), misses=len(urls) - len(cached))
+        return cached
+
+    def store(self, platform: str, descriptions: Dict[str, str]) -> int:
+        """Store fetched descriptions (expired entries are refreshed in place). Returns stored entries."""
+        descriptions = {url: description for url, description in descriptions.items() if description}
+        if not descriptions:
+            return 0
+        now = datetime.utcnow()
+        try:
+            with Session(self.engine) as session, session.begin():
+                existing = session.query(OfferDetailCache).filter(OfferDetailCache.url.in_(descriptions.keys())).all()
+                for entry in existing:
+                    entry.description = descriptions.pop(entry.url)
+                    entry.fetched_at = now
+                session.add_all([
+                    OfferDetailCache(url=url, platform=platform, description=description, fetched_at=now, hit_count=0)
+                    for url, description in descriptions.items()
+                ])
+            return len(existing) + len(descriptions)
+        except SQLAlchemyError as e:
+            # E.g. another worker stored the same URL first - the cache is best effort
+            print(f"Offer detail cache store failed: {e}")
+            return 0
+
+
+def configure_offer_detail_cache(settings: Optional[AppSettings]) -> None:
+    """Hand the persistent detail cache (with the TTL from settings) to the scraper utilities."""
+    configure_detail_cache(OfferDetailStore(db.engine, get_detail_cache_ttl_hours(settings)))
+
+
+def get_detail_cache_stats() -> Dict[str, Any]:
+    """Get cache size and hit rate for the admin panel."""
+    ttl_hours = get_detail_cache_ttl_hours()
+    threshold = datetime.utcnow() - timedelta(hours=ttl_hours)
+
+    entries, total_hits, size_bytes = db.session.query(
+        func.count(OfferDetailCache.id),
+        func.coalesce(func.sum(OfferDetailCache.hit_count), 0),
+        func.coalesce(func.sum(func.length(OfferDetailCache.description)), 0),
+    ).one()
+    fresh_entries = OfferDetailCache.query.filter(OfferDetailCache.fetched_at > threshold).count()
+    oldest = db.session.query(func.min(OfferDetailCache.fetched_at)).scalar()
+
+    # From the logged batch runs, so every web worker reports the same numbers
+    hits, misses = db.session.query(
+        func.coalesce(func.sum(ScrapeLog.detail_cache_hits), 0),
+        func.coalesce(func.sum(ScrapeLog.detail_cache_misses), 0),
+    ).filter(ScrapeLog.executed_at > datetime.utcnow() - timedelta(days=HIT_RATE_WINDOW_DAYS)).one()
+    lookups = hits + misses
+
+    return {
+        'ttl_hours': ttl_hours,
+        'entries': entries,
+        'fresh_entries': fresh_entries,
+        'size_bytes': int(size_bytes),
+        'total_hits': int(total_hits),
+        'oldest_fetched_at': (oldest.isoformat() + 'Z') if oldest else None,
+        # Batch runs of the last HIT_RATE_WINDOW_DAYS days
+        'hit_rate_window_days': HIT_RATE_WINDOW_DAYS,
+        'hits': int(hits),
+        'misses': int(misses),
+        'hit_rate': round(hits / lookups, 4) if lookups else None,
+    }
+
+
+def purge_detail_cache(expired_only: bool = False) -> int:
+    """
+    Delete cached descriptions (all or only expired ones).
+
+    Returns:
+        Number of deleted entries
+    """
+    query = OfferDetailCache.query
+    if expired_only:
+        threshold = datetime.utcnow() - timedelta(hours=get_detail_cache_ttl_hours())
+        query = query.filter(OfferDetailCache.fetched_at <= threshold)
+
+    deleted = query.delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
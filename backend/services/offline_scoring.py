@@ -0,0 +1,154 @@
+"""
+Deterministic offline scoring.
+Used when OpenAI is unavailable (no API key, API errors) or real scoring is turned off.
+Fit comes from keyword coverage, attractiveness from the parsed budget, description
+length and client location. Same input always gives the same scores and no network
+is needed, so degraded runs still rank offers meaningfully.
+"""
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from services.lexical_ranker import tokenize
+from services.openai_scoring import OfferScore, FIT_SCORE_WEIGHT
+
+
+# Rough conversion rates to PLN - only the order of magnitude matters here
+CURRENCY_RATES = {'PLN': 1.0, 'USD': 4.0, 'EUR': 4.3, 'GBP': 5.0}
+HOURS_PER_MONTH = 160  # Hourly rates are compared as monthly amounts
+
+# Budget scale (PLN, log-scaled): small gigs score low, monthly B2B rates score high
+BUDGET_LOW = 200.0
+BUDGET_HIGH = 40000.0
+UNKNOWN_BUDGET = 0.4  # "Do ustalenia", "Negotiable" etc.
+
+DESCRIPTION_FULL_LENGTH = 1500  # Descriptions this long (characters) count as fully clear
+
+HIGH_RATE_LOCATIONS = {
+    'united states', 'usa', 'united kingdom', 'uk', 'germany', 'canada', 'australia',
+    'netherlands', 'switzerland', 'denmark', 'sweden', 'norway',
+}
+UNKNOWN_LOCATION = 0.5
+KNOWN_LOCATION = 0.6
+
+MUST_WEIGHT = 0.7  # Share of fit from must-contain coverage (the rest from may-contain)
+MUST_NOT_PENALTY = 4.0
+BUDGET_WEIGHT, DESCRIPTION_WEIGHT, LOCATION_WEIGHT = 0.5, 0.3, 0.2
+
+_AMOUNT_PATTERN = re.compile(r'(\d[\d\s,.]*\d|\d)(\s*k\b)?', re.IGNORECASE)
+_HOURLY_PATTERN = re.compile(r'/\s*h|hour|hr\b|godz', re.IGNORECASE)
+
+
+def parse_budget(budget: Optional[str]) -> Optional[Tuple[float, bool]]:
+    """
+    Parse a budget string ("15 000 - 20 000 PLN", "$1,000 - $2,500", "2 500,50 PLN", "$50/hr", "10k+").
+
+    Returns:
+        Tuple of (mean amount in PLN, is_hourly), or None if no amount is given
+    """
+    if not budget:
+        return None
+
+    amounts = []
+    for match, thousands in _AMOUNT_PATTERN.findall(budget):
+        digits = re.sub(r'\s', '', match)
+        # A dot or comma followed by exactly three digits is a thousands separator ("1.500", "1,500"),
+        # any other comma is a decimal point ("2 500,50")
+        digits = re.sub(r'[.,](?=\d{3}(?:\D|$))', '', digits).replace(',', '.')
+        try:
+            amounts.append(float(digits) * (1000 if thousands else 1))
+        except ValueError:
+            continue
+    if not amounts:
+        return None
+
+    upper = budget.upper()
+    if '$' in budget or 'USD' in upper:
+        rate = CURRENCY_RATES['USD']
+    elif '€' in budget or 'EUR' in upper:
+        rate = CURRENCY_RATES['EUR']
+    elif '£' in budget or 'GBP' in upper:
+        rate = CURRENCY_RATES['GBP']
+    else:
+        rate = CURRENCY_RATES['PLN']
+
+    return sum(amounts) / len(amounts) * rate, bool(_HOURLY_PATTERN.search(budget))
+
+
+def _keyword_coverage(offer_tokens: List[set], keywords: List[str]) -> Optional[np.ndarray]:
+    """Share of keywords present in each offer (a multi-word keyword needs all its words), None without keywords."""
+    keyword_tokens = [set(tokens) for tokens in (tokenize(keyword) for keyword in keywords or []) if tokens]
+    if not keyword_tokens:
+        return None
+    present = np.array([[tokens <= offer for tokens in keyword_tokens] for offer in offer_tokens], dtype=float)
+    return present.reshape(len(offer_tokens), len(keyword_tokens)).mean(axis=1)
+
+
+def score_offers_offline(
+    offers: List[Dict[str, Any]],
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+) -> List[OfferScore]:
+    """
+    Score offers without the model.
+
+    Returns:
+        List of OfferScore objects in the same order as input offers
+    """
+    if not offers:
+        return []
+
+    offer_tokens = [set(tokenize(f"{offer.get('title') or ''} {offer.get('description') or ''}")) for offer in offers]
+
+    # Fit: coverage of must/may keywords, a missing group borrows the other one's coverage
+    must_coverage = _keyword_coverage(offer_tokens, must_contain)
+    may_coverage = _keyword_coverage(offer_tokens, may_contain)
+    if must_coverage is None and may_coverage is None:
+        must_coverage = may_coverage = np.full(len(offers), 0.5)
+    elif must_coverage is None:
+        must_coverage = may_coverage
+    elif may_coverage is None:
+        may_coverage = must_coverage
+    excluded = _keyword_coverage(offer_tokens, must_not_contain)
+    fit = 10 * (MUST_WEIGHT * must_coverage + (1 - MUST_WEIGHT) * may_coverage)
+    if excluded is not None:
+        fit -= MUST_NOT_PENALTY * (excluded > 0)
+    fit = np.clip(fit, 0.0, 10.0)
+
+    # Attractiveness: budget (log scale), description length, client location
+    budgets = [parse_budget(offer.get('budget')) for offer in offers]
+    amounts = np.array([
+        amount * HOURS_PER_MONTH if hourly else amount
+        for amount, hourly in (budget or (np.nan, False) for budget in budgets)
+    ])
+    with np.errstate(invalid='ignore'):
+        budget_score = np.clip(
+            (np.log10(np.maximum(amounts, 1.0)) - np.log10(BUDGET_LOW)) / (np.log10(BUDGET_HIGH) - np.log10(BUDGET_LOW)),
+            0.0, 1.0,
+        )
+    budget_score = np.where(np.isnan(amounts), UNKNOWN_BUDGET, budget_score)
+
+    description_lengths = np.array([len(offer.get('description') or '') for offer in offers])
+    description_score = np.minimum(description_lengths / DESCRIPTION_FULL_LENGTH, 1.0)
+
+    locations = [(offer.get('client_location') or '').strip().casefold() for offer in offers]
+    location_score = np.array([
+        1.0 if location in HIGH_RATE_LOCATIONS else KNOWN_LOCATION if location else UNKNOWN_LOCATION
+        for location in locations
+    ])
+
+    attractiveness = 10 * (
+        BUDGET_WEIGHT * budget_score + DESCRIPTION_WEIGHT * description_score + LOCATION_WEIGHT * location_score
+    )
+    overall = FIT_SCORE_WEIGHT * fit + (1 - FIT_SCORE_WEIGHT) * attractiveness
+
+    return [
+        OfferScore(
+            fit_score=round(float(fit_score), 1),
+            attractiveness_score=round(float(attractiveness_score), 1),
+            overall_score=round(float(overall_score), 1),
+        )
+        for fit_score, attractiveness_score, overall_score in zip(fit, attractiveness, overall)
+    ]
@@ -0,0 +1,343 @@
+"""
+Shared async OpenAI clients with rate-limit-aware scheduling.
+One AsyncOpenAI client per (API key, base URL) lives on a background event loop, so
+scoring requests of all users and chunks share connections and one scheduler per key.
+The scheduler keeps requests within the key's requests/tokens-per-minute budgets
+(configured, or learned from x-ratelimit-* headers), and on 429 it pauses the key
+for the time the API asks for with exponential backoff. Streamed completions are handed
+to the calling thread delta by delta.
+"""
+import asyncio
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Callable, Awaitable
+
+
+DEFAULT_MAX_CONCURRENCY = 8  # Requests in flight per API key
+RATE_LIMIT_RETRIES = 5  # Attempts of one request after 429 responses
+MIN_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 60.0
+REQUEST_TIMEOUT_SECONDS = 120.0
+STREAM_IDLE_TIMEOUT_SECONDS = 300.0  # Longest wait of a stream reader for the next delta (rate-limit pauses included)
+WINDOW_SECONDS = 60.0
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse x-ratelimit-reset-* ("1s", "6m0s", "20ms") or retry-after ("2") into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class KeyScheduler:
+    """
+    Request/token budgets of one API key. Lives on the pool's event loop, so its
+    state is only touched from one thread.
+    """
+
+    def __init__(self, rpm_limit: Optional[int] = None, tpm_limit: Optional[int] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.rpm_limit = rpm_limit  # Configured limits win over learned ones
+        self.tpm_limit = tpm_limit
+        self.learned_rpm: Optional[int] = None
+        self.learned_tpm: Optional[int] = None
+        self._requests: deque = deque()  # Start times within the window
+        self._tokens: deque = deque()  # [start time, tokens] within the window
+        self._paused_until = 0.0
+        self._backoff = 0.0
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))  # Requests in flight
+        self.stats = {'requests': 0, 'rate_limited': 0, 'waited_seconds': 0.0}
+
+    def configure(self, rpm_limit: Optional[int], tpm_limit: Optional[int]) -> None:
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+
+    def _limits(self) -> Tuple[Optional[int], Optional[int]]:
+        return self.rpm_limit or self.learned_rpm, self.tpm_limit or self.learned_tpm
+
+    def _reserve(self, tokens: int) -> Tuple[float, Optional[list]]:
+        """Record a request if the budgets allow it now. Returns (seconds to wait, token entry)."""
+        now = time.monotonic()
+        while self._requests and now - self._requests[0] >= WINDOW_SECONDS:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= WINDOW_SECONDS:
+            self._tokens.popleft()
+
+        if self._paused_until > now:
+            return self._paused_until - now, None
+        rpm, tpm = self._limits()
+        if rpm and len(self._requests) >= rpm:
+            return self._requests[0] + WINDOW_SECONDS - now, None
+        # A single request above the whole budget still goes out once the window is empty
+        if tpm and self._tokens and sum(entry[1] for entry in self._tokens) + tokens > tpm:
+            return self._tokens[0][0] + WINDOW_SECONDS - now, None
+
+        entry = [now, tokens]
+        self._requests.append(now)
+        self._tokens.append(entry)
+        return 0.0, entry
+
+    async def acquire(self, tokens: int) -> list:
+        """Wait until the key's budgets allow a request of `tokens` estimated tokens."""
+        while True:
+            wait, entry = self._reserve(tokens)
+            if entry is not None:
+                self.stats['requests'] += 1
+                return entry
+            self.stats['waited_seconds'] += wait
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers) -> None:
+        """Learn limits from x-ratelimit-* headers and pause when a budget is used up."""
+        self.learned_rpm = _header_int(headers, 'x-ratelimit-limit-requests') or self.learned_rpm
+        self.learned_tpm = _header_int(headers, 'x-ratelimit-limit-tokens') or self.learned_tpm
+        for budget in ('requests', 'tokens'):
+            if _header_int(headers, f'x-ratelimit-remaining-{budget}') == 0:
+                reset = parse_reset_duration(headers.get(f'x-ratelimit-reset-{budget}'))
+                if reset:
+                    self._paused_until = max(self._paused_until, time.monotonic() + reset)
+
+    def on_success(self) -> None:
+        self._backoff = self._backoff / 2 if self._backoff > MIN_BACKOFF_SECONDS else 0.0
+
+    def on_rate_limited(self, headers) -> float:
+        """Pause the key after a 429. Returns the pause in seconds."""
+        self.stats['rate_limited'] += 1
+        # Grows while 429s keep coming, shrinks again with successful requests
+        self._backoff = min(MAX_BACKOFF_SECONDS, self._backoff * 2) if self._backoff else MIN_BACKOFF_SECONDS
+        retry_after_ms = parse_reset_duration(headers.get('retry-after-ms'))
+        delay = (
+            (retry_after_ms / 1000 if retry_after_ms else None)
+            or parse_reset_duration(headers.get('retry-after'))
+            or max(
+                parse_reset_duration(headers.get('x-ratelimit-reset-requests')) or 0.0,
+                parse_reset_duration(headers.get('x-ratelimit-reset-tokens')) or 0.0,
+            )
+        )
+        delay = max(delay, self._backoff)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+
+def stream_request_options(base_url: Optional[str]) -> Dict[str, Any]:
+    """
+    Extra options of streamed requests. Usage in the last chunk is only asked of the OpenAI
+    API itself: many OpenAI-compatible servers reject stream_options.
+    """
+    return {} if base_url else {'stream_options': {'include_usage': True}}
+
+
+class CompletionStream:
+    """
+    Text deltas of a streamed completion, handed over from the pool's event loop to the
+    thread that iterates it. usage is set once the stream is exhausted (if the API sent it).
+    A reader waiting longer than idle_timeout for the next delta cancels the request and
+    gets a TimeoutError.
+    """
+
+    def __init__(self, idle_timeout: float = STREAM_IDLE_TIMEOUT_SECONDS):
+        self._queue: queue.Queue = queue.Queue()
+        self.idle_timeout = idle_timeout
+        self.usage = None
+        self.future: Optional[Future] = None  # The producing request, cancelled on timeout
+
+    def put(self, delta: str) -> None:
+        self._queue.put((delta, None))
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        self._queue.put((None, error))
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            try:
+                delta, error = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                if self.future is not None:
+                    self.future.cancel()
+                raise TimeoutError(f"No streamed completion data for {self.idle_timeout:.0f}s")
+            if delta is not None:
+                yield delta
+            elif error is not None:
+                raise error
+            else:
+                return
+
+
+class OpenAIPool:
+    """AsyncOpenAI clients and schedulers per (API key, base URL) on a background event loop."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._schedulers: Dict[Tuple[str, Optional[str]], KeyScheduler] = {}
+        self._limits: Dict[str, Optional[int]] = {'rpm_limit': None, 'tpm_limit': None, 'max_concurrency': DEFAULT_MAX_CONCURRENCY}
+        self._lock = threading.Lock()
+
+    def configure(self, rpm_limit: Optional[int] = None, tpm_limit: Optional[int] = None,
+                  max_concurrency: Optional[int] = None) -> None:
+        """Set budgets for all keys (None = learn them from response headers)."""
+        with self._lock:
+            max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+            if max_concurrency != self._limits['max_concurrency']:
+                # The semaphore size can't change, so new schedulers are created on next use
+                self._schedulers = {}
+            self._limits = {'rpm_limit': rpm_limit, 'tpm_limit': tpm_limit, 'max_concurrency': max_concurrency}
+            for scheduler in self._schedulers.values():
+                scheduler.configure(rpm_limit, tpm_limit)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='openai-pool', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _client_for(self, api_key: str, base_url: Optional[str]):
+        """Client and scheduler of a key (created on the loop thread, which is the only one using them)."""
+        import openai
+
+        key = (api_key, base_url)
+        if key not in self._clients:
+            # Retries are done here, so 429s go through the scheduler instead of the SDK's own backoff
+            self._clients[key] = openai.AsyncOpenAI(
+                api_key=api_key, base_url=base_url, max_retries=0, timeout=REQUEST_TIMEOUT_SECONDS,
+            )
+        with self._lock:
+            scheduler = self._schedulers.get(key)
+            if scheduler is None:
+                scheduler = self._schedulers[key] = KeyScheduler(**self._limits)
+        return self._clients[key], scheduler
+
+    async def _request(self, api_key: str, base_url: Optional[str], estimated_tokens: int,
+                       handle: Callable[[Any, list], Awaitable[Any]], **request):
+        """
+        Send a request within the key's budgets, retrying 429s. handle(raw response, token entry)
+        reads the response while the request still holds its concurrency slot.
+        """
+        import openai
+
+        client, scheduler = self._client_for(api_key, base_url)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            async with scheduler.semaphore:
+                entry = await scheduler.acquire(estimated_tokens)
+                try:
+                    raw = await client.chat.completions.with_raw_response.create(**request)
+                except openai.RateLimitError as e:
+                    if attempt == RATE_LIMIT_RETRIES:
+                        raise
+                    delay = scheduler.on_rate_limited(e.response.headers)
+                    print(f"OpenAI rate limit hit, pausing requests for {delay:.1f}s")
+                    continue
+                scheduler.update_from_headers(raw.headers)
+                scheduler.on_success()
+                return await handle(raw, entry)
+
+    async def _create(self, api_key: str, base_url: Optional[str], estimated_tokens: int, **request):
+        async def handle(raw, entry):
+            completion = raw.parse()
+            if completion.usage is not None:
+                # Count what the request really used against the tokens-per-minute budget
+                entry[1] = completion.usage.total_tokens
+            return completion
+
+        return await self._request(api_key, base_url, estimated_tokens, handle, **request)
+
+    async def _stream(self, stream: 'CompletionStream', api_key: str, base_url: Optional[str],
+                      estimated_tokens: int, **request) -> None:
+        async def handle(raw, entry):
+            async for chunk in raw.parse():
+                if chunk.choices and chunk.choices[0].delta.content:
+                    stream.put(chunk.choices[0].delta.content)
+                if chunk.usage is not None:
+                    stream.usage = chunk.usage
+                    entry[1] = chunk.usage.total_tokens
+
+        error = None
+        try:
+            await self._request(
+                api_key, base_url, estimated_tokens, handle,
+                stream=True, **stream_request_options(base_url), **request,
+            )
+        except Exception as e:
+            error = e
+        except asyncio.CancelledError:
+            error = RuntimeError("Streamed completion was cancelled")
+            raise
+        finally:
+            # Always end the stream, so its reader never waits for a request that is gone
+            stream.close(error)
+
+    def chat_completion(self, api_key: str, messages: List[Dict[str, str]], estimated_tokens: int,
+                        base_url: Optional[str] = None, **request):
+        """
+        Create a chat completion through the shared client of the key (blocks the calling thread).
+        estimated_tokens (prompt + max output) is reserved against the tokens-per-minute budget.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._create(api_key, base_url, estimated_tokens, messages=messages, **request),
+            self._ensure_loop(),
+        )
+        return future.result()
+
+    def chat_completion_stream(self, api_key: str, messages: List[Dict[str, str]], estimated_tokens: int,
+                               base_url: Optional[str] = None, **request) -> 'CompletionStream':
+        """
+        Stream a chat completion through the shared client of the key. The returned
+        CompletionStream yields text deltas in the calling thread as they arrive.
+        """
+        stream = CompletionStream()
+        stream.future = asyncio.run_coroutine_threadsafe(
+            self._stream(stream, api_key, base_url, estimated_tokens, messages=messages, **request),
+            self._ensure_loop(),
+        )
+        return stream
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            schedulers = list(self._schedulers.items())
+        return {
+            # Never expose the key itself
+            f"...{api_key[-4:]}" + (f" @ {base_url}" if base_url else ''): {
+                **scheduler.stats,
+                'rpm_limit': scheduler._limits()[0],
+                'tpm_limit': scheduler._limits()[1],
+            }
+            for (api_key, base_url), scheduler in schedulers
+        }
+
+
+# Process-wide pool shared by all scoring calls
+_pool = OpenAIPool()
+
+
+def get_openai_pool() -> OpenAIPool:
+    return _pool
+
+
+def configure_openai_pool(rpm_limit: Optional[int] = None, tpm_limit: Optional[int] = None,
+                          max_concurrency: Optional[int] = None) -> None:
+    """Apply OpenAI budgets (e.g. from AppSettings)."""
+    _pool.configure(rpm_limit, tpm_limit, max_concurrency)
@@ -1,10 +1,16 @@
 """
 OpenAI service for scoring offers based on user preferences.
 """
+import heapq
 import json
-import random
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import time
+from functools import partial
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Callable
+from dataclasses import dataclass, fields, asdict
+
+from services.score_parser import ScoreArrayParser
 
 
 @dataclass
@@ -15,12 +21,58 @@ class OfferScore:
     overall_score: float  # 0-10: Combined score
 
 
-DEFAULT_SCORING_PROMPT = """Jesteś ekspertem w ocenie ofert pracy dla freelancerów. Oceń każdą ofertę na podstawie następujących kryteriów:
+class ChunkScoringError(Exception):
+    """
+    Scoring a chunk failed part-way: the answer broke off (cause is the API/stream error)
+    or could not be parsed (cause is a json.JSONDecodeError). Keeps what the chunk got
+    before that: the scores that already arrived and the tokens used.
+    """
+
+    def __init__(self, cause: Exception, scores: Dict[int, Dict[str, float]], usage: Any = None):
+        super().__init__(str(cause))
+        self.cause = cause
+        self.scores = scores
+        self.usage = usage
 
-**Słowa kluczowe użytkownika:**
-- Musi zawierać: {must_contain}
-- Może zawierać: {may_contain}
-- Nie może zawierać: {must_not_contain}
+
+@dataclass
+class ScoringStats:
+    """Counters of scoring calls (filled by score_offers_with_openai, summed per batch run)"""
+    cache_hits: int = 0  # Offers scored from the score cache
+    cache_misses: int = 0  # Offers sent to the model
+    attractiveness_scored: int = 0  # Two-stage mode: offers rated for attractiveness by this call
+    attractiveness_shared: int = 0  # Two-stage mode: ratings reused from other users of the run
+    prerank_local: int = 0  # Offers left out of the model's candidates by the lexical pre-ranker
+    offline_scored: int = 0  # Offers scored by the offline fallback (no API key or API errors)
+    near_duplicates: int = 0  # Cross-posted offers that share the scores of a near-duplicate
+    requests: int = 0  # Chunk requests sent to the model (retries included)
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0  # Prompt tokens served from the API's prompt cache (billed at a discount)
+    completion_tokens: int = 0
+    parse_failures: int = 0  # Answers without a single valid score
+    malformed_scores: int = 0  # Invalid elements of otherwise valid answers (only their offers are re-requested)
+    api_errors: int = 0
+    default_scores: int = 0  # Offers left with the default 5.0 scores
+    duration_ms: int = 0  # Wall time of score_offers_with_openai
+    
+    def add(self, other: 'ScoringStats') -> None:
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoringStats':
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in (data or {}).items() if key in known})
+
+
+# Prompts keep the static instructions and the offers first and the user's keywords last.
+# Calls for exactly the same offer set then share long prefixes the API serves from its prompt
+# cache. Chunks are cut by size, so an offer set that differs by even one offer shifts the later
+# chunks and gets little from the cache - the saving there is the compact offer format.
+DEFAULT_SCORING_PROMPT = """Jesteś ekspertem w ocenie ofert pracy dla freelancerów. Oceń każdą ofertę na podstawie słów kluczowych użytkownika (podanych na końcu) i następujących kryteriów:
 
 **Dla każdej oferty zwróć 3 oceny w skali 0-10:**
 1. **fit_score** (Dopasowanie): Jak dobrze oferta pasuje do podanych słów kluczowych i preferencji
@@ -35,12 +87,343 @@ Zwróć JSON array z obiektami dla każdej oferty w tej samej kolejności:
   ...
 ]
 
-**Oferty do oceny:**
+**Oferty do oceny (jedna oferta w linii):**
 {offers_json}
 
+**Słowa kluczowe użytkownika:**
+- Musi zawierać: {must_contain}
+- Może zawierać: {may_contain}
+- Nie może zawierać: {must_not_contain}
+
 Odpowiedz TYLKO poprawnym JSON array, bez żadnego dodatkowego tekstu."""
 
 
+# Two-stage mode: attractiveness is rated once per offer (no user keywords), fit per user
+ATTRACTIVENESS_SCORING_PROMPT = """Jesteś ekspertem w ocenie ofert pracy dla freelancerów. Oceń atrakcyjność każdej oferty niezależnie od tego, kto będzie ją realizował.
+
+**Dla każdej oferty zwróć ocenę w skali 0-10:**
+- **attractiveness_score** (Atrakcyjność): Jak atrakcyjna jest oferta (budżet, jakość klienta, klarowność opisu)
+
+**Format odpowiedzi:**
+Zwróć JSON array z obiektami dla każdej oferty w tej samej kolejności:
+[
+  {{"offer_index": 0, "attractiveness_score": 7.0}},
+  {{"offer_index": 1, "attractiveness_score": 9.0}},
+  ...
+]
+
+**Oferty do oceny (jedna oferta w linii):**
+{offers_json}
+
+Odpowiedz TYLKO poprawnym JSON array, bez żadnego dodatkowego tekstu."""
+
+
+FIT_SCORING_PROMPT = """Jesteś ekspertem w ocenie ofert pracy dla freelancerów. Oceń, jak dobrze każda oferta pasuje do słów kluczowych użytkownika (podanych na końcu).
+
+**Dla każdej oferty zwróć ocenę w skali 0-10:**
+- **fit_score** (Dopasowanie): Jak dobrze oferta pasuje do podanych słów kluczowych i preferencji
+
+**Format odpowiedzi:**
+Zwróć JSON array z obiektami dla każdej oferty w tej samej kolejności:
+[
+  {{"offer_index": 0, "fit_score": 8.5}},
+  {{"offer_index": 1, "fit_score": 6.0}},
+  ...
+]
+
+**Oferty do oceny (jedna oferta w linii):**
+{offers_json}
+
+**Słowa kluczowe użytkownika:**
+- Musi zawierać: {must_contain}
+- Może zawierać: {may_contain}
+- Nie może zawierać: {must_not_contain}
+
+Odpowiedz TYLKO poprawnym JSON array, bez żadnego dodatkowego tekstu."""
+
+
+SCORING_MODEL = "gpt-4.1-mini"
+SCORING_SYSTEM_PROMPT = "Jesteś asystentem oceniającym oferty pracy. Odpowiadasz tylko w formacie JSON."
+
+DEFAULT_SCORING_CHUNK_TOKENS = 6000  # Estimated prompt tokens of offers per request
+DEFAULT_SCORING_WORKERS = 4  # Chunks scored at once
+DEFAULT_SCORING_CHUNK_RETRIES = 2  # Extra attempts for offers of failed chunks
+MAX_OFFERS_PER_CHUNK = 25  # Keeps each JSON answer well below the output limit
+OUTPUT_TOKENS_PER_OFFER = 40  # One score object in the answer
+CHARS_PER_TOKEN = 4  # Rough estimate, good enough for sizing chunks
+
+# 'combined': one prompt per user rates fit, attractiveness and overall
+# 'two_stage': attractiveness is rated once per offer and shared, the user prompt only rates fit
+SCORING_MODES = ('combined', 'two_stage')
+FIT_SCORE_WEIGHT = 0.6  # overall = 0.6 * fit + 0.4 * attractiveness in two-stage mode
+COMBINED_SCORE_FIELDS = ('fit_score', 'attractiveness_score', 'overall_score')
+
+# Selection quality thresholds when AppSettings has none
+DEFAULT_MIN_FIT_SCORE = 5.0
+DEFAULT_MIN_ATTRACTIVENESS_SCORE = 5.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (no tokenizer dependency)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _default_score() -> OfferScore:
+    return OfferScore(fit_score=5.0, attractiveness_score=5.0, overall_score=5.0)
+
+
+def _offer_for_prompt(index: int, offer: Dict[str, Any]) -> Dict[str, Any]:
+    """Simplified offer sent to the model (empty fields are left out)."""
+    prompt_offer = {
+        "title": offer.get("title"),
+        "description": (offer.get("description") or "")[:500],  # Truncate long descriptions
+        "budget": offer.get("budget"),
+        "platform": offer.get("platform"),
+        "client_location": offer.get("client_location"),
+    }
+    return {"index": index, **{key: value for key, value in prompt_offer.items() if value}}
+
+
+def _offer_for_fit_prompt(index: int, offer: Dict[str, Any]) -> Dict[str, Any]:
+    """Offer sent with the per-user fit prompt (budget and client don't affect fit)."""
+    prompt_offer = {
+        "title": offer.get("title"),
+        "description": (offer.get("description") or "")[:500],
+        "platform": offer.get("platform"),
+    }
+    return {"index": index, **{key: value for key, value in prompt_offer.items() if value}}
+
+
+def serialize_offers(chunk: List[Dict[str, Any]]) -> str:
+    """
+    Compact JSON array of prompt offers, one offer per line.
+    Offers are numbered by their position in the chunk, so the same chunk serializes
+    identically for every user (their "index" is only used to map answers back).
+    """
+    return "[\n" + ",\n".join(
+        json.dumps({**offer, "index": position}, ensure_ascii=False, separators=(",", ":"))
+        for position, offer in enumerate(chunk)
+    ) + "\n]"
+
+
+def combine_scores(fit_score: float, attractiveness_score: float) -> float:
+    """Overall score of the two-stage mode, weighted towards fit."""
+    return round(FIT_SCORE_WEIGHT * fit_score + (1 - FIT_SCORE_WEIGHT) * attractiveness_score, 1)
+
+
+def chunk_offers_for_prompt(
+    offers_for_prompt: List[Dict[str, Any]],
+    max_chunk_tokens: int = DEFAULT_SCORING_CHUNK_TOKENS,
+) -> List[List[Dict[str, Any]]]:
+    """Split prompt offers into chunks of at most max_chunk_tokens (estimated) and MAX_OFFERS_PER_CHUNK offers."""
+    chunks = []
+    current, current_tokens = [], 0
+    for offer in offers_for_prompt:
+        offer_tokens = estimate_tokens(json.dumps(offer, ensure_ascii=False, separators=(",", ":")))
+        if current and (current_tokens + offer_tokens > max_chunk_tokens or len(current) >= MAX_OFFERS_PER_CHUNK):
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(offer)
+        current_tokens += offer_tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _score_chunk(
+    complete: Callable[..., Any],
+    prompt_template: str,
+    keywords: Dict[str, str],
+    chunk: List[Dict[str, Any]],
+    score_fields: Iterable[str] = COMBINED_SCORE_FIELDS,
+) -> Tuple[Dict[int, Dict[str, float]], Any, int]:
+    """
+    Score one chunk of prompt offers from the streamed answer. Every valid score element
+    is kept as it arrives; malformed elements only lose their own offer.
+    
+    Returns:
+        Tuple of (offer index -> {score field: value}, response usage or None, malformed elements);
+        offers missing from the answer are left out
+    
+    Raises:
+        ChunkScoringError: The stream broke or the answer held no scores
+    """
+    prompt = prompt_template.format(offers_json=serialize_offers(chunk), **keywords)
+    
+    max_tokens = len(chunk) * OUTPUT_TOKENS_PER_OFFER + 200
+    stream = complete(
+        messages=[
+            {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=max_tokens,
+        estimated_tokens=estimate_tokens(SCORING_SYSTEM_PROMPT + prompt) + max_tokens,
+    )
+    
+    chunk_indexes = [offer["index"] for offer in chunk]
+    parser = ScoreArrayParser()
+    answer = []
+    scores = {}
+    invalid = 0
+    try:
+        for delta in stream:
+            answer.append(delta)
+            for score_item in parser.feed(delta):
+                # Map back by offer_index (position in the chunk); fall back to the position in the answer
+                chunk_position = score_item.get("offer_index")
+                if not isinstance(chunk_position, int) or not 0 <= chunk_position < len(chunk_indexes):
+                    chunk_position = parser.parsed + parser.malformed - 1
+                if chunk_position >= len(chunk_indexes):
+                    continue
+                try:
+                    scores[chunk_indexes[chunk_position]] = {field: float(score_item.get(field, 5.0)) for field in score_fields}
+                except (TypeError, ValueError):
+                    invalid += 1
+    except Exception as e:
+        # Scores that arrived before the stream broke are kept, only the rest is asked for again
+        raise ChunkScoringError(e, scores, stream.usage) from e
+    
+    if not parser.parsed and (parser.malformed or not parser.closed):
+        # The tokens were still used
+        raise ChunkScoringError(json.JSONDecodeError("Expected a JSON array of scores", "".join(answer), 0), {}, stream.usage)
+    return scores, stream.usage, parser.malformed + invalid
+
+
+def _count_usage(stats: ScoringStats, usage) -> None:
+    if usage is not None:
+        stats.prompt_tokens += usage.prompt_tokens
+        stats.completion_tokens += usage.completion_tokens
+        details = getattr(usage, 'prompt_tokens_details', None)
+        stats.cached_prompt_tokens += (details.cached_tokens or 0) if details is not None else 0
+
+
+def _score_in_chunks(
+    complete: Callable[..., Any],
+    prompt_template: str,
+    keywords: Dict[str, str],
+    offers_for_prompt: List[Dict[str, Any]],
+    score_fields: Iterable[str],
+    max_chunk_tokens: int,
+    max_workers: int,
+    max_retries: int,
+    stats: ScoringStats,
+) -> Tuple[Dict[int, Dict[str, float]], Optional[Exception]]:
+    """
+    Score prompt offers in concurrent chunks, retrying only offers of failed (or truncated) chunks.
+    Requests, token usage and failures are counted in stats.
+    
+    Returns:
+        Tuple of (offer index -> scores, last API error or None)
+    """
+    scores: Dict[int, Dict[str, float]] = {}
+    remaining = offers_for_prompt
+    last_error = None
+    
+    for attempt in range(max(0, max_retries) + 1):
+        if not remaining:
+            break
+        chunks = chunk_offers_for_prompt(remaining, max_chunk_tokens)
+        stats.requests += len(chunks)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks))), thread_name_prefix='openai-scoring') as executor:
+            futures = {executor.submit(_score_chunk, complete, prompt_template, keywords, chunk, score_fields): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    chunk_scores, usage, malformed = future.result()
+                    scores.update(chunk_scores)
+                    _count_usage(stats, usage)
+                    stats.malformed_scores += malformed
+                except ChunkScoringError as e:
+                    scores.update(e.scores)
+                    _count_usage(stats, e.usage)
+                    if isinstance(e.cause, json.JSONDecodeError):
+                        print(f"Error parsing OpenAI response: {e}")
+                        stats.parse_failures += 1
+                    else:
+                        print(f"OpenAI API error: {e}")
+                        stats.api_errors += 1
+                        last_error = e.cause
+                except Exception as e:
+                    print(f"OpenAI API error: {e}")
+                    stats.api_errors += 1
+                    last_error = e
+        
+        remaining = [offer for offer in remaining if offer["index"] not in scores]
+        if not remaining:
+            break
+        if attempt < max_retries:
+            print(f"Retrying {len(remaining)} unscored offers ({attempt + 1}/{max_retries})")
+    
+    return scores, last_error
+
+
+def _score_two_stage(
+    complete: Callable[..., Any],
+    offers: List[Dict[str, Any]],
+    indexes: List[int],
+    offer_hashes: List[str],
+    keywords: Dict[str, str],
+    chunk_options: Dict[str, int],
+    stats: ScoringStats,
+    model: str,
+) -> Tuple[Dict[int, OfferScore], List[int], Optional[Exception]]:
+    """
+    Rate attractiveness through the run-wide shared scores and fit with the per-user prompt
+    (both stages run at the same time), then combine overall locally.
+    
+    Returns:
+        Tuple of (offer index -> OfferScore, indexes that got a default attractiveness, last API error)
+    """
+    from services.attractiveness_scores import get_or_score_attractiveness
+    
+    first_index = {}
+    for i in indexes:
+        first_index.setdefault(offer_hashes[i], i)
+    attractiveness_errors = []
+    attractiveness_stats = ScoringStats()  # Filled in the attractiveness thread, merged below
+    rated = set()  # Offer hashes rated by this call
+    
+    def score_attractiveness(hashes: List[str]) -> Dict[str, float]:
+        prompt_offers = [_offer_for_prompt(first_index[offer_hash], offers[first_index[offer_hash]]) for offer_hash in sorted(hashes)]
+        scored, error = _score_in_chunks(
+            complete, ATTRACTIVENESS_SCORING_PROMPT, {}, prompt_offers, ('attractiveness_score',),
+            stats=attractiveness_stats, **chunk_options
+        )
+        if error is not None:
+            attractiveness_errors.append(error)
+        rated.update(offer_hashes[i] for i in scored)
+        return {offer_hashes[i]: score['attractiveness_score'] for i, score in scored.items()}
+    
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='openai-attractiveness') as executor:
+        attractiveness_future = executor.submit(get_or_score_attractiveness, list(first_index), score_attractiveness, model)
+        fit_scores, fit_error = _score_in_chunks(
+            complete, FIT_SCORING_PROMPT, keywords,
+            [_offer_for_fit_prompt(i, offers[i]) for i in indexes], ('fit_score',),
+            stats=stats, **chunk_options
+        )
+        attractiveness = attractiveness_future.result()
+    
+    stats.add(attractiveness_stats)
+    stats.attractiveness_scored += len(rated)
+    stats.attractiveness_shared += sum(1 for offer_hash in attractiveness if offer_hash not in rated)
+    
+    scores = {}
+    defaulted = []
+    for i, fit in fit_scores.items():
+        attractiveness_score = attractiveness.get(offer_hashes[i])
+        if attractiveness_score is None:
+            attractiveness_score = _default_score().attractiveness_score
+            defaulted.append(i)
+        scores[i] = OfferScore(
+            fit_score=fit['fit_score'],
+            attractiveness_score=attractiveness_score,
+            overall_score=combine_scores(fit['fit_score'], attractiveness_score),
+        )
+    
+    last_error = fit_error or (attractiveness_errors[-1] if attractiveness_errors else None)
+    return scores, defaulted, last_error
+
+
 def score_offers_with_openai(
     offers: List[Dict[str, Any]],
     must_contain: List[str],
@@ -48,9 +431,25 @@ def score_offers_with_openai(
     must_not_contain: List[str],
     api_key: str,
     custom_prompt: Optional[str] = None,
+    max_chunk_tokens: int = DEFAULT_SCORING_CHUNK_TOKENS,
+    max_workers: int = DEFAULT_SCORING_WORKERS,
+    max_retries: int = DEFAULT_SCORING_CHUNK_RETRIES,
+    use_cache: bool = False,
+    stats: Optional[ScoringStats] = None,
+    scoring_mode: str = 'combined',
+    base_url: Optional[str] = None,
+    model: str = SCORING_MODEL,
 ) -> List[OfferScore]:
     """
     Score offers using OpenAI API.
+    Offers are split into token-sized chunks scored concurrently; answers are mapped
+    back by offer_index and only offers of failed (or truncated) chunks are retried.
+    With use_cache, offers already scored for the same keyword profile and prompt
+    are taken from the score cache (see services.score_cache) and not sent to the model.
+    In 'two_stage' mode the user prompt only rates fit; attractiveness is rated once per
+    offer and shared by all users of a batch run (see services.attractiveness_scores).
+    Requests go through the shared client pool of the API key, which queues them
+    within the key's rate limits (see services.openai_pool).
     
     Args:
         offers: List of offer dictionaries with title, description, etc.
@@ -58,7 +457,15 @@ def score_offers_with_openai(
         may_contain: Optional keywords
         must_not_contain: Excluded keywords
         api_key: OpenAI API key
-        custom_prompt: Custom scoring prompt (uses default if not provided)
+        custom_prompt: Custom scoring prompt (uses default if not provided, combined mode only)
+        max_chunk_tokens: Estimated prompt tokens of offers per request
+        max_workers: Chunks scored at once
+        max_retries: Extra attempts for offers whose chunk failed
+        use_cache: Read and store scores in the persistent score cache
+        stats: Optional ScoringStats filled with this call's counters (requests, tokens, latency, failures)
+        scoring_mode: One of SCORING_MODES
+        base_url: OpenAI-compatible API URL (uses the OpenAI API if not provided)
+        model: Chat model that scores the offers
     
     Returns:
         List of OfferScore objects in the same order as input offers
@@ -71,169 +478,132 @@ def score_offers_with_openai(
     
     try:
         import openai
-        client = openai.OpenAI(api_key=api_key)
     except ImportError:
         raise ImportError("openai package is not installed. Run: pip install openai")
     
-    # Prepare offers for the prompt (simplified version)
-    offers_for_prompt = []
-    for i, offer in enumerate(offers):
-        offers_for_prompt.append({
-            "index": i,
-            "title": offer.get("title", ""),
-            "description": offer.get("description", "")[:500],  # Truncate long descriptions
-            "budget": offer.get("budget", "N/A"),
-            "platform": offer.get("platform", "unknown"),
-            "client_location": offer.get("client_location", "N/A"),
-        })
-    
-    # Build the prompt
-    prompt_template = custom_prompt or DEFAULT_SCORING_PROMPT
-    prompt = prompt_template.format(
+    from services.openai_pool import get_openai_pool
+    complete = partial(get_openai_pool().chat_completion_stream, api_key, base_url=base_url, model=model)
+    stats = stats if stats is not None else ScoringStats()
+    start_time = time.time()
+    
+    two_stage = scoring_mode == 'two_stage'
+    if two_stage:
+        if custom_prompt:
+            print("Custom scoring prompt is not used in two_stage mode, using the two-stage prompts")
+        prompt_template = ATTRACTIVENESS_SCORING_PROMPT + FIT_SCORING_PROMPT
+    else:
+        prompt_template = custom_prompt or DEFAULT_SCORING_PROMPT
+    keywords = dict(
         must_contain=", ".join(must_contain) if must_contain else "brak",
         may_contain=", ".join(may_contain) if may_contain else "brak",
         must_not_contain=", ".join(must_not_contain) if must_not_contain else "brak",
-        offers_json=json.dumps(offers_for_prompt, ensure_ascii=False, indent=2)
     )
+    chunk_options = dict(max_chunk_tokens=max_chunk_tokens, max_workers=max_workers, max_retries=max_retries)
     
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {"role": "system", "content": "Jesteś asystentem oceniającym oferty pracy. Odpowiadasz tylko w formacie JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000,
-        )
-        
-        # Parse the response
-        content = response.choices[0].message.content.strip()
-        
-        # Clean up the response if it has markdown code blocks
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-        content = content.strip()
-        
-        scores_data = json.loads(content)
-        
-        # Convert to OfferScore objects
-        scores = []
-        for score_item in scores_data:
-            scores.append(OfferScore(
-                fit_score=float(score_item.get("fit_score", 5.0)),
-                attractiveness_score=float(score_item.get("attractiveness_score", 5.0)),
-                overall_score=float(score_item.get("overall_score", 5.0)),
-            ))
-        
-        # Ensure we have scores for all offers
-        while len(scores) < len(offers):
-            scores.append(OfferScore(fit_score=5.0, attractiveness_score=5.0, overall_score=5.0))
-        
-        return scores[:len(offers)]
-        
-    except json.JSONDecodeError as e:
-        print(f"Error parsing OpenAI response: {e}")
-        # Return default scores on error
-        return [OfferScore(fit_score=5.0, attractiveness_score=5.0, overall_score=5.0) for _ in offers]
-    except Exception as e:
-        print(f"OpenAI API error: {e}")
-        raise
-
-
-def score_offers_mock(
-    offers: List[Dict[str, Any]],
-    must_contain: List[str],
-    may_contain: List[str],
-    must_not_contain: List[str],
-) -> List[OfferScore]:
-    """
-    Mock scoring for testing without OpenAI API calls.
-    Generates semi-random scores based on simple keyword matching.
-    """
-    scores = []
+    scores: Dict[int, OfferScore] = {}
+    cached = {}
+    from services.score_cache import hash_offer
+    offer_hashes = [hash_offer(offer) for offer in offers]
     
-    for offer in offers:
-        title = offer.get("title", "").lower()
-        description = offer.get("description", "").lower()
-        text = f"{title} {description}"
-        
-        # Calculate fit score based on keyword presence
-        fit_score = 5.0  # Base score
-        
-        # Boost for must_contain keywords
-        for keyword in must_contain:
-            if keyword.lower() in text:
-                fit_score += 1.5
-        
-        # Small boost for may_contain keywords
-        for keyword in may_contain:
-            if keyword.lower() in text:
-                fit_score += 0.5
+    if use_cache:
+        from services.score_cache import hash_keywords, hash_prompt, get_cached_scores
         
-        # Penalty for must_not_contain keywords
-        for keyword in must_not_contain:
-            if keyword.lower() in text:
-                fit_score -= 2.0
-        
-        # Clamp to 0-10
-        fit_score = max(0.0, min(10.0, fit_score))
-        
-        # Random attractiveness (simulating budget/client quality evaluation)
-        attractiveness_score = random.uniform(4.0, 9.0)
-        
-        # Overall is weighted average
-        overall_score = (fit_score * 0.6 + attractiveness_score * 0.4)
-        
-        # Add some randomness
-        overall_score += random.uniform(-0.5, 0.5)
-        overall_score = max(0.0, min(10.0, overall_score))
+        keywords_hash = hash_keywords(must_contain, may_contain, must_not_contain)
+        prompt_hash = hash_prompt(prompt_template, model)
+        cached = get_cached_scores(offer_hashes, keywords_hash, prompt_hash)
+        for i, offer_hash in enumerate(offer_hashes):
+            if offer_hash in cached:
+                scores[i] = OfferScore(**cached[offer_hash])
+    
+    # Offers are sent in content-hash order, so users with the same offer set get identical chunks
+    remaining = sorted((i for i in range(len(offers)) if i not in scores), key=offer_hashes.__getitem__)
+    cached_count = len(scores)
+    stats.cache_hits += cached_count
+    stats.cache_misses += len(remaining)
+    
+    uncacheable = set()
+    last_error = None
+    if remaining and two_stage:
+        new_scores, defaulted, last_error = _score_two_stage(
+            complete, offers, remaining, offer_hashes, keywords, chunk_options, stats, model
+        )
+        scores.update(new_scores)
+        uncacheable.update(defaulted)
+    elif remaining:
+        new_scores, last_error = _score_in_chunks(
+            complete, prompt_template, keywords,
+            [_offer_for_prompt(i, offers[i]) for i in remaining], COMBINED_SCORE_FIELDS,
+            stats=stats, **chunk_options
+        )
+        scores.update({i: OfferScore(**score) for i, score in new_scores.items()})
+    
+    unscored = [i for i in remaining if i not in scores]
+    
+    stats.duration_ms += int((time.time() - start_time) * 1000)
+    
+    # Nothing could be scored because the API itself failed - let the caller fall back
+    if len(scores) == cached_count and unscored and last_error is not None:
+        raise last_error
+    
+    if unscored:
+        print(f"Using default scores for {len(unscored)} offers")
+        stats.default_scores += len(unscored)
+    
+    if use_cache:
+        from services.score_cache import store_scores
         
-        scores.append(OfferScore(
-            fit_score=round(fit_score, 1),
-            attractiveness_score=round(attractiveness_score, 1),
-            overall_score=round(overall_score, 1),
-        ))
+        # Only real model answers are cached, never default scores
+        store_scores(
+            {
+                offer_hashes[i]: {
+                    'fit_score': score.fit_score,
+                    'attractiveness_score': score.attractiveness_score,
+                    'overall_score': score.overall_score,
+                }
+                for i, score in scores.items()
+                if offer_hashes[i] not in cached and i not in uncacheable
+            },
+            keywords_hash,
+            prompt_hash,
+        )
     
-    return scores
-
+    return [scores.get(i) or _default_score() for i in range(len(offers))]
 
-def _get_min_score_thresholds() -> tuple:
-    """Get minimum score thresholds from settings."""
-    from core.models import AppSettings
-    settings = AppSettings.query.first()
-    min_fit = settings.min_fit_score if settings and settings.min_fit_score is not None else 5.0
-    min_attr = settings.min_attractiveness_score if settings and settings.min_attractiveness_score is not None else 5.0
-    return min_fit, min_attr
 
-
-def _meets_minimum_quality(offer: Dict[str, Any], min_fit_score: float, min_attractiveness_score: float) -> bool:
-    """Check if an offer meets the minimum quality threshold."""
-    fit_score = offer.get("fit_score", 0)
-    attractiveness_score = offer.get("attractiveness_score", 0)
-    return fit_score >= min_fit_score and attractiveness_score >= min_attractiveness_score
+def _overall_score(offer: Dict[str, Any]) -> float:
+    return offer.get("overall_score", 0)
 
 
 def select_offers_with_diversity(
     scored_offers: List[Dict[str, Any]],
     max_offers: int,
+    min_fit_score: float = DEFAULT_MIN_FIT_SCORE,
+    min_attractiveness_score: float = DEFAULT_MIN_ATTRACTIVENESS_SCORE,
 ) -> List[Dict[str, Any]]:
     """
     Select top offers while ensuring platform diversity.
     
     Quality rules:
-    - Offers must have fit_score >= 5.0 AND attractiveness_score >= 5.0 to be included
+    - Offers must have fit_score >= min_fit_score AND attractiveness_score >= min_attractiveness_score to be included
     - Unless there aren't enough quality offers to reach max_offers
     
+    Selection:
+    1. The best quality offer of each platform (platforms in order of their first quality offer)
+    2. The best remaining quality offers across all platforms
+    3. The best low-quality offers, if still not enough
+    Equal scores keep the input order. Runs in O(n log k) for k = max_offers: platform
+    leaders are found in one pass and the rest is picked with heaps instead of sorting
+    every offer.
+    
     Args:
         scored_offers: List of offers with scores, each having 'platform', 'overall_score',
                        'fit_score', and 'attractiveness_score'
         max_offers: Maximum number of offers to select
+        min_fit_score: Minimum fit_score of a quality offer (AppSettings.min_fit_score)
+        min_attractiveness_score: Minimum attractiveness_score of a quality offer (AppSettings.min_attractiveness_score)
     
     Returns:
-        List of selected offers, maintaining diversity across platforms
+        List of selected offers sorted by overall score, maintaining diversity across platforms
     """
     if not scored_offers:
         return []
@@ -241,55 +611,46 @@ def select_offers_with_diversity(
     if len(scored_offers) <= max_offers:
         return scored_offers
     
-    # Get minimum quality thresholds from settings
-    min_fit_score, min_attractiveness_score = _get_min_score_thresholds()
-    
-    # Separate offers by quality
-    quality_offers = [o for o in scored_offers if _meets_minimum_quality(o, min_fit_score, min_attractiveness_score)]
-    low_quality_offers = [o for o in scored_offers if not _meets_minimum_quality(o, min_fit_score, min_attractiveness_score)]
-    
-    # Group quality offers by platform
-    by_platform = {}
-    for offer in quality_offers:
+    # Group quality offers by platform and find each platform's best one (first one on ties)
+    by_platform: Dict[str, List[Dict[str, Any]]] = {}
+    leaders: Dict[str, int] = {}  # Platform -> index of its best offer in by_platform
+    low_quality_offers = []
+    for offer in scored_offers:
+        # Checks are inlined: this loop runs over every scraped offer
+        if offer.get("fit_score", 0) < min_fit_score or offer.get("attractiveness_score", 0) < min_attractiveness_score:
+            low_quality_offers.append(offer)
+            continue
         platform = offer.get("platform", "unknown")
-        if platform not in by_platform:
-            by_platform[platform] = []
-        by_platform[platform].append(offer)
-    
-    # Sort each platform's offers by overall score
-    for platform in by_platform:
-        by_platform[platform].sort(key=lambda x: x.get("overall_score", 0), reverse=True)
-    
-    selected = []
-    platforms = list(by_platform.keys())
+        platform_offers = by_platform.get(platform)
+        if platform_offers is None:
+            by_platform[platform] = [offer]
+            leaders[platform] = 0
+            continue
+        if offer.get("overall_score", 0) > platform_offers[leaders[platform]].get("overall_score", 0):
+            leaders[platform] = len(platform_offers)
+        platform_offers.append(offer)
     
     # First pass: one quality offer from each platform (if they have any)
-    for platform in platforms:
-        if by_platform[platform] and len(selected) < max_offers:
-            selected.append(by_platform[platform].pop(0))
-    
-    # Second pass: fill remaining slots with top-scored quality offers across all platforms
-    remaining_quality = []
-    for platform in platforms:
-        remaining_quality.extend(by_platform[platform])
-    
-    remaining_quality.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
+    selected = [by_platform[platform][leaders[platform]] for platform in list(by_platform)[:max_offers]]
     
-    for offer in remaining_quality:
-        if len(selected) >= max_offers:
-            break
-        selected.append(offer)
+    # Second pass: fill remaining slots with top-scored quality offers across all platforms.
+    # Slots left means every platform's best offer was taken. heapq.nlargest keeps the
+    # iteration order on ties like a stable sort, so offers are fed platform by platform.
+    slots = max_offers - len(selected)
+    if slots > 0:
+        remaining_quality = chain.from_iterable(
+            platform_offers[:leaders[platform]] + platform_offers[leaders[platform] + 1:]
+            for platform, platform_offers in by_platform.items()
+        )
+        selected.extend(heapq.nlargest(slots, remaining_quality, key=_overall_score))
     
-    # Third pass: if still not enough, use low-quality offers (sorted by overall score)
-    if len(selected) < max_offers and low_quality_offers:
-        low_quality_offers.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
-        for offer in low_quality_offers:
-            if len(selected) >= max_offers:
-                break
-            selected.append(offer)
+    # Third pass: if still not enough, use low-quality offers (best overall score first)
+    slots = max_offers - len(selected)
+    if slots > 0:
+        selected.extend(heapq.nlargest(slots, low_quality_offers, key=_overall_score))
     
     # Sort final selection by overall score
-    selected.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
+    selected.sort(key=_overall_score, reverse=True)
     
     return selected
 
@@ -0,0 +1,206 @@
+"""
+Persistent LLM score cache.
+Scores are keyed by a hash of the offer text, a hash of the keyword profile
+(must/may/must-not) and a hash of the prompt, so only offers never scored for
+that profile and prompt are sent to OpenAI.
+Lookups and stores use their own short sessions, so scoring never commits or rolls
+back the session of the scrape that calls it.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from flask import has_app_context
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.orm import Session
+
+from core.models import db, AppSettings, OfferScoreCache, ScrapeLog
+
+
+DEFAULT_SCORE_CACHE_TTL_HOURS = 168.0  # One week
+
+# INSERT ... ON CONFLICT DO UPDATE per dialect (others store row by row in savepoints)
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+_SCORE_FIELDS = ('fit_score', 'attractiveness_score', 'overall_score')
+
+
+def _sha256(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def hash_offer(offer: Dict[str, Any]) -> str:
+    """Hash of the offer fields the model sees."""
+    return _sha256([
+        offer.get('title') or '',
+        (offer.get('description') or '')[:500],
+        offer.get('budget') or '',
+        offer.get('platform') or '',
+        offer.get('client_location') or '',
+    ])
+
+
+def hash_keywords(must_contain: List[str], may_contain: List[str], must_not_contain: List[str]) -> str:
+    """Hash of a keyword profile (case and order insensitive, so shuffled keywords still hit)."""
+    def normalize(keywords: List[str]) -> List[str]:
+        return sorted(keyword.strip().casefold() for keyword in keywords or [])
+
+    return _sha256([normalize(must_contain), normalize(may_contain), normalize(must_not_contain)])
+
+
+def hash_prompt(prompt_template: str, model: str) -> str:
+    """Hash of the prompt template and model (changing either invalidates cached scores)."""
+    return _sha256([prompt_template, model])
+
+
+def get_score_cache_ttl_hours() -> float:
+    """Get the score cache TTL from AppSettings."""
+    settings = AppSettings.query.first()
+    return settings.score_cache_ttl_hours if settings and settings.score_cache_ttl_hours is not None else DEFAULT_SCORE_CACHE_TTL_HOURS
+
+
+def get_cached_scores(offer_hashes: List[str], keywords_hash: str, prompt_hash: str) -> Dict[str, Dict[str, float]]:
+    """
+    Look up fresh cached scores for offers in one query (hit counters are bumped with one bulk UPDATE).
+
+    Returns:
+        Dict of offer hash -> {'fit_score', 'attractiveness_score', 'overall_score'}
+    """
+    if not offer_hashes or not has_app_context():
+        return {}
+
+    try:
+        now = datetime.utcnow()
+        threshold = now - timedelta(hours=get_score_cache_ttl_hours())
+        with Session(db.engine) as session, session.begin():
+            entries = session.query(
+                OfferScoreCache.id, OfferScoreCache.offer_hash, *(getattr(OfferScoreCache, field) for field in _SCORE_FIELDS)
+            ).filter(
+                OfferScoreCache.offer_hash.in_(set(offer_hashes)),
+                OfferScoreCache.keywords_hash == keywords_hash,
+                OfferScoreCache.prompt_hash == prompt_hash,
+                OfferScoreCache.created_at > threshold,
+            ).all()
+            if entries:
+                session.execute(
+                    update(OfferScoreCache)
+                    .where(OfferScoreCache.id.in_([entry.id for entry in entries]))
+                    .values(hit_count=func.coalesce(OfferScoreCache.hit_count, 0) + 1, last_hit_at=now)
+                )
+        return {entry.offer_hash: {field: getattr(entry, field) for field in _SCORE_FIELDS} for entry in entries}
+    except SQLAlchemyError as e:
+        print(f"Score cache lookup failed: {e}")
+        return {}
+
+
+def _upsert_rows(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert score rows, replacing the scores of rows with the same key (parallel users may store the same key)."""
+    insert = _UPSERT_INSERTS.get(session.bind.dialect.name)
+    if insert is not None:
+        statement = insert(OfferScoreCache)
+        statement = statement.on_conflict_do_update(
+            index_elements=['offer_hash', 'keywords_hash', 'prompt_hash'],
+            set_={field: statement.excluded[field] for field in (*_SCORE_FIELDS, 'created_at')},
+        )
+        session.execute(statement, rows)
+        return
+
+    for row in rows:
+        try:
+            with session.begin_nested():
+                session.execute(OfferScoreCache.__table__.insert(), [row])
+        except IntegrityError:
+            session.execute(
+                update(OfferScoreCache)
+                .where(
+                    OfferScoreCache.offer_hash == row['offer_hash'],
+                    OfferScoreCache.keywords_hash == row['keywords_hash'],
+                    OfferScoreCache.prompt_hash == row['prompt_hash'],
+                )
+                .values(**{field: row[field] for field in (*_SCORE_FIELDS, 'created_at')})
+            )
+
+
+def store_scores(scores: Dict[str, Dict[str, float]], keywords_hash: str, prompt_hash: str) -> int:
+    """
+    Store scores by offer hash (replacing existing entries for the same key).
+
+    Returns:
+        Number of stored entries
+    """
+    if not scores or not has_app_context():
+        return 0
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            'offer_hash': offer_hash,
+            'keywords_hash': keywords_hash,
+            'prompt_hash': prompt_hash,
+            'hit_count': 0,
+            'created_at': now,
+            **{field: score[field] for field in _SCORE_FIELDS},
+        }
+        for offer_hash, score in scores.items()
+    ]
+    try:
+        with Session(db.engine) as session, session.begin():
+            _upsert_rows(session, rows)
+        return len(rows)
+    except SQLAlchemyError as e:
+        # The cache is best effort
+        print(f"Score cache store failed: {e}")
+        return 0
+
+
+def evict_expired_scores() -> int:
+    """
+    Delete scores older than the TTL.
+
+    Returns:
+        Number of deleted entries
+    """
+    threshold = datetime.utcnow() - timedelta(hours=get_score_cache_ttl_hours())
+    deleted = OfferScoreCache.query.filter(OfferScoreCache.created_at <= threshold).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def purge_score_cache() -> int:
+    """Delete all cached scores. Returns number of deleted entries."""
+    deleted = OfferScoreCache.query.delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def get_score_cache_stats() -> Dict[str, Any]:
+    """Get cache size and reuse for the admin panel."""
+    ttl_hours = get_score_cache_ttl_hours()
+    threshold = datetime.utcnow() - timedelta(hours=ttl_hours)
+
+    entries, total_hits = db.session.query(
+        func.count(OfferScoreCache.id),
+        func.coalesce(func.sum(OfferScoreCache.hit_count), 0),
+    ).one()
+    fresh_entries = OfferScoreCache.query.filter(OfferScoreCache.created_at > threshold).count()
+    oldest: Optional[datetime] = db.session.query(func.min(OfferScoreCache.created_at)).scalar()
+
+    # Hit rate of batch runs from the last 7 days
+    run_hits, run_misses = db.session.query(
+        func.coalesce(func.sum(ScrapeLog.score_cache_hits), 0),
+        func.coalesce(func.sum(ScrapeLog.score_cache_misses), 0),
+    ).filter(ScrapeLog.executed_at > datetime.utcnow() - timedelta(days=7)).one()
+    lookups = int(run_hits) + int(run_misses)
+
+    return {
+        'ttl_hours': ttl_hours,
+        'entries': entries,
+        'fresh_entries': fresh_entries,
+        'total_hits': int(total_hits),
+        'oldest_created_at': (oldest.isoformat() + 'Z') if oldest else None,
+        'hits_7d': int(run_hits),
+        'misses_7d': int(run_misses),
+        'hit_rate_7d': round(int(run_hits) / lookups, 4) if lookups else None,
+    }
@@ -0,0 +1,71 @@
+"""
+Incremental parser for the model's JSON array of scores.
+Fed with streamed text, it yields every element of the top-level array as soon as the
+element's closing brace arrives. Text around the array (markdown code fences, comments)
+is skipped, and a malformed element is dropped on its own instead of failing the answer,
+so only the offers of broken or missing elements have to be asked for again.
+"""
+import json
+from typing import List, Dict, Any, Iterator
+
+
+class ScoreArrayParser:
+    """Streaming parser of a JSON array of objects."""
+
+    def __init__(self):
+        self.started = False  # Saw the opening '['
+        self.closed = False  # Saw the closing ']'
+        self.parsed = 0  # Valid elements yielded
+        self.malformed = 0  # Elements that weren't valid JSON objects
+        self._buffer: List[str] = []
+        self._depth = 0  # Nesting inside the current element (0 = between elements)
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> Iterator[Dict[str, Any]]:
+        """Consume a piece of the answer and yield the elements it completed."""
+        for char in text:
+            if self.closed:
+                return
+            if not self.started:
+                self.started = char == '['
+                continue
+
+            if self._depth == 0:
+                if char == '{':
+                    self._buffer = [char]
+                    self._depth = 1
+                elif char == ']':
+                    self.closed = True
+                # Commas, whitespace and stray non-object values between elements are skipped
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    element = self._parse_element(''.join(self._buffer))
+                    if element is not None:
+                        yield element
+
+    def _parse_element(self, text: str):
+        try:
+            element = json.loads(text)
+        except json.JSONDecodeError:
+            element = None
+        if not isinstance(element, dict):
+            self.malformed += 1
+            return None
+        self.parsed += 1
+        return element
@@ -0,0 +1,191 @@
+"""
+Multi-tier scoring cascade.
+The deterministic offline scorer ranks every offer first, then each configured model
+tier rescores a slice of the current ranking: 'top_k' tiers the best offers, 'borderline'
+tiers the offers on both sides of the max_offers cut, where a better model decides what
+is actually sent. A tier that fails keeps the scores of the tier before it. Offers no
+model tier rescored keep their offline fit only up to LOCAL_MAX_FIT_SCORE (as in
+lexical_ranker.local_scores), so they never outrank offers the model has seen.
+
+Tiers come from AppSettings.scoring_cascade, e.g.:
+    [{"model": "gpt-4.1-nano", "top_k": 60}, {"model": "gpt-4.1", "borderline": 5}]
+"""
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from services.lexical_ranker import LOCAL_MAX_FIT_SCORE, LOCAL_ATTRACTIVENESS_SCORE
+from services.openai_scoring import OfferScore, ScoringStats, score_offers_with_openai, combine_scores
+from services.offline_scoring import score_offers_offline
+
+
+CASCADE_TIER_KINDS = ('top_k', 'borderline')
+MAX_CASCADE_TIERS = 5
+MAX_SCORE = 10.0
+
+# USD per 1M tokens: (input, cached input, output) - for comparing tiers in the run log
+MODEL_PRICES = {
+    'gpt-4.1': (2.00, 0.50, 8.00),
+    'gpt-4.1-mini': (0.40, 0.10, 1.60),
+    'gpt-4.1-nano': (0.10, 0.025, 0.40),
+    'gpt-4o': (2.50, 1.25, 10.00),
+    'gpt-4o-mini': (0.15, 0.075, 0.60),
+}
+
+
+def estimate_cost_usd(model: Optional[str], stats: ScoringStats) -> Optional[float]:
+    """Estimated price of the tokens in stats, None for models without a known price."""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    input_price, cached_price, output_price = prices
+    uncached = stats.prompt_tokens - stats.cached_prompt_tokens
+    return round(
+        (uncached * input_price + stats.cached_prompt_tokens * cached_price + stats.completion_tokens * output_price) / 1_000_000,
+        6,
+    )
+
+
+def parse_cascade_tiers(value: Any) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+    """Validate scoring cascade tiers. Returns (tiers, error)."""
+    if not isinstance(value, list):
+        return None, 'scoring_cascade must be a list'
+    if len(value) > MAX_CASCADE_TIERS:
+        return None, f'scoring_cascade can have at most {MAX_CASCADE_TIERS} tiers'
+
+    tiers = []
+    for position, tier in enumerate(value):
+        if not isinstance(tier, dict):
+            return None, f'scoring_cascade[{position}] must be an object'
+        model = tier.get('model')
+        if not isinstance(model, str) or not model.strip():
+            return None, f'scoring_cascade[{position}].model is required'
+        kinds = [kind for kind in CASCADE_TIER_KINDS if kind in tier]
+        if len(kinds) != 1:
+            return None, f'scoring_cascade[{position}] needs exactly one of: {", ".join(CASCADE_TIER_KINDS)}'
+        try:
+            size = int(tier[kinds[0]])
+        except (ValueError, TypeError):
+            return None, f'scoring_cascade[{position}].{kinds[0]} must be a valid number'
+        if size < 1 or size > 1000:
+            return None, f'scoring_cascade[{position}].{kinds[0]} must be between 1 and 1000'
+        tiers.append({'model': model.strip(), kinds[0]: size})
+
+    return tiers, None
+
+
+def _tier_slice(order: List[int], tier: Dict[str, Any], max_offers: int) -> List[int]:
+    """Offer indexes a tier rescores, taken from the current ranking (best first)."""
+    if 'top_k' in tier:
+        return order[:tier['top_k']]
+    window = tier['borderline']
+    return order[max(0, max_offers - window):max_offers + window]
+
+
+def cap_offline_score(score: OfferScore) -> OfferScore:
+    """Offline score of an offer no model tier rescored, scaled down to LOCAL_MAX_FIT_SCORE."""
+    fit_score = round(score.fit_score * LOCAL_MAX_FIT_SCORE / MAX_SCORE, 1)
+    return OfferScore(
+        fit_score=fit_score,
+        attractiveness_score=LOCAL_ATTRACTIVENESS_SCORE,
+        overall_score=combine_scores(fit_score, LOCAL_ATTRACTIVENESS_SCORE),
+    )
+
+
+def tier_entry(tier: str, model: Optional[str], offers: int, stats: ScoringStats) -> Dict[str, Any]:
+    """Run log entry of one tier."""
+    return {
+        'tier': tier,
+        'model': model,
+        'offers': offers,
+        **stats.to_dict(),
+        'cost_usd': estimate_cost_usd(model, stats) if model else 0.0,
+    }
+
+
+def merge_tier_logs(tier_logs: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Sum tier entries of several scoring calls (e.g. the users of a batch run) tier by tier."""
+    merged: Dict[Tuple[int, str, Optional[str]], List[Any]] = {}
+    for tier_log in tier_logs:
+        for position, entry in enumerate(tier_log or []):
+            key = (position, entry['tier'], entry['model'])
+            offers, stats = merged.setdefault(key, [0, ScoringStats()])
+            merged[key][0] = offers + entry['offers']
+            stats.add(ScoringStats.from_dict(entry))
+    return [
+        tier_entry(tier, model, offers, stats)
+        for (_, tier, model), (offers, stats) in sorted(merged.items(), key=lambda item: item[0][0])
+    ]
+
+
+def score_offers_with_cascade(
+    offers: List[Dict[str, Any]],
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+    api_key: str,
+    tiers: List[Dict[str, Any]],
+    max_offers: int,
+    stats: Optional[ScoringStats] = None,
+    tier_log: Optional[List[Dict[str, Any]]] = None,
+    **scoring_options,
+) -> List[OfferScore]:
+    """
+    Score offers locally, then rescore slices of the ranking with each model tier.
+
+    Args:
+        offers: List of offer dictionaries
+        must_contain: Required keywords
+        may_contain: Optional keywords
+        must_not_contain: Excluded keywords
+        api_key: OpenAI API key
+        tiers: Tiers as returned by parse_cascade_tiers
+        max_offers: Offers the user gets (borderline tiers rescore around this cut)
+        stats: Optional ScoringStats filled with the counters of all tiers
+        tier_log: Optional list extended with one tier_entry per tier (local tier first)
+        **scoring_options: Passed to score_offers_with_openai (custom_prompt, scoring_mode, chunking...)
+
+    Returns:
+        List of OfferScore objects in the same order as input offers
+    """
+    stats = stats if stats is not None else ScoringStats()
+    log = []
+
+    start_time = time.time()
+    scores = score_offers_offline(offers, must_contain, may_contain, must_not_contain)
+    log.append(tier_entry('local', None, len(offers), ScoringStats(duration_ms=int((time.time() - start_time) * 1000))))
+
+    model_scored = set()
+    for tier in tiers:
+        # Stable sort: equal scores keep the platform order
+        order = sorted(range(len(offers)), key=lambda i: scores[i].overall_score, reverse=True)
+        chosen = _tier_slice(order, tier, max_offers)
+        tier_stats = ScoringStats()
+        kind = 'top_k' if 'top_k' in tier else 'borderline'
+        if chosen:
+            try:
+                rescored = score_offers_with_openai(
+                    offers=[offers[i] for i in chosen],
+                    must_contain=must_contain,
+                    may_contain=may_contain,
+                    must_not_contain=must_not_contain,
+                    api_key=api_key,
+                    use_cache=True,
+                    stats=tier_stats,
+                    model=tier['model'],
+                    **scoring_options,
+                )
+                for i, score in zip(chosen, rescored):
+                    scores[i] = score
+                model_scored.update(chosen)
+            except Exception as e:
+                print(f"Scoring tier {tier['model']} ({kind}) failed, keeping previous scores: {e}")
+        stats.add(tier_stats)
+        log.append(tier_entry(kind, tier['model'], len(chosen), tier_stats))
+
+    # If every tier failed, the offline ranking is all there is and stays as it is
+    if model_scored:
+        scores = [score if i in model_scored else cap_offline_score(score) for i, score in enumerate(scores)]
+
+    if tier_log is not None:
+        tier_log.extend(log)
+    return scores
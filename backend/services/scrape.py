@@ -2,37 +2,349 @@
 Scraping service that handles multi-platform scraping with scoring and diversity.
 Used by manual runs, scheduler, and admin API.
 """
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Tuple
+from flask import current_app
 from core.models import db, User, UserEmailPreference, OfferBundle, Offer, AppSettings, ScrapeLog, UserOfferEmail
 from core.config import CONFIG
 from scrapers import get_scraper, SCRAPER_REGISTRY, get_platform_name
-from services.openai_scoring import score_offers_with_openai, score_offers_mock, select_offers_with_diversity
+from scrapers.utils import (
+    fetch_cache_scope, configure_http_pool, http_session_scope, acquire_http_sessions, release_http_sessions,
+    configure_rate_limits, configure_detail_workers, configure_http_cache,
+)
+from services import inflight_scrapes
+from services.async_scrape import ascrape_platforms, ascrape_users, run_async_scrape, get_async_limits, SCRAPER_DEADLINE_MARGIN_SECONDS
+from services.offer_detail_cache import get_detail_cache_counters, configure_offer_detail_cache
+from services.score_cache import evict_expired_scores
+from services.openai_scoring import (
+    score_offers_with_openai, select_offers_with_diversity, ScoringStats,
+    DEFAULT_SCORING_CHUNK_TOKENS, DEFAULT_SCORING_WORKERS, DEFAULT_SCORING_CHUNK_RETRIES, SCORING_MODES,
+    DEFAULT_MIN_FIT_SCORE, DEFAULT_MIN_ATTRACTIVENESS_SCORE,
+)
+from services.attractiveness_scores import attractiveness_scope
+from services.lexical_ranker import prerank_offers
+from services.mmr_selection import select_offers_with_mmr, SELECTION_ALGORITHMS, DEFAULT_SELECTION_ALGORITHM, DEFAULT_MMR_LAMBDA
+from services.near_duplicates import find_near_duplicates, pick_representatives
+from services.offline_scoring import score_offers_offline
+from services.openai_pool import configure_openai_pool
+from services.scoring_cascade import score_offers_with_cascade, parse_cascade_tiers, merge_tier_logs
+from services.sent_offers import sent_offers_scope, get_sent_fingerprints, was_sent
 from utils.encryption import decrypt_api_key
 from helpers.user_helper import get_active_subscribed_users
 import random
 
 
-def get_sent_offer_urls_for_user(user_id: int) -> Set[str]:
+DEFAULT_PLATFORM_SCRAPE_WORKERS = 4
+DEFAULT_USER_SCRAPE_WORKERS = 2
+SCRAPE_ENGINES = ('threads', 'async')
+DEFAULT_PLATFORM_DEADLINE_SECONDS = 180
+DEFAULT_USER_DEADLINE_SECONDS = 300
+
+
+def _get_platform_concurrency(settings: Optional[AppSettings]) -> Tuple[bool, int]:
+    """Get (enabled, max_workers) for parallel platform scraping from settings."""
+    parallel = settings.parallel_platform_scraping if settings and settings.parallel_platform_scraping is not None else True
+    max_workers = settings.platform_scrape_workers if settings and settings.platform_scrape_workers else DEFAULT_PLATFORM_SCRAPE_WORKERS
+    return parallel, max(1, max_workers)
+
+
+def _call_in_app_context(app, func, **kwargs):
+    """Run func inside a fresh app context (and therefore its own DB session) in a worker thread."""
+    with app.app_context():
+        return func(**kwargs)
+
+
+def _apply_scraper_settings(settings: Optional[AppSettings]) -> None:
+    """Push HTTP pool, cache, rate limit and detail fetch settings to the scraper utilities."""
+    configure_http_pool(settings.platform_http_settings if settings else None)
+    configure_http_cache(
+        settings.http_cache_settings if settings else None,
+        enabled=settings.http_cache_enabled if settings and settings.http_cache_enabled is not None else True,
+    )
+    configure_rate_limits(settings.host_rate_limits if settings else None)
+    configure_detail_workers(settings.platform_detail_workers if settings else None)
+    configure_offer_detail_cache(settings)
+
+
+def _get_scrape_engine(settings: Optional[AppSettings]) -> str:
+    """Get the scraping engine ('threads' or 'async') from settings."""
+    engine = settings.scrape_engine if settings and settings.scrape_engine else 'threads'
+    return engine if engine in SCRAPE_ENGINES else 'threads'
+
+
+def _build_platform_jobs(
+    settings: Optional[AppSettings],
+    enabled_platforms: List[str],
+    use_real_scrape: bool,
+) -> Tuple[Dict[str, Any], List[Tuple[str, int, Optional[str]]]]:
     """
-    Get all offer URLs that have been sent to a specific user.
-    This queries offers from bundles that have been linked to sent emails.
+    Resolve (platform, platform_limit, api_key) jobs for the enabled platforms.
     
-    Returns a set of URLs for fast lookup.
+    Returns:
+        Tuple of (platform_results with errors filled in and None slots for jobs, jobs)
     """
-    # Get all bundles that were sent to this user (have user_offer_email_id set)
-    sent_bundles = db.session.query(OfferBundle.id).filter(
-        OfferBundle.user_id == user_id,
-        OfferBundle.user_offer_email_id.isnot(None)  # Bundle was used in an email
-    ).subquery()
+    # Get per-platform max offers from settings
+    platform_max_offers = settings.platform_max_offers if settings else {}
+    default_max = 50
+    
+    platform_results = {}
+    jobs = []
+    for platform in enabled_platforms:
+        if platform not in SCRAPER_REGISTRY:
+            platform_results[platform] = {'count': 0, 'error': f'Unknown platform: {platform}'}
+            continue
+        
+        # Get max offers for this specific platform
+        platform_limit = platform_max_offers.get(platform, default_max) if platform_max_offers else default_max
+        
+        # Get appropriate API key for platform
+        api_key = None
+        if use_real_scrape and platform == 'upwork':
+            try:
+                if settings and settings.apify_api_key:
+                    api_key = decrypt_api_key(settings.apify_api_key)
+            except Exception as e:
+                platform_results[platform] = {'count': 0, 'error': str(e)}
+                continue
+            
+            if not api_key:
+                platform_results[platform] = {
+                    'count': 0,
+                    'error': f'No API key configured for {platform}'
+                }
+                continue
+        
+        # Reserve the slot so platform_results keeps the enabled_platforms order
+        platform_results[platform] = None
+        jobs.append((platform, platform_limit, api_key))
     
-    # Get all offer URLs from these bundles
-    sent_offers = db.session.query(Offer.url).filter(
-        Offer.offer_bundle_id.in_(db.session.query(sent_bundles.c.id)),
-        Offer.deleted_at.is_(None)
-    ).all()
+    return platform_results, jobs
+
+
+def _scrape_platform(
+    platform: str,
+    must_contain: List[str],
+    may_contain: List[str],
+    must_not_contain: List[str],
+    platform_limit: int,
+    api_key: Optional[str],
+    use_real_scrape: bool,
+    print_logs: bool,
+    deadline_seconds: Optional[float] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Scrape a single platform.
+    deadline_seconds is passed to scrapers that can stop early on their own (Upwork).
     
-    return {offer.url for offer in sent_offers}
+    Returns:
+        Tuple of (platform_result entry, list of offer dicts)
+    """
+    try:
+        scraper = get_scraper(platform)
+        
+        if use_real_scrape:
+            result = scraper.scrape(
+                must_contain=must_contain,
+                may_contain=may_contain,
+                must_not_contain=must_not_contain,
+                max_offers=platform_limit,
+                api_key=api_key,
+                print_logs=print_logs,
+                deadline_seconds=deadline_seconds,
+            )
+        else:
+            result = scraper.scrape_mock(
+                must_contain=must_contain,
+                may_contain=may_contain,
+                must_not_contain=must_not_contain,
+                max_offers=platform_limit,
+            )
+        
+        return result.summary(), [offer.to_dict() for offer in result.offers]
+        
+    except Exception as e:
+        if print_logs:
+            print(f"Error scraping {platform}: {e}")
+        return {'count': 0, 'error': str(e)}, []
+
+
+def _get_deadline_settings(settings: Optional[AppSettings]) -> Dict[str, Any]:
+    """Get scrape deadlines from settings (0 disables a deadline)."""
+    user_deadline = settings.user_deadline_seconds if settings and settings.user_deadline_seconds is not None else DEFAULT_USER_DEADLINE_SECONDS
+    continue_in_background = settings.continue_timed_out_scrapes if settings and settings.continue_timed_out_scrapes is not None else True
+    return {
+        'platform_deadlines': (settings.platform_deadlines or {}) if settings else {},
+        'user_deadline': user_deadline or None,
+        'continue_in_background': continue_in_background,
+    }
+
+
+def _own_platform_deadline(deadlines: Dict[str, Any], platform: str) -> Optional[float]:
+    """Budget (seconds) of one platform on its own, without the user's budget."""
+    return deadlines['platform_deadlines'].get(platform, DEFAULT_PLATFORM_DEADLINE_SECONDS) or None
+
+
+def _platform_deadline(deadlines: Dict[str, Any], platform: str) -> Optional[float]:
+    """Effective deadline (seconds) of one platform: its own budget capped by the user's budget."""
+    budgets = [budget for budget in (_own_platform_deadline(deadlines, platform), deadlines['user_deadline']) if budget]
+    return min(budgets) if budgets else None
+
+
+def _platform_deadline_map(settings: Optional[AppSettings], jobs: List[Tuple[str, int, Optional[str]]]) -> Dict[str, Optional[float]]:
+    """Effective deadline per platform job (for the async engine)."""
+    deadlines = _get_deadline_settings(settings)
+    return {platform: _platform_deadline(deadlines, platform) for platform, _, _ in jobs}
+
+
+JOB_START_POLL_SECONDS = 0.25  # How often queued jobs are checked for having started
+
+
+def _timed_job(started_at: Dict[str, float], job, **kwargs):
+    """Record when a queued platform job actually starts, then run it."""
+    started_at[kwargs['platform']] = time.monotonic()
+    return job(**kwargs)
+
+
+def _run_platform_jobs(
+    app,
+    jobs: List[Tuple[str, int, Optional[str]]],
+    job_kwargs: Dict[str, Any],
+    max_workers: int,
+    deadlines: Dict[str, Any],
+    print_logs: bool = False,
+) -> Tuple[Dict[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]], int]:
+    """
+    Scrape platform jobs on a worker pool and stop waiting once their deadlines pass.
+    A platform's own deadline counts from when its job starts (jobs may queue behind others
+    when the pool is smaller than the job list); the user's deadline counts from the start of
+    the call. Timed-out platforms are recorded with timed_out=True; if continue_in_background
+    is set they keep running and are registered in inflight_scrapes, so a later identical
+    search picks up their result.
+    
+    Returns:
+        Tuple of ({platform: (platform_result, offers)}, wall time in ms)
+    """
+    if not jobs:
+        return {}, 0
+    
+    start_time = time.monotonic()
+    continue_in_background = deadlines['continue_in_background']
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)), thread_name_prefix='scrape-platform')
+    
+    futures = {}
+    started_at = {}  # platform -> monotonic time its job started
+    for platform, platform_limit, api_key in jobs:
+        key = inflight_scrapes.make_job_key(
+            platform, job_kwargs['must_contain'], job_kwargs['may_contain'], job_kwargs['must_not_contain'], platform_limit
+        )
+        # Reuse a job left running (or finished) after an earlier user's deadline
+        future = inflight_scrapes.take(key) if job_kwargs['use_real_scrape'] else None
+        if future is None:
+            kwargs = dict(job_kwargs, platform=platform, platform_limit=platform_limit, api_key=api_key)
+            if not continue_in_background and _platform_deadline(deadlines, platform):
+                # Nobody will wait for the result, so let the scraper stop on its own (e.g. Upwork aborts
+                # the run) slightly before the deadline, leaving time to return partial results
+                kwargs['deadline_seconds'] = max(1, _platform_deadline(deadlines, platform) - SCRAPER_DEADLINE_MARGIN_SECONDS)
+            # The job may outlive this call (and the run's http_session_scope), so it holds the pooled sessions open
+            acquire_http_sessions()
+            future = executor.submit(_call_in_app_context, app, _timed_job, started_at=started_at, job=_scrape_platform, **kwargs)
+            future.add_done_callback(lambda _: release_http_sessions())
+        else:
+            started_at[platform] = start_time
+            if print_logs:
+                print(f"Reusing background scrape of {platform}")
+        futures[future] = (platform, key)
+    
+    user_deadline_at = start_time + deadlines['user_deadline'] if deadlines['user_deadline'] else None
+    
+    def deadline_at(future) -> Optional[float]:
+        platform, _ = futures[future]
+        own_deadline = _own_platform_deadline(deadlines, platform)
+        own_deadline_at = started_at[platform] + own_deadline if own_deadline and platform in started_at else None
+        candidates = [at for at in (own_deadline_at, user_deadline_at) if at is not None]
+        return min(candidates) if candidates else None
+    
+    outcomes = {}
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        for future in [f for f in pending if deadline_at(f) is not None and deadline_at(f) <= now]:
+            pending.discard(future)
+            platform, key = futures[future]
+            elapsed = int(now - started_at.get(platform, start_time))
+            outcomes[platform] = ({'count': 0, 'error': f'Timed out after {elapsed}s', 'timed_out': True}, [])
+            if continue_in_background:
+                inflight_scrapes.register(key, future)
+            if print_logs:
+                print(f"{platform} timed out after {elapsed}s")
+        if not pending:
+            break
+        
+        timeouts = [deadline_at(f) - now for f in pending if deadline_at(f) is not None]
+        if any(futures[f][0] not in started_at and _own_platform_deadline(deadlines, futures[f][0]) for f in pending):
+            # A queued job's deadline starts with the job
+            timeouts.append(JOB_START_POLL_SECONDS)
+        done, _ = wait(pending, timeout=max(0, min(timeouts)) if timeouts else None, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            platform, _ = futures[future]
+            outcomes[platform] = future.result()
+            if print_logs:
+                print(f"Finished {platform}: {outcomes[platform][0]['count']} offers")
+    
+    # Don't wait for timed-out jobs; without background continuation drop the ones not started yet
+    executor.shutdown(wait=False, cancel_futures=not continue_in_background)
+    
+    return outcomes, int((time.monotonic() - start_time) * 1000)
+
+
+def _get_scoring_options(settings: Optional[AppSettings]) -> Dict[str, Any]:
+    """Get chunked scoring options and the scoring mode for score_offers_with_openai from settings."""
+    scoring_mode = settings.scoring_mode if settings and settings.scoring_mode in SCORING_MODES else 'combined'
+    return {
+        'scoring_mode': scoring_mode,
+        'base_url': settings.openai_base_url if settings and settings.openai_base_url else None,
+        'max_chunk_tokens': settings.scoring_chunk_tokens if settings and settings.scoring_chunk_tokens else DEFAULT_SCORING_CHUNK_TOKENS,
+        'max_workers': settings.scoring_workers if settings and settings.scoring_workers else DEFAULT_SCORING_WORKERS,
+        'max_retries': settings.scoring_chunk_retries if settings and settings.scoring_chunk_retries is not None else DEFAULT_SCORING_CHUNK_RETRIES,
+    }
+
+
+def _get_scoring_top_k(settings: Optional[AppSettings]) -> int:
+    """Get how many lexically best offers are sent to OpenAI (0 = all)."""
+    return settings.scoring_top_k if settings and settings.scoring_top_k else 0
+
+
+def _get_scoring_cascade(settings: Optional[AppSettings]) -> List[Dict[str, Any]]:
+    """Get model tiers of the scoring cascade (empty = single-model scoring)."""
+    tiers, error = parse_cascade_tiers(settings.scoring_cascade if settings and settings.scoring_cascade else [])
+    if error:
+        print(f"Ignoring invalid scoring cascade: {error}")
+        return []
+    return tiers
+
+
+def _get_min_score_thresholds(settings: Optional[AppSettings]) -> Dict[str, float]:
+    """Get minimum quality thresholds of select_offers_with_diversity from settings."""
+    return {
+        'min_fit_score': settings.min_fit_score if settings and settings.min_fit_score is not None else DEFAULT_MIN_FIT_SCORE,
+        'min_attractiveness_score': (
+            settings.min_attractiveness_score
+            if settings and settings.min_attractiveness_score is not None else DEFAULT_MIN_ATTRACTIVENESS_SCORE
+        ),
+    }
+
+
+def _select_offers(offers: List[Dict[str, Any]], max_offers: int, settings: Optional[AppSettings]) -> List[Dict[str, Any]]:
+    """Select the offers to send with the selection algorithm from settings."""
+    thresholds = _get_min_score_thresholds(settings)
+    algorithm = settings.selection_algorithm if settings and settings.selection_algorithm in SELECTION_ALGORITHMS else DEFAULT_SELECTION_ALGORITHM
+    if algorithm == 'mmr':
+        mmr_lambda = settings.mmr_lambda if settings.mmr_lambda is not None else DEFAULT_MMR_LAMBDA
+        return select_offers_with_mmr(offers, max_offers, mmr_lambda=mmr_lambda, **thresholds)
+    return select_offers_with_diversity(offers, max_offers, **thresholds)
 
 
 def scrape_all_platforms(
@@ -46,6 +358,8 @@ def scrape_all_platforms(
     use_real_scoring: bool = True,
     print_logs: bool = False,
     shuffle_keywords: bool = False,
+    prefetched: Optional[Dict[str, Any]] = None,
+    email_max_offers: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Scrape from all enabled platforms, score with OpenAI, and return diverse results.
@@ -59,106 +373,147 @@ def scrape_all_platforms(
         per_platform: DEPRECATED - uses platform_max_offers from settings
         max_offers: Final max offers after scoring/selection
         use_real_scrape: If True, use real scrapers; if False, use mock
-        use_real_scoring: If True, use OpenAI scoring; if False, use mock
+        use_real_scoring: If True, use OpenAI scoring; if False, use offline scoring
         print_logs: Whether to print debug logs
+        prefetched: Platform outcomes already scraped by the async batch engine (skips scraping)
+        email_max_offers: Offers the email will contain, when max_offers is raised to leave room
+                          for filtering (borderline cascade tiers rescore around this cut)
     
     Returns:
         Dict with scrape results, scores, and selected offers
     """
     settings = AppSettings.query.first()
-    
-    # Get per-platform max offers from settings
-    platform_max_offers = settings.platform_max_offers if settings else {}
-    default_max = 50
+    _apply_scraper_settings(settings)
     
     # Collect results from all platforms
     all_offers = []
-    platform_results = {}
     total_duration = 0
 
     if shuffle_keywords:
         may_contain = list(may_contain)  # Create a copy to avoid modifying original
         random.shuffle(may_contain)
     
-    for platform in enabled_platforms:
-        if platform not in SCRAPER_REGISTRY:
-            platform_results[platform] = {'count': 0, 'error': f'Unknown platform: {platform}'}
-            continue
-        
-        # Get max offers for this specific platform
-        platform_limit = platform_max_offers.get(platform, default_max) if platform_max_offers else default_max
-        
-        try:
-            scraper = get_scraper(platform)
-            
-            if use_real_scrape:
-                # Get appropriate API key for platform
-                api_key = None
-                if platform == 'upwork' and settings and settings.apify_api_key:
-                    api_key = decrypt_api_key(settings.apify_api_key)
-                
-                if platform == 'upwork' and not api_key:
-                    platform_results[platform] = {
-                        'count': 0,
-                        'error': f'No API key configured for {platform}'
-                    }
-                    continue
-                
-                result = scraper.scrape(
-                    must_contain=must_contain,
-                    may_contain=may_contain,
-                    must_not_contain=must_not_contain,
-                    max_offers=platform_limit,
-                    api_key=api_key,
-                    print_logs=print_logs,
-                )
-            else:
-                result = scraper.scrape_mock(
-                    must_contain=must_contain,
-                    may_contain=may_contain,
-                    must_not_contain=must_not_contain,
-                    max_offers=platform_limit,
-                )
-            
-            platform_results[platform] = {
-                'count': len(result.offers),
-                'duration_ms': result.duration_millis,
-                'search_url': result.search_url,
-                'error': result.error,
-            }
-            
-            total_duration += result.duration_millis or 0
-            
-            # Add offers to combined list
-            for offer in result.offers:
-                all_offers.append(offer.to_dict())
-                
-        except Exception as e:
-            platform_results[platform] = {'count': 0, 'error': str(e)}
-            if print_logs:
-                print(f"Error scraping {platform}: {e}")
+    # Resolve per-platform jobs up front (limits, API keys) so workers never touch settings
+    platform_results, jobs = _build_platform_jobs(settings, enabled_platforms, use_real_scrape)
+    
+    job_kwargs = dict(
+        must_contain=must_contain,
+        may_contain=may_contain,
+        must_not_contain=must_not_contain,
+        use_real_scrape=use_real_scrape,
+        print_logs=print_logs,
+    )
+    
+    parallel, max_workers = _get_platform_concurrency(settings)
+    platform_offers = {}
+    
+    if prefetched is None and use_real_scrape and _get_scrape_engine(settings) == 'async' and jobs:
+        # One event loop for all platforms of this call
+        app = current_app._get_current_object()
+        max_connections, host_concurrency = get_async_limits(settings)
+        prefetched = run_async_scrape(
+            lambda: ascrape_platforms(
+                app, jobs,
+                must_contain=must_contain,
+                may_contain=may_contain,
+                must_not_contain=must_not_contain,
+                print_logs=print_logs,
+                deadlines=_platform_deadline_map(settings, jobs),
+            ),
+            max_connections=max_connections,
+            host_concurrency=host_concurrency,
+        )
+    
+    if prefetched is not None:
+        # Scraped by the async engine (here or ahead of time by scrape_offers_for_all_users)
+        for platform, _, _ in jobs:
+            platform_results[platform], platform_offers[platform] = prefetched['outcomes'][platform]
+        total_duration = prefetched['duration_ms']
+    else:
+        # Worker pool bounded by per-platform and per-user deadlines (one worker when parallel scraping is off)
+        app = current_app._get_current_object()
+        outcomes, total_duration = _run_platform_jobs(
+            app, jobs, job_kwargs,
+            max_workers=max_workers if parallel else 1,
+            deadlines=_get_deadline_settings(settings),
+            print_logs=print_logs,
+        )
+        for platform, _, _ in jobs:
+            platform_results[platform], platform_offers[platform] = outcomes[platform]
+    
+    # Combine offers in enabled_platforms order regardless of completion order
+    for platform, _, _ in jobs:
+        all_offers.extend(platform_offers[platform])
+    
+    # Cross-posted offers are scored once, through the representative of their cluster
+    clusters = find_near_duplicates(all_offers)
+    representatives = pick_representatives(all_offers, clusters)
+    scored_indexes = sorted(representatives.values())
+    scored_offers = [all_offers[i] for i in scored_indexes]
     
     # Score all offers
     scores = []
-    if all_offers:
+    scoring_stats = ScoringStats()
+    scoring_stats.near_duplicates += len(all_offers) - len(scored_offers)
+    scoring_tiers = []  # Per-tier entries when the scoring cascade is on
+    if scored_offers:
         if use_real_scoring and settings and settings.openai_api_key:
             try:
                 openai_key = decrypt_api_key(settings.openai_api_key)
                 custom_prompt = settings.openai_scoring_prompt
-                scores = score_offers_with_openai(
-                    offers=all_offers,
-                    must_contain=must_contain,
-                    may_contain=may_contain,
-                    must_not_contain=must_not_contain,
-                    api_key=openai_key,
-                    custom_prompt=custom_prompt,
-                )
+                configure_openai_pool(settings.openai_rpm_limit, settings.openai_tpm_limit, settings.openai_max_concurrency)
+                cascade = _get_scoring_cascade(settings)
+                if cascade:
+                    # Local scores for all offers, cheaper models for the top, the best model around the cut
+                    scores = score_offers_with_cascade(
+                        offers=scored_offers,
+                        must_contain=must_contain,
+                        may_contain=may_contain,
+                        must_not_contain=must_not_contain,
+                        api_key=openai_key,
+                        tiers=cascade,
+                        max_offers=email_max_offers or max_offers,
+                        custom_prompt=custom_prompt,
+                        stats=scoring_stats,
+                        tier_log=scoring_tiers,
+                        **_get_scoring_options(settings),
+                    )
+                else:
+                    # Only the best lexical matches go to the model, the rest keep a local score
+                    candidates, local_scores = prerank_offers(
+                        scored_offers, must_contain, may_contain, must_not_contain, _get_scoring_top_k(settings)
+                    )
+                    scoring_stats.prerank_local += len(local_scores)
+                    candidate_scores = score_offers_with_openai(
+                        offers=[scored_offers[i] for i in candidates],
+                        must_contain=must_contain,
+                        may_contain=may_contain,
+                        must_not_contain=must_not_contain,
+                        api_key=openai_key,
+                        custom_prompt=custom_prompt,
+                        use_cache=True,
+                        stats=scoring_stats,
+                        **_get_scoring_options(settings),
+                    )
+                    scores_by_index = {**local_scores, **dict(zip(candidates, candidate_scores))}
+                    scores = [scores_by_index[i] for i in range(len(scored_offers))]
             except Exception as e:
                 if print_logs:
                     print(f"OpenAI scoring error: {e}")
-                scores = score_offers_mock(all_offers, must_contain, may_contain, must_not_contain)
+                scores = score_offers_offline(scored_offers, must_contain, may_contain, must_not_contain)
+                scoring_stats.offline_scored += len(scored_offers)
         else:
-            scores = score_offers_mock(all_offers, must_contain, may_contain, must_not_contain)
+            scores = score_offers_offline(scored_offers, must_contain, may_contain, must_not_contain)
+            scoring_stats.offline_scored += len(scored_offers)
+    
+    # Duplicates share their representative's scores
+    if scores:
+        scores_by_index = dict(zip(scored_indexes, scores))
+        scores = [scores_by_index[representatives[cluster]] for cluster in clusters]
+    for i, offer in enumerate(all_offers):
+        representative = representatives[clusters[i]]
+        if representative != i:
+            offer['duplicate_of'] = all_offers[representative]['url']
     
     # Attach scores to offers
     for i, offer in enumerate(all_offers):
@@ -174,8 +529,8 @@ def scrape_all_platforms(
     # Sort by overall score
     all_offers.sort(key=lambda x: x.get('overall_score', 0), reverse=True)
     
-    # Select offers with diversity
-    selected_offers = select_offers_with_diversity(all_offers, max_offers)
+    # Select offers with diversity (one offer per cluster of near-duplicates)
+    selected_offers = _select_offers([o for o in all_offers if not o.get('duplicate_of')], max_offers, settings)
     
     # Mark which offers are selected vs excluded
     selected_urls = {o['url'] for o in selected_offers}
@@ -190,6 +545,8 @@ def scrape_all_platforms(
         'platform_results': platform_results,
         'all_offers': all_offers,
         'selected_offers': selected_offers,
+        'scoring_stats': scoring_stats.to_dict(),
+        'scoring_tiers': scoring_tiers,
     }
 
 
@@ -200,6 +557,7 @@ def scrape_and_store_for_user(
     may_contain: List[str],
     must_not_contain: List[str],
     print_logs: bool = False,
+    prefetched: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Scrape offers for a single user using multi-platform logic and store in database.
@@ -207,6 +565,7 @@ def scrape_and_store_for_user(
     
     If allow_duplicate_offers is False in settings, filters out offers that were
     already sent to this user (checked by offer URL).
+    If prefetched is given (async batch engine), scraping is skipped and only scoring/storing runs.
     """
     settings = AppSettings.query.first()
     if not settings:
@@ -225,12 +584,11 @@ def scrape_and_store_for_user(
         print(f"Max offers: {max_offers}")
         print(f"Allow duplicates: {allow_duplicates}")
     
-    # Get URLs of offers already sent to this user (if duplicates are not allowed)
-    sent_offer_urls: Set[str] = set()
-    if not allow_duplicates:
-        sent_offer_urls = get_sent_offer_urls_for_user(user_id)
-        if print_logs and sent_offer_urls:
-            print(f"User already received {len(sent_offer_urls)} offers - will filter them out")
+    # Fingerprints of offers already sent to this user (if duplicates are not allowed)
+    sent_fingerprints = get_sent_fingerprints(user_id) if not allow_duplicates else None
+    has_sent_offers = sent_fingerprints is not None and sent_fingerprints.size > 0
+    if print_logs and has_sent_offers:
+        print(f"User already received {sent_fingerprints.size} offers - will filter them out")
     
     # Scrape all platforms with real scraping and scoring
     # Uses per-platform max_offers from settings
@@ -241,27 +599,31 @@ def scrape_and_store_for_user(
         may_contain=may_contain,
         must_not_contain=must_not_contain,
         enabled_platforms=enabled_platforms,
-        max_offers=max_offers * 3 if sent_offer_urls else max_offers,  # Get more to filter if needed
+        max_offers=max_offers * 3 if has_sent_offers else max_offers,  # Get more to filter if needed
         use_real_scrape=True,
         use_real_scoring=True,
         print_logs=print_logs,
         shuffle_keywords=shuffle_keywords,
+        prefetched=prefetched,
+        email_max_offers=max_offers,
     )
     
     # Filter out already sent offers if duplicates are not allowed
     filtered_offers = result['selected_offers']
     duplicates_filtered = 0
     
-    if sent_offer_urls:
-        original_count = len(filtered_offers)
+    if has_sent_offers:
+        sent = was_sent(sent_fingerprints, [offer.get('url') for offer in result['all_offers']])
+        # A cross-posted offer counts as sent if any of its copies was sent
+        sent_clusters = {offer.get('duplicate_of') or offer.get('url') for offer, offer_sent in zip(result['all_offers'], sent) if offer_sent}
         filtered_offers = [
-            offer for offer in result['all_offers']
-            if offer.get('url') not in sent_offer_urls
+            offer for offer, offer_sent in zip(result['all_offers'], sent)
+            if not offer_sent and not offer.get('duplicate_of') and offer.get('url') not in sent_clusters
         ]
         # Sort by overall score and take max_offers
         filtered_offers.sort(key=lambda x: x.get('overall_score', 0), reverse=True)
-        filtered_offers = select_offers_with_diversity(filtered_offers, max_offers)
-        duplicates_filtered = original_count - len([o for o in result['selected_offers'] if o.get('url') not in sent_offer_urls])
+        filtered_offers = _select_offers(filtered_offers, max_offers, settings)
+        duplicates_filtered = sum(1 for offer, offer_sent in zip(result['all_offers'], sent) if offer_sent and offer.get('selected'))
         
         if print_logs:
             print(f"Filtered {duplicates_filtered} duplicate offers, {len(filtered_offers)} unique offers remaining")
@@ -307,6 +669,8 @@ def scrape_and_store_for_user(
         'duplicates_filtered': duplicates_filtered,
         'duration_millis': result['total_duration_ms'],
         'platform_results': result['platform_results'],
+        'scoring_stats': result['scoring_stats'],
+        'scoring_tiers': result['scoring_tiers'],
     }
 
 
@@ -361,6 +725,88 @@ def scrape_offers_for_user(user_id: int, print_logs: bool = False) -> dict:
         }
 
 
+def _get_user_concurrency(settings: Optional[AppSettings]) -> Tuple[bool, int]:
+    """Get (enabled, max_workers) for parallel per-user scraping from settings."""
+    parallel = settings.parallel_user_scraping if settings and settings.parallel_user_scraping is not None else False
+    max_workers = settings.user_scrape_workers if settings and settings.user_scrape_workers else DEFAULT_USER_SCRAPE_WORKERS
+    return parallel, max(1, max_workers)
+
+
+def _scrape_user(user_info: tuple, print_logs: bool = False, prefetched: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Scrape, score and store offers for one user of a batch run. Never raises."""
+    user_id, user_email, must_contain, may_contain, must_not_contain = (
+        user_info[0], user_info[1], user_info[2], user_info[3], user_info[4]
+    )
+    
+    try:
+        result = scrape_and_store_for_user(
+            user_id=user_id,
+            user_email=user_email,
+            must_contain=must_contain or [],
+            may_contain=may_contain or [],
+            must_not_contain=must_not_contain or [],
+            print_logs=print_logs,
+            prefetched=prefetched,
+        )
+        
+        return {
+            'user_id': user_id,
+            'user_email': user_email,
+            'bundle_id': result['bundle_id'],
+            'offers_count': result['offers_count'],
+            'duration_millis': result['duration_millis'],
+            'scoring_stats': result['scoring_stats'],
+            'scoring_tiers': result['scoring_tiers'],
+            'success': True
+        }
+    except Exception as e:
+        db.session.rollback()
+        return {
+            'user_id': user_id,
+            'user_email': user_email,
+            'bundle_id': None,
+            'offers_count': 0,
+            'duration_millis': 0,
+            'success': False,
+            'error': str(e)
+        }
+
+
+def _prefetch_users_async(settings: Optional[AppSettings], active_users: list, print_logs: bool = False) -> List[Optional[Dict[str, Any]]]:
+    """
+    Scrape all users' platforms concurrently with the async engine.
+    Returns one prefetched result per user (None if the user can't be scraped, e.g. no platforms).
+    """
+    enabled_platforms = settings.enabled_platforms if settings and settings.enabled_platforms else []
+    shuffle_keywords = settings.shuffle_keywords if settings and settings.shuffle_keywords is not None else False
+    _apply_scraper_settings(settings)
+    
+    # Jobs (limits, API keys) only depend on settings, so resolve them once for all users
+    _, jobs = _build_platform_jobs(settings, enabled_platforms, use_real_scrape=True)
+    if not jobs:
+        return [None] * len(active_users)
+    
+    user_jobs = []
+    for user_info in active_users:
+        may_contain = list(user_info[3] or [])
+        if shuffle_keywords:
+            random.shuffle(may_contain)
+        user_jobs.append({
+            'jobs': jobs,
+            'must_contain': user_info[2] or [],
+            'may_contain': may_contain,
+            'must_not_contain': user_info[4] or [],
+        })
+    
+    app = current_app._get_current_object()
+    max_connections, host_concurrency = get_async_limits(settings)
+    return run_async_scrape(
+        lambda: ascrape_users(app, user_jobs, print_logs=print_logs, deadlines=_platform_deadline_map(settings, jobs)),
+        max_connections=max_connections,
+        host_concurrency=host_concurrency,
+    )
+
+
 def scrape_offers_for_all_users(print_logs: bool = False) -> dict:
     """
     Scrape offers for all users with active BeFreeClub subscription.
@@ -395,53 +841,95 @@ def scrape_offers_for_all_users(print_logs: bool = False) -> dict:
             }
         
         print(f"Scraping offers for {len(active_users)} active BeFreeClub subscribers...")
+        
+        evicted_scores = evict_expired_scores()
+        if print_logs and evicted_scores:
+            print(f"Evicted {evicted_scores} expired cached scores")
 
-        results = []
-        successful = 0
-        failed = 0
-        total_scraped_offers = 0
+        parallel, max_workers = _get_user_concurrency(settings)
+        start_time = time.time()
+        detail_counters_before = get_detail_cache_counters()
+        
+        # Users whose sent offers are filtered out get them preloaded in one query
+        dedup_user_ids = [] if settings and settings.allow_duplicate_offers else [user_info[0] for user_info in active_users]
+        
+        # Share search results, pooled connections, attractiveness scores and sent offers between users for this run
+        with fetch_cache_scope() as fetch_cache, http_session_scope(settings.platform_http_settings if settings else None), \
+                attractiveness_scope(), sent_offers_scope(dedup_user_ids):
+            if _get_scrape_engine(settings) == 'async':
+                # Scrape every user's platforms in one event loop, then score and store per user
+                prefetched = _prefetch_users_async(settings, active_users, print_logs)
+                results = [
+                    _scrape_user(user_info=user_info, print_logs=print_logs, prefetched=user_prefetched)
+                    for user_info, user_prefetched in zip(active_users, prefetched)
+                ]
+                total_duration_millis = int((time.time() - start_time) * 1000)
+            elif parallel and len(active_users) > 1:
+                # Each worker gets its own app context and therefore its own DB session
+                app = current_app._get_current_object()
+                results = [None] * len(active_users)
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(active_users)), thread_name_prefix='scrape-user') as executor:
+                    futures = {
+                        executor.submit(_call_in_app_context, app, _scrape_user, user_info=user_info, print_logs=print_logs): i
+                        for i, user_info in enumerate(active_users)
+                    }
+                    for future in as_completed(futures):
+                        results[futures[future]] = future.result()
+                # Users overlap, so the run took wall time rather than the sum of user durations
+                total_duration_millis = int((time.time() - start_time) * 1000)
+            else:
+                results = [_scrape_user(user_info=user_info, print_logs=print_logs) for user_info in active_users]
+                total_duration_millis = sum(result['duration_millis'] for result in results)
         
-        for user_info in active_users:
-            user_id, user_email, must_contain, may_contain, must_not_contain = (
-                user_info[0], user_info[1], user_info[2], user_info[3], user_info[4]
+        fetch_stats = fetch_cache.stats()
+        scoring_stats = ScoringStats()
+        per_user_scoring = []
+        for r in results:
+            if r.get('scoring_stats'):
+                user_stats = ScoringStats.from_dict(r['scoring_stats'])
+                scoring_stats.add(user_stats)
+                per_user_scoring.append({
+                    'user_id': r['user_id'],
+                    'duration_ms': user_stats.duration_ms,
+                    'requests': user_stats.requests,
+                    'prompt_tokens': user_stats.prompt_tokens,
+                    'cached_prompt_tokens': user_stats.cached_prompt_tokens,
+                    'completion_tokens': user_stats.completion_tokens,
+                })
+        scoring_tiers = merge_tier_logs([r.get('scoring_tiers') for r in results])
+        detail_counters = get_detail_cache_counters()
+        detail_cache_hits = detail_counters['hits'] - detail_counters_before['hits']
+        detail_cache_misses = detail_counters['misses'] - detail_counters_before['misses']
+        if print_logs:
+            print(f"Fetch cache: {fetch_stats['hits']} hits, {fetch_stats['misses']} misses")
+            print(f"Detail cache: {detail_cache_hits} hits, {detail_cache_misses} misses")
+            print(f"Score cache: {scoring_stats.cache_hits} hits, {scoring_stats.cache_misses} misses")
+            print(
+                f"Scoring: {scoring_stats.requests} requests, {scoring_stats.prompt_tokens} prompt "
+                f"({scoring_stats.cached_prompt_tokens} cached) + {scoring_stats.completion_tokens} completion tokens, "
+                f"{scoring_stats.parse_failures} parse failures, {scoring_stats.malformed_scores} malformed scores, "
+                f"{scoring_stats.default_scores} default scores"
             )
-
-            try:
-                result = scrape_and_store_for_user(
-                    user_id=user_id,
-                    user_email=user_email,
-                    must_contain=must_contain or [],
-                    may_contain=may_contain or [],
-                    must_not_contain=must_not_contain or [],
-                    print_logs=print_logs
+            if scoring_stats.offline_scored:
+                print(f"Offline scoring: {scoring_stats.offline_scored} offers scored without OpenAI")
+            if scoring_stats.prerank_local:
+                print(f"Pre-ranker: {scoring_stats.prerank_local} offers scored locally instead of by OpenAI")
+            if scoring_stats.near_duplicates:
+                print(f"Near-duplicates: {scoring_stats.near_duplicates} cross-posted offers scored through another copy")
+            if scoring_stats.attractiveness_scored or scoring_stats.attractiveness_shared:
+                print(f"Attractiveness: {scoring_stats.attractiveness_scored} rated, {scoring_stats.attractiveness_shared} shared between users")
+            for tier in scoring_tiers:
+                cost = f"${tier['cost_usd']:.4f}" if tier['cost_usd'] is not None else "unknown cost"
+                print(
+                    f"Scoring tier {tier['tier']} ({tier['model'] or 'offline'}): {tier['offers']} offers, "
+                    f"{tier['requests']} requests, {tier['prompt_tokens']} prompt + {tier['completion_tokens']} completion tokens, "
+                    f"{cost}, {tier['duration_ms']} ms"
                 )
-
-                total_scraped_offers += result['offers_count']
-                successful += 1
-
-                results.append({
-                    'user_id': user_id,
-                    'user_email': user_email,
-                    'bundle_id': result['bundle_id'],
-                    'offers_count': result['offers_count'],
-                    'duration_millis': result['duration_millis'],
-                    'success': True
-                })
-            except Exception as e:
-                db.session.rollback()
-                failed += 1
-                results.append({
-                    'user_id': user_id,
-                    'user_email': user_email,
-                    'bundle_id': None,
-                    'offers_count': 0,
-                    'duration_millis': 0,
-                    'success': False,
-                    'error': str(e)
-                })
         
-        total_duration_millis = sum(result['duration_millis'] for result in results)
-        average_duration_millis = total_duration_millis / len(active_users) if active_users else 0
+        successful = sum(1 for r in results if r['success'])
+        failed = len(results) - successful
+        total_scraped_offers = sum(r['offers_count'] for r in results)
+        average_duration_millis = sum(r['duration_millis'] for r in results) / len(active_users) if active_users else 0
 
         # Collect errors for the log
         errors = [
@@ -457,6 +945,13 @@ def scrape_offers_for_all_users(print_logs: bool = False) -> dict:
             successful_scrapes=successful,
             failed_scrapes=failed,
             total_offers_scraped=total_scraped_offers,
+            fetch_cache_hits=fetch_stats['hits'],
+            fetch_cache_misses=fetch_stats['misses'],
+            detail_cache_hits=detail_cache_hits,
+            detail_cache_misses=detail_cache_misses,
+            score_cache_hits=scoring_stats.cache_hits,
+            score_cache_misses=scoring_stats.cache_misses,
+            scoring_stats={**scoring_stats.to_dict(), 'per_user': per_user_scoring, 'tiers': scoring_tiers},
             errors=errors
         )
         db.session.add(scrape_log)
@@ -0,0 +1,75 @@
+"""
+Offers already sent to users, as 64-bit canonical URL fingerprints (Offer.url_fingerprint).
+A batch run preloads the fingerprints of all its users with one query (sent_offers_scope),
+so deduplication doesn't query every user's whole email history again. Each user's
+fingerprints are kept as a sorted int64 array and looked up with binary search.
+"""
+from contextlib import contextmanager
+from typing import List, Dict, Iterable, Optional
+
+import numpy as np
+
+from core.models import db, OfferBundle, Offer
+from utils.urls import url_fingerprint
+
+
+PRELOAD_BATCH_ROWS = 5000  # Rows fetched from the DB at a time while preloading
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _sent_offers_query(user_ids: List[int]):
+    # Offers of bundles that were used in an email
+    return db.session.query(OfferBundle.user_id, Offer.url_fingerprint).join(
+        Offer, Offer.offer_bundle_id == OfferBundle.id
+    ).filter(
+        OfferBundle.user_id.in_(user_ids),
+        OfferBundle.user_offer_email_id.isnot(None),
+        Offer.deleted_at.is_(None),
+        Offer.url_fingerprint.isnot(None),
+    )
+
+
+def load_sent_fingerprints(user_ids: Iterable[int]) -> Dict[int, np.ndarray]:
+    """Sorted unique fingerprints of the offers sent to each user, loaded in one query."""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+
+    grouped: Dict[int, List[int]] = {user_id: [] for user_id in user_ids}
+    for user_id, fingerprint in _sent_offers_query(user_ids).yield_per(PRELOAD_BATCH_ROWS):
+        grouped[user_id].append(fingerprint)
+    return {user_id: np.unique(np.array(fingerprints, dtype=np.int64)) for user_id, fingerprints in grouped.items()}
+
+
+# Fingerprints preloaded for the batch run in progress (None outside of a run)
+_preloaded: Optional[Dict[int, np.ndarray]] = None
+
+
+@contextmanager
+def sent_offers_scope(user_ids: Iterable[int]):
+    """Preload sent-offer fingerprints of the users of a batch run."""
+    global _preloaded
+    preloaded = load_sent_fingerprints(user_ids)
+    _preloaded = preloaded
+    try:
+        yield preloaded
+    finally:
+        _preloaded = None
+
+
+def get_sent_fingerprints(user_id: int) -> np.ndarray:
+    """Fingerprints of the offers sent to a user (preloaded in a batch run, queried otherwise)."""
+    preloaded = _preloaded
+    if preloaded is not None and user_id in preloaded:
+        return preloaded[user_id]
+    return load_sent_fingerprints([user_id]).get(user_id, _EMPTY)
+
+
+def was_sent(sent_fingerprints: np.ndarray, urls: List[Optional[str]]) -> np.ndarray:
+    """Boolean mask of the URLs whose fingerprint is in sent_fingerprints (sorted)."""
+    if not urls or not sent_fingerprints.size:
+        return np.zeros(len(urls), dtype=bool)
+    fingerprints = np.array([url_fingerprint(url) for url in urls], dtype=np.int64)
+    positions = np.minimum(np.searchsorted(sent_fingerprints, fingerprints), sent_fingerprints.size - 1)
+    return sent_fingerprints[positions] == fingerprints
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+# Tests import backend modules the same way the app does (services.*, scrapers.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import db  # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build a Flask app on a throwaway SQLite database with the given model tables."""
+    def build(*models):
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.sqlite'}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.metadata.create_all(db.engine, tables=[model.__table__ for model in models])
+        return app
+
+    return build
@@ -0,0 +1,78 @@
+"""
+Local stand-in for the OpenAI chat completions API. Tests queue the responses it should
+give (status, headers, JSON or server-sent events); requests are recorded with their
+arrival time.
+"""
+import json
+import threading
+import time
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+def completion(content: str, total_tokens: int = 150) -> dict:
+    return {
+        'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': 1, 'model': 'gpt-stub',
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+        'usage': {'prompt_tokens': total_tokens - 50, 'completion_tokens': 50, 'total_tokens': total_tokens},
+    }
+
+
+def stream_chunks(deltas, total_tokens: int = 150) -> list:
+    chunks = [
+        {'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': 1, 'model': 'gpt-stub',
+         'choices': [{'index': 0, 'delta': {'content': delta}, 'finish_reason': None}]}
+        for delta in deltas
+    ]
+    chunks.append({
+        'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': 1, 'model': 'gpt-stub', 'choices': [],
+        'usage': {'prompt_tokens': total_tokens - 50, 'completion_tokens': 50, 'total_tokens': total_tokens},
+    })
+    return chunks
+
+
+RATE_LIMIT_ERROR = {'error': {'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit_exceeded'}}
+
+
+class OpenAIStub:
+    """Threaded HTTP server on a free local port answering queued responses in order."""
+
+    def __init__(self):
+        self.responses = deque()  # (status, headers, body dict or list of SSE chunks)
+        self.requests = []  # (arrival time, request body)
+        self.default = (200, {}, completion('[]'))
+        self.delay = 0.0  # Seconds before each answer
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                stub.requests.append((time.monotonic(), body))
+                time.sleep(stub.delay)
+                status, headers, payload = stub.responses.popleft() if stub.responses else stub.default
+                self.send_response(status)
+                streamed = isinstance(payload, list)
+                self.send_header('Content-Type', 'text/event-stream' if streamed else 'application/json')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if streamed:
+                    self.end_headers()
+                    for chunk in payload:
+                        self.wfile.write(b'data: ' + json.dumps(chunk).encode() + b'\n\n')
+                    self.wfile.write(b'data: [DONE]\n\n')
+                else:
+                    data = json.dumps(payload).encode()
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,38 @@
+from http import HTTPStatus
+
+import pytest
+
+import api.admin.scrape as admin_scrape
+from core.models import db, AppSettings
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(AppSettings)
+    with app.app_context():
+        db.session.add(AppSettings(id=1, scoring_mode='combined'))
+        db.session.commit()
+        yield app
+
+
+def _put(app, data):
+    with app.test_request_context(json=data, method='PUT'):
+        response, status = admin_scrape.update_openai_settings.__wrapped__()
+    return response.get_json(), status
+
+
+def test_two_stage_mode_rejects_custom_prompt(app):
+    body, status = _put(app, {'scoring_mode': 'two_stage', 'openai_scoring_prompt': 'Oceń oferty: {offers_json}'})
+
+    assert status == HTTPStatus.BAD_REQUEST
+    assert 'openai_scoring_prompt' in body['error']
+    assert AppSettings.query.first().scoring_mode == 'combined'
+
+
+def test_custom_prompt_rejected_when_two_stage_already_set(app):
+    assert _put(app, {'scoring_mode': 'two_stage'})[1] == HTTPStatus.OK
+
+    assert _put(app, {'openai_scoring_prompt': 'Oceń oferty: {offers_json}'})[1] == HTTPStatus.BAD_REQUEST
+    # Clearing the prompt or switching back to combined mode is fine
+    assert _put(app, {'openai_scoring_prompt': ''})[1] == HTTPStatus.OK
+    assert _put(app, {'scoring_mode': 'combined', 'openai_scoring_prompt': 'Oceń oferty: {offers_json}'})[1] == HTTPStatus.OK
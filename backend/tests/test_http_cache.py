@@ -0,0 +1,165 @@
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import scrapers.utils.http_cache as http_cache
+from scrapers.utils.async_http import async_client_scope, amake_request
+from scrapers.utils.base_scraper import make_request
+from scrapers.utils.http_cache import HttpResponseCache
+from scrapers.utils.http_pool import close_http_sessions
+from scrapers.utils.rate_limiter import configure_rate_limits
+
+
+PLATFORM = 'stub'
+LAST_MODIFIED = 'Wed, 14 Oct 2026 10:00:00 GMT'
+
+# path -> (validator headers, extra headers)
+PAGES = {
+    '/etag': ({'ETag': '"v1"'}, {}),
+    '/last-modified': ({'Last-Modified': LAST_MODIFIED}, {}),
+    '/no-store': ({'ETag': '"v1"'}, {'Cache-Control': 'no-store'}),
+    '/plain': ({}, {}),
+}
+
+
+class StubSite:
+    """Local site answering conditional GETs with 304 when the client's validators match."""
+
+    def __init__(self):
+        self.requests = []  # (path, request headers)
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                site.requests.append((self.path, dict(self.headers)))
+                validators, extra = PAGES.get(self.path.split('?')[0], ({}, {}))
+                not_modified = (
+                    ('ETag' in validators and self.headers.get('If-None-Match') == validators['ETag'])
+                    or ('Last-Modified' in validators and self.headers.get('If-Modified-Since') == validators['Last-Modified'])
+                )
+                body = f'<html>{self.path}</html>'.encode()
+                self.send_response(304 if not_modified else 200)
+                for name, value in {**validators, **extra}.items():
+                    self.send_header(name, value)
+                if not_modified:
+                    self.end_headers()
+                    return
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def conditional(self, index: int) -> dict:
+        headers = self.requests[index][1]
+        return {name: headers[name] for name in ('If-None-Match', 'If-Modified-Since') if name in headers}
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def site():
+    server = StubSite()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fresh process-wide cache; no throttling of the local site."""
+    fresh_cache = HttpResponseCache()
+    monkeypatch.setattr(http_cache, '_cache', fresh_cache)
+    configure_rate_limits({PLATFORM: {'rate_per_second': 1000, 'burst': 1000}})
+    yield fresh_cache
+    configure_rate_limits(None)
+    close_http_sessions()
+
+
+def test_etag_revalidation_reuses_cached_body(site, cache):
+    first = make_request(site.url + '/etag', platform=PLATFORM)
+    second = make_request(site.url + '/etag', platform=PLATFORM)
+
+    assert site.conditional(0) == {}
+    assert site.conditional(1) == {'If-None-Match': '"v1"'}
+    assert second.status_code == 200
+    assert second.from_cache is True
+    assert second.text == first.text == '<html>/etag</html>'
+    assert second.headers['ETag'] == '"v1"'
+    assert cache.stats()['revalidated'] == 1
+
+
+def test_last_modified_revalidation(site, cache):
+    make_request(site.url + '/last-modified', platform=PLATFORM)
+    response = make_request(site.url + '/last-modified', platform=PLATFORM)
+
+    assert site.conditional(1) == {'If-Modified-Since': LAST_MODIFIED}
+    assert response.text == '<html>/last-modified</html>'
+    assert cache.stats()['revalidated'] == 1
+
+
+def test_async_revalidation_reuses_body_cached_by_sync_request(site, cache):
+    make_request(site.url + '/etag', platform=PLATFORM)
+
+    async def fetch():
+        async with async_client_scope():
+            return await amake_request(site.url + '/etag', platform=PLATFORM)
+
+    response = asyncio.run(fetch())
+
+    assert site.conditional(1) == {'If-None-Match': '"v1"'}
+    assert response.status_code == 200
+    assert response.text == '<html>/etag</html>'
+
+
+def test_fresh_entries_are_served_without_request(site, cache):
+    cache.configure({PLATFORM: {'fresh_seconds': 60}})
+
+    make_request(site.url + '/plain', platform=PLATFORM)
+    response = make_request(site.url + '/plain', platform=PLATFORM)
+
+    assert len(site.requests) == 1
+    assert response.text == '<html>/plain</html>'
+    assert cache.stats()['hits'] == 1
+
+
+def test_no_store_and_unvalidated_responses_are_not_cached(site, cache):
+    for path in ('/no-store', '/plain'):
+        make_request(site.url + path, platform=PLATFORM)
+        make_request(site.url + path, platform=PLATFORM)
+
+    assert [site.conditional(i) for i in range(4)] == [{}, {}, {}, {}]
+    assert cache.stats()['entries'] == 0
+
+
+def test_disabling_drops_entries(site, cache):
+    make_request(site.url + '/etag', platform=PLATFORM)
+    cache.configure(None, enabled=False)
+    make_request(site.url + '/etag', platform=PLATFORM)
+
+    assert site.conditional(1) == {}
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted(site, cache):
+    cache.max_entries = 2
+    urls = [f'{site.url}/etag?page={page}' for page in range(3)]
+
+    make_request(urls[0], platform=PLATFORM)
+    make_request(urls[1], platform=PLATFORM)
+    make_request(urls[0], platform=PLATFORM)  # Revalidated, so page 1 is now the oldest
+    make_request(urls[2], platform=PLATFORM)
+
+    assert cache.stats()['entries'] == 2
+    assert cache.lookup(urls[1])[0] is None
+    assert cache.lookup(urls[0])[0] is not None
+    assert cache.lookup(urls[2])[0] is not None
@@ -0,0 +1,29 @@
+import pytest
+
+from services.offline_scoring import parse_budget, CURRENCY_RATES
+
+
+@pytest.mark.parametrize('budget, amount, hourly', [
+    ('15 000 - 20 000 PLN', 17500.0, False),
+    ('2 500,50 PLN', 2500.5, False),
+    ('12,5 PLN', 12.5, False),
+    ('1.500,50 PLN', 1500.5, False),
+    ('1.500 PLN', 1500.0, False),
+    ('$1,000 - $2,500', 1750.0 * CURRENCY_RATES['USD'], False),
+    ('$1,500.50', 1500.5 * CURRENCY_RATES['USD'], False),
+    ('1,234,567 PLN', 1234567.0, False),
+    ('12.50 EUR', 12.5 * CURRENCY_RATES['EUR'], False),
+    ('2,5k PLN', 2500.0, False),
+    ('10k+', 10000.0, False),
+    ('$50/hr', 50.0 * CURRENCY_RATES['USD'], True),
+    ('120 zł/godz.', 120.0, True),
+])
+def test_parse_budget(budget, amount, hourly):
+    parsed_amount, parsed_hourly = parse_budget(budget)
+    assert parsed_amount == pytest.approx(amount)
+    assert parsed_hourly is hourly
+
+
+@pytest.mark.parametrize('budget', [None, '', 'Do ustalenia', 'Negotiable'])
+def test_parse_budget_without_amount(budget):
+    assert parse_budget(budget) is None
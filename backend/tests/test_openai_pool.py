@@ -0,0 +1,251 @@
+import time
+
+import openai
+import pytest
+
+import services.openai_pool as openai_pool
+from services.openai_pool import (
+    OpenAIPool, KeyScheduler, CompletionStream, parse_reset_duration, stream_request_options, WINDOW_SECONDS,
+)
+from tests.openai_stub import OpenAIStub, completion, stream_chunks, RATE_LIMIT_ERROR
+
+
+MESSAGES = [{'role': 'user', 'content': 'Score these offers'}]
+
+
+@pytest.fixture
+def stub():
+    server = OpenAIStub()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the scheduler's windows."""
+    now = [1000.0]
+    monkeypatch.setattr(openai_pool.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def _complete(pool, stub, **request):
+    return pool.chat_completion('sk-test', MESSAGES, estimated_tokens=100, base_url=stub.base_url, model='gpt-stub', **request)
+
+
+def _scheduler(pool, stub) -> KeyScheduler:
+    return pool._schedulers[('sk-test', stub.base_url)]
+
+
+@pytest.mark.parametrize('value, seconds', [
+    ('2', 2.0), ('0.5', 0.5), ('20ms', 0.02), ('1s', 1.0), ('6m0s', 360.0), ('1h2m3s', 3723.0), ('', None), ('soon', None),
+])
+def test_parse_reset_duration(value, seconds):
+    assert parse_reset_duration(value) == seconds
+
+
+def test_requests_per_minute_window(clock):
+    scheduler = KeyScheduler(rpm_limit=2)
+    assert scheduler._reserve(10)[0] == 0.0
+    clock[0] += 10
+    assert scheduler._reserve(10)[0] == 0.0
+
+    wait, entry = scheduler._reserve(10)
+    assert entry is None
+    assert wait == pytest.approx(WINDOW_SECONDS - 10)
+
+    clock[0] += WINDOW_SECONDS - 10
+    assert scheduler._reserve(10)[1] is not None
+
+
+def test_tokens_per_minute_window(clock):
+    scheduler = KeyScheduler(tpm_limit=1000)
+    assert scheduler._reserve(600)[1] is not None
+
+    wait, entry = scheduler._reserve(600)
+    assert entry is None
+    assert wait == pytest.approx(WINDOW_SECONDS)
+
+    clock[0] += WINDOW_SECONDS
+    # A request above the whole budget still goes out once the window is empty
+    assert scheduler._reserve(5000)[1] is not None
+
+
+def test_learns_limits_and_pauses_on_exhausted_budget(clock):
+    scheduler = KeyScheduler()
+    scheduler.update_from_headers({
+        'x-ratelimit-limit-requests': '500',
+        'x-ratelimit-limit-tokens': '30000',
+        'x-ratelimit-remaining-requests': '0',
+        'x-ratelimit-reset-requests': '1.5s',
+    })
+    assert scheduler._limits() == (500, 30000)
+    assert scheduler._reserve(10) == (pytest.approx(1.5), None)
+
+    # Configured limits win over learned ones
+    scheduler.configure(rpm_limit=100, tpm_limit=None)
+    assert scheduler._limits() == (100, 30000)
+
+
+def test_rate_limit_backoff_grows_and_shrinks(clock):
+    scheduler = KeyScheduler()
+    assert scheduler.on_rate_limited({'retry-after': '2'}) == 2.0
+    assert scheduler.on_rate_limited({'retry-after-ms': '100'}) == 1.0  # Backoff doubled from 0.5
+    assert scheduler.on_rate_limited({'x-ratelimit-reset-tokens': '3s', 'x-ratelimit-reset-requests': '20ms'}) == 3.0
+    assert scheduler.on_rate_limited({}) == 4.0
+    scheduler.on_success()
+    assert scheduler.on_rate_limited({}) == 4.0
+    assert scheduler.stats['rate_limited'] == 5
+
+
+def test_retries_after_429_with_retry_after(stub):
+    stub.responses.extend([
+        (429, {'retry-after-ms': '600'}, RATE_LIMIT_ERROR),
+        (200, {}, completion('[1]')),
+    ])
+    pool = OpenAIPool()
+
+    result = _complete(pool, stub)
+
+    assert result.choices[0].message.content == '[1]'
+    (first, _), (second, _) = stub.requests
+    assert second - first >= 0.6
+    assert _scheduler(pool, stub).stats['rate_limited'] == 1
+
+
+def test_retries_after_429_with_ratelimit_reset_headers(stub):
+    stub.responses.extend([
+        (429, {'x-ratelimit-reset-requests': '700ms', 'x-ratelimit-reset-tokens': '200ms'}, RATE_LIMIT_ERROR),
+        (200, {}, completion('[2]')),
+    ])
+    pool = OpenAIPool()
+
+    assert _complete(pool, stub).choices[0].message.content == '[2]'
+    (first, _), (second, _) = stub.requests
+    assert second - first >= 0.7
+
+
+def test_gives_up_after_rate_limit_retries(stub, monkeypatch):
+    monkeypatch.setattr(openai_pool, 'RATE_LIMIT_RETRIES', 1)
+    stub.default = (429, {'retry-after-ms': '10'}, RATE_LIMIT_ERROR)
+    pool = OpenAIPool()
+
+    with pytest.raises(openai.RateLimitError):
+        _complete(pool, stub)
+    assert len(stub.requests) == 2
+
+
+def test_exhausted_budget_header_delays_next_request(stub):
+    stub.responses.append((200, {
+        'x-ratelimit-limit-requests': '60',
+        'x-ratelimit-remaining-requests': '0',
+        'x-ratelimit-reset-requests': '500ms',
+    }, completion('[]')))
+    pool = OpenAIPool()
+
+    _complete(pool, stub)
+    _complete(pool, stub)
+
+    (first, _), (second, _) = stub.requests
+    assert second - first >= 0.5
+    assert pool.stats()['...test @ ' + stub.base_url]['rpm_limit'] == 60
+
+
+def test_configured_rpm_limit_spaces_requests(stub, monkeypatch):
+    monkeypatch.setattr(openai_pool, 'WINDOW_SECONDS', 0.5)
+    pool = OpenAIPool()
+    pool.configure(rpm_limit=1)
+
+    for _ in range(3):
+        _complete(pool, stub)
+
+    times = [arrived for arrived, _ in stub.requests]
+    assert times[2] - times[0] >= 1.0
+
+
+def test_usage_counts_against_token_budget(stub):
+    stub.default = (200, {}, completion('[]', total_tokens=4321))
+    pool = OpenAIPool()
+
+    _complete(pool, stub)
+
+    assert list(_scheduler(pool, stub)._tokens)[0][1] == 4321
+
+
+def test_stream_yields_deltas_and_usage(stub):
+    stub.responses.append((200, {}, stream_chunks(['[{"offer_', 'index": 1}', ']'], total_tokens=777)))
+    pool = OpenAIPool()
+
+    stream = pool.chat_completion_stream('sk-test', MESSAGES, estimated_tokens=100, base_url=stub.base_url, model='gpt-stub')
+
+    assert ''.join(stream) == '[{"offer_index": 1}]'
+    assert stream.usage.total_tokens == 777
+    assert stub.requests[0][1]['stream'] is True
+    # Custom OpenAI-compatible servers aren't asked for usage (many reject stream_options)
+    assert 'stream_options' not in stub.requests[0][1]
+    assert list(_scheduler(pool, stub)._tokens)[0][1] == 777
+
+
+def test_stream_retries_429_before_streaming(stub):
+    stub.responses.extend([
+        (429, {'retry-after': '0.1'}, RATE_LIMIT_ERROR),
+        (200, {}, stream_chunks(['[]'])),
+    ])
+    pool = OpenAIPool()
+
+    stream = pool.chat_completion_stream('sk-test', MESSAGES, estimated_tokens=100, base_url=stub.base_url, model='gpt-stub')
+
+    assert ''.join(stream) == '[]'
+    assert len(stub.requests) == 2
+
+
+def test_stream_raises_request_errors_in_reader(stub):
+    stub.responses.append((400, {}, {'error': {'message': 'Bad request', 'type': 'invalid_request_error'}}))
+    pool = OpenAIPool()
+
+    stream = pool.chat_completion_stream('sk-test', MESSAGES, estimated_tokens=100, base_url=stub.base_url, model='gpt-stub')
+
+    with pytest.raises(openai.BadRequestError):
+        list(stream)
+
+
+def test_completion_stream_hands_over_between_threads():
+    stream = CompletionStream()
+    stream.put('a')
+    stream.put('b')
+    stream.close(ValueError('broken'))
+
+    deltas = []
+    with pytest.raises(ValueError):
+        for delta in stream:
+            deltas.append(delta)
+    assert deltas == ['a', 'b']
+
+
+def test_stream_options_only_for_openai_api():
+    assert stream_request_options(None) == {'stream_options': {'include_usage': True}}
+    assert stream_request_options('http://localhost:8000/v1') == {}
+
+
+def test_stream_reader_times_out_and_cancels_request(stub):
+    stub.delay = 1.0
+    pool = OpenAIPool()
+
+    stream = pool.chat_completion_stream('sk-test', MESSAGES, estimated_tokens=100, base_url=stub.base_url, model='gpt-stub')
+    stream.idle_timeout = 0.1
+
+    with pytest.raises(TimeoutError):
+        list(stream)
+    assert stream.future.cancelled()
+
+
+def test_cancelled_stream_is_closed_for_reader(stub):
+    stub.delay = 1.0
+    pool = OpenAIPool()
+
+    stream = pool.chat_completion_stream('sk-test', MESSAGES, estimated_tokens=100, base_url=stub.base_url, model='gpt-stub')
+    while not stub.requests:
+        time.sleep(0.01)
+    stream.future.cancel()
+
+    with pytest.raises(RuntimeError, match='cancelled'):
+        list(stream)
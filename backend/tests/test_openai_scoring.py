@@ -0,0 +1,61 @@
+import openai
+import httpx
+
+from services.openai_scoring import ScoringStats, _score_in_chunks, COMBINED_SCORE_FIELDS
+
+
+PROMPT = '{offers_json} {must_contain}'
+KEYWORDS = {'must_contain': 'python'}
+
+
+class FakeStream:
+    """Stream that yields deltas, then optionally breaks."""
+
+    def __init__(self, deltas, error=None):
+        self.deltas = deltas
+        self.error = error
+        self.usage = None
+
+    def __iter__(self):
+        yield from self.deltas
+        if self.error is not None:
+            raise self.error
+
+
+def _offers(count):
+    return [{'index': i, 'title': f'Offer {i}'} for i in range(count)]
+
+
+def _score_json(index):
+    return f'{{"offer_index": {index}, "fit_score": 8, "attractiveness_score": 6, "overall_score": 7}}'
+
+
+def test_scores_before_broken_stream_are_kept():
+    error = openai.APIConnectionError(request=httpx.Request('POST', 'http://localhost'))
+    streams = [FakeStream(['[', _score_json(0), ',', _score_json(1)], error), FakeStream([f'[{_score_json(0)}]'])]
+    stats = ScoringStats()
+
+    scores, last_error = _score_in_chunks(
+        lambda **kwargs: streams.pop(0), PROMPT, KEYWORDS, _offers(3), COMBINED_SCORE_FIELDS,
+        max_chunk_tokens=6000, max_workers=1, max_retries=1, stats=stats,
+    )
+
+    # Offers 0 and 1 arrived before the break, only offer 2 was asked for again
+    assert sorted(scores) == [0, 1, 2]
+    assert last_error is error
+    assert stats.api_errors == 1
+    assert stats.requests == 2
+
+
+def test_unparseable_answer_counts_as_parse_failure():
+    stats = ScoringStats()
+
+    scores, last_error = _score_in_chunks(
+        lambda **kwargs: FakeStream(['Sorry, I cannot help with that.']), PROMPT, KEYWORDS, _offers(2), COMBINED_SCORE_FIELDS,
+        max_chunk_tokens=6000, max_workers=1, max_retries=0, stats=stats,
+    )
+
+    assert scores == {}
+    assert last_error is None
+    assert stats.parse_failures == 1
+    assert stats.api_errors == 0
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import inspect
+
+import services.score_cache as score_cache
+from core.models import db, AppSettings, OfferScoreCache
+from services.score_cache import get_cached_scores, store_scores
+
+
+SCORES = {'fit_score': 7.0, 'attractiveness_score': 6.0, 'overall_score': 6.6}
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(AppSettings, OfferScoreCache)
+    with app.app_context():
+        yield app
+
+
+def _scores(*offer_hashes, fit_score=7.0):
+    return {offer_hash: dict(SCORES, fit_score=fit_score) for offer_hash in offer_hashes}
+
+
+@pytest.fixture(params=['on_conflict', 'savepoints'])
+def upsert_path(request, monkeypatch):
+    if request.param == 'savepoints':
+        monkeypatch.setattr(score_cache, '_UPSERT_INSERTS', {})
+    return request.param
+
+
+def test_lookup_returns_stored_scores_and_counts_hits(app):
+    assert store_scores(_scores('a', 'b'), 'kw', 'prompt') == 2
+
+    assert get_cached_scores(['a', 'b', 'c'], 'kw', 'prompt') == _scores('a', 'b')
+    assert get_cached_scores(['a'], 'other-kw', 'prompt') == {}
+    get_cached_scores(['a'], 'kw', 'prompt')
+
+    hits = dict(db.session.query(OfferScoreCache.offer_hash, OfferScoreCache.hit_count).all())
+    assert hits == {'a': 2, 'b': 1}
+
+
+def test_same_key_stored_by_another_user_is_replaced_not_failed(app, upsert_path):
+    store_scores(_scores('shared'), 'kw', 'prompt')
+
+    # A parallel user with the same keyword profile stores the shared offer again with new ones
+    assert store_scores(_scores('shared', 'new', fit_score=9.0), 'kw', 'prompt') == 2
+
+    entries = {entry.offer_hash: entry.fit_score for entry in OfferScoreCache.query.all()}
+    assert entries == {'shared': 9.0, 'new': 9.0}
+
+
+def test_cache_calls_leave_callers_session_alone(app):
+    db.session.add(AppSettings(id=1, score_cache_ttl_hours=24))
+    db.session.commit()
+    settings = AppSettings.query.first()  # Loaded by the caller
+
+    store_scores(_scores('a'), 'kw', 'prompt')
+    get_cached_scores(['a'], 'kw', 'prompt')
+
+    # A commit or rollback of the caller's session would have expired its objects
+    assert not inspect(settings).expired_attributes
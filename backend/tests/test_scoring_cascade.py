@@ -0,0 +1,68 @@
+import pytest
+
+import services.scoring_cascade as scoring_cascade
+from services.lexical_ranker import LOCAL_MAX_FIT_SCORE
+from services.openai_scoring import OfferScore
+from services.scoring_cascade import score_offers_with_cascade
+
+
+DESCRIPTIONS = ['python django react', 'python django', 'python']
+
+
+def _offers(count):
+    # Fewer keywords towards the end, so the offline ranking follows the input order
+    return [
+        {'title': f'Offer {i}', 'description': DESCRIPTIONS[i] if i < len(DESCRIPTIONS) else 'other'}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    """Stand-in model tier giving every offer it sees a mediocre score."""
+    calls = []
+
+    def fake_score(offers, model, **kwargs):
+        calls.append((model, [offer['title'] for offer in offers]))
+        return [OfferScore(fit_score=5.0, attractiveness_score=5.0, overall_score=5.0) for _ in offers]
+
+    monkeypatch.setattr(scoring_cascade, 'score_offers_with_openai', fake_score)
+    return calls
+
+
+def test_offers_outside_every_tier_rank_below_model_scores(model_calls):
+    offers = _offers(6)
+
+    scores = score_offers_with_cascade(
+        offers, ['python'], ['django', 'react'], [], api_key='sk-test',
+        tiers=[{'model': 'gpt-4.1-nano', 'top_k': 2}], max_offers=2,
+    )
+
+    assert model_calls == [('gpt-4.1-nano', ['Offer 0', 'Offer 1'])]
+    unscored = scores[2:]
+    assert all(score.fit_score <= LOCAL_MAX_FIT_SCORE for score in unscored)
+    assert max(score.overall_score for score in unscored) < min(score.overall_score for score in scores[:2])
+
+
+def test_offline_scores_kept_when_every_tier_fails(monkeypatch):
+    def failing_score(**kwargs):
+        raise RuntimeError('API down')
+
+    monkeypatch.setattr(scoring_cascade, 'score_offers_with_openai', failing_score)
+    offers = _offers(4)
+
+    scores = score_offers_with_cascade(
+        offers, ['python'], ['django', 'react'], [], api_key='sk-test',
+        tiers=[{'model': 'gpt-4.1-nano', 'top_k': 2}], max_offers=2,
+    )
+
+    assert scores == scoring_cascade.score_offers_offline(offers, ['python'], ['django', 'react'], [])
+
+
+def test_borderline_tier_rescores_around_cut(model_calls):
+    score_offers_with_cascade(
+        _offers(10), ['python'], ['django', 'react'], [], api_key='sk-test',
+        tiers=[{'model': 'gpt-4.1', 'borderline': 1}], max_offers=3,
+    )
+
+    assert model_calls == [('gpt-4.1', ['Offer 2', 'Offer 3'])]
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+from flask import Flask
+
+import services.scrape as scrape
+from core.models import db, AppSettings
+from scrapers.utils.http_pool import HttpSessionPool
+
+
+def _deadlines(platform_deadlines=None, user_deadline=None, continue_in_background=False):
+    return {
+        'platform_deadlines': platform_deadlines or {},
+        'user_deadline': user_deadline,
+        'continue_in_background': continue_in_background,
+    }
+
+
+JOB_KWARGS = {
+    'must_contain': ['python'],
+    'may_contain': [],
+    'must_not_contain': [],
+    'use_real_scrape': False,
+    'print_logs': False,
+}
+
+
+@pytest.fixture
+def slow_platforms(monkeypatch):
+    """Replace platform scraping with a sleep of the given length per platform."""
+    durations = {}
+
+    def fake_scrape_platform(platform, platform_limit, api_key, **kwargs):
+        time.sleep(durations[platform])
+        return {'count': 1}, [{'platform': platform}]
+
+    monkeypatch.setattr(scrape, '_scrape_platform', fake_scrape_platform)
+    return durations
+
+
+def test_no_jobs_returns_empty_outcomes():
+    assert scrape._run_platform_jobs(Flask(__name__), [], JOB_KWARGS, max_workers=4, deadlines=_deadlines()) == ({}, 0)
+
+
+def test_no_runnable_platforms_reports_errors(make_app):
+    app = make_app(AppSettings)
+    with app.app_context():
+        db.session.add(AppSettings(id=1))
+        db.session.commit()
+        results = scrape.scrape_all_platforms([], ['python'], [], ['upwork', 'unknown'], use_real_scrape=True, use_real_scoring=False)
+
+    assert results['platform_results'] == {
+        'upwork': {'count': 0, 'error': 'No API key configured for upwork'},
+        'unknown': {'count': 0, 'error': 'Unknown platform: unknown'},
+    }
+    assert results['total_offers'] == 0
+
+
+def test_platform_deadline_counts_from_job_start(slow_platforms):
+    # One worker runs the jobs one after another; together they take longer than one platform's budget
+    slow_platforms.update({'useme': 0.3, 'justjoinit': 0.3})
+    jobs = [('useme', 10, None), ('justjoinit', 10, None)]
+
+    outcomes, _ = scrape._run_platform_jobs(
+        Flask(__name__), jobs, JOB_KWARGS, max_workers=1,
+        deadlines=_deadlines({'useme': 0.5, 'justjoinit': 0.5}),
+    )
+
+    assert outcomes['useme'][0] == {'count': 1}
+    assert outcomes['justjoinit'][0] == {'count': 1}
+
+
+def test_user_deadline_counts_from_call_start(slow_platforms):
+    slow_platforms.update({'useme': 0.3, 'justjoinit': 0.3})
+    jobs = [('useme', 10, None), ('justjoinit', 10, None)]
+
+    outcomes, duration_ms = scrape._run_platform_jobs(
+        Flask(__name__), jobs, JOB_KWARGS, max_workers=1,
+        deadlines=_deadlines({'useme': 0.5, 'justjoinit': 0.5}, user_deadline=0.45),
+    )
+
+    assert outcomes['useme'][0] == {'count': 1}
+    assert outcomes['justjoinit'][0]['timed_out'] is True
+    assert duration_ms < 600
+
+
+def test_sessions_stay_open_for_jobs_outliving_the_run():
+    pool = HttpSessionPool()
+    pool.acquire()  # Run scope
+    session = pool.get_session('https://useme.com/pl/jobs/')
+    pool.acquire()  # Platform job still running when the run ends
+
+    pool.release(close_when_idle=True)
+    assert pool.get_session('https://useme.com/pl/jobs/') is session
+
+    pool.release()
+    assert pool.get_session('https://useme.com/pl/jobs/') is not session
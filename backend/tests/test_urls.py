@@ -0,0 +1,23 @@
+import pytest
+
+from utils.urls import canonicalize_url, url_fingerprint
+
+
+@pytest.mark.parametrize('url, canonical', [
+    ('https://www.upwork.com/freelance-jobs/apply/Python-developer_~01abc/?referrer_url_path=x', 'https://upwork.com/jobs/~01abc'),
+    ('upwork.com/jobs/~01ABC', 'https://upwork.com/jobs/~01abc'),
+    ('https://useme.com/pl/jobs/logo-dla-sklepu,123/?utm_source=x&page=2', 'https://useme.com/jobs/123'),
+    ('https://workconnect.app/en/zlecenie/abc-1/?ref=list', 'https://workconnect.app/zlecenie/abc-1'),
+    ('http://www.example.com/a/?b=2&a=1&utm_medium=x#apply', 'https://example.com/a?a=1&b=2'),
+    ('https://justjoin.it/offers/acme-python-dev/', 'https://justjoin.it/offers/acme-python-dev'),
+    ('https://example.com:8080/', 'https://example.com:8080/'),
+    ('', ''),
+])
+def test_canonicalize_url(url, canonical):
+    assert canonicalize_url(url) == canonical
+
+
+def test_fingerprint_ignores_link_variants():
+    assert url_fingerprint('https://www.upwork.com/jobs/Title_~01abc/?source=rss') == url_fingerprint('https://upwork.com/jobs/~01abc')
+    assert url_fingerprint('https://useme.com/pl/jobs/a,1/') != url_fingerprint('https://useme.com/pl/jobs/a,2/')
+    assert -2 ** 63 <= url_fingerprint('https://example.com/x') < 2 ** 63
@@ -0,0 +1,79 @@
+"""
+Canonical offer URLs and their 64-bit fingerprints.
+Platforms link the same offer in several ways (http/https, www, trailing slashes,
+tracking parameters, language prefixes, slugs that change with the title), so
+duplicates are detected on the canonical URL. The fingerprint is what is stored
+(Offer.url_fingerprint, CachedOffer.url_fingerprint) and compared.
+
+Stored fingerprints were backfilled by migration 5f9c3e7a1b64 with a frozen copy of this
+canonicalizer. Any change to canonicalize_url changes fingerprints of existing rows, so it
+needs a new migration that backfills url_fingerprint again with the new rules.
+"""
+import hashlib
+import re
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Query parameters that never identify an offer
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', 'ref', 'referrer', 'source',
+    'src', 'trk', 'tracking', 'from', 'campaign', 'igshid', 'si',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+# Platform rules by host: path pattern -> canonical path built from the offer's stable id
+_UPWORK_JOB = re.compile(r'_?(~0[0-9a-z]+)/?$', re.IGNORECASE)
+_USEME_JOB = re.compile(r'^/(?:[a-z]{2}/)?jobs/[^/]*?,(\d+)/?$', re.IGNORECASE)
+_WORKCONNECT_OFFER = re.compile(r'^/(?:[a-z]{2}/)?zlecenie/([^/]+)/?$', re.IGNORECASE)
+
+
+def _stable_offer_path(host: str, path: str) -> Optional[str]:
+    """Canonical path built from the offer's stable id, None if no platform rule applies."""
+    if host.endswith('upwork.com'):
+        match = _UPWORK_JOB.search(path)
+        if match:
+            return f'/jobs/{match.group(1).lower()}'
+    elif host.endswith('useme.com'):
+        match = _USEME_JOB.match(path)
+        if match:
+            return f'/jobs/{match.group(1)}'
+    elif host.endswith('workconnect.app'):
+        match = _WORKCONNECT_OFFER.match(path)
+        if match:
+            return f'/zlecenie/{match.group(1)}'
+    return None
+
+
+def canonicalize_url(url: Optional[str]) -> str:
+    """
+    Canonical form of an offer URL: https, lower-case host without "www.", no fragment,
+    no tracking parameters, sorted query, no trailing slash. URLs matching a platform rule
+    become the platform's stable offer path (e.g. the Upwork job key or the Useme job id)
+    without any query, since the id alone identifies the offer.
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    stable_path = _stable_offer_path(host, parts.path)
+    if stable_path:
+        return urlunsplit(('https', host, stable_path, '', ''))
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(('https', host, parts.path.rstrip('/') or '/', urlencode(query), ''))
+
+
+def url_fingerprint(url: Optional[str]) -> int:
+    """Signed 64-bit fingerprint of the canonical URL (fits a BIGINT column)."""
+    digest = hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)